@@ -0,0 +1,128 @@
+"""
+Motion Tetris - Bitboard Engine Equivalence Check and Benchmark
+==============================================================
+Plays random games on the array engine (tetris_logic) and the bitboard
+engine side by side, checking after every action that both agree on
+collisions, placed cells and cleared lines. Then times the hot
+is_valid_position call on both.
+
+Usage:
+    python benchmarks/bench_bitboard.py [games]
+"""
+
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import bitboard
+import tetris_logic
+from config import BOARD_WIDTH, BOARD_HEIGHT
+
+
+def play_random_game(rng, shapes, max_pieces=300):
+    """Drive both engines with the same random moves; return (pieces, probes, lines)."""
+    # Start from a few nearly-full rows so line clears get exercised
+    array_board = tetris_logic.create_tetris_board()
+    for r in range(BOARD_HEIGHT - rng.randint(0, 8), BOARD_HEIGHT):
+        array_board[r] = [rng.randint(1, 7) for _ in range(BOARD_WIDTH)]
+        array_board[r][rng.randrange(BOARD_WIDTH)] = 0
+    bit_board = bitboard.bitboard_from_array(array_board)
+    keys = list(shapes.keys())
+    probes = lines = 0
+
+    for piece in range(max_pieces):
+        shape = shapes[rng.choice(keys)]
+        rotation = 0
+        pos_x, pos_y = BOARD_WIDTH // 2 - 2, 0
+        if not tetris_logic.is_valid_position(array_board, shape, rotation, pos_x, pos_y):
+            assert not bitboard.is_valid_position(bit_board, shape, rotation, pos_x, pos_y)
+            return piece, probes, lines
+
+        # Probe a neighbourhood of positions, including out-of-range ones
+        for _ in range(20):
+            probe_rotation = rng.randrange(len(shape['shape']))
+            probe_x = rng.randint(-4, BOARD_WIDTH + 1)
+            probe_y = rng.randint(-3, BOARD_HEIGHT + 1)
+            expected = tetris_logic.is_valid_position(array_board, shape, probe_rotation, probe_x, probe_y)
+            actual = bitboard.is_valid_position(bit_board, shape, probe_rotation, probe_x, probe_y)
+            assert expected == actual, (probe_rotation, probe_x, probe_y)
+            probes += 1
+
+        # Random moves, then drop
+        for _ in range(rng.randint(0, 12)):
+            move = rng.choice(("left", "right", "rotate"))
+            next_x, next_rotation = pos_x, rotation
+            if move == "left":
+                next_x -= 1
+            elif move == "right":
+                next_x += 1
+            else:
+                next_rotation = (rotation + 1) % len(shape['shape'])
+            valid = tetris_logic.is_valid_position(array_board, shape, next_rotation, next_x, pos_y)
+            assert valid == bitboard.is_valid_position(bit_board, shape, next_rotation, next_x, pos_y)
+            if valid:
+                pos_x, rotation = next_x, next_rotation
+
+        while tetris_logic.is_valid_position(array_board, shape, rotation, pos_x, pos_y + 1):
+            assert bitboard.is_valid_position(bit_board, shape, rotation, pos_x, pos_y + 1)
+            pos_y += 1
+        assert not bitboard.is_valid_position(bit_board, shape, rotation, pos_x, pos_y + 1)
+
+        tetris_logic.add_piece_to_board(array_board, shape, rotation, pos_x, pos_y)
+        bitboard.add_piece_to_board(bit_board, shape, rotation, pos_x, pos_y)
+        cleared = tetris_logic.clear_full_rows(array_board)
+        assert cleared == bitboard.clear_full_rows(bit_board)
+        lines += cleared
+        assert np.array_equal(array_board, bit_board.to_array())
+
+    return max_pieces, probes, lines
+
+
+def time_collisions(engine, board, shapes, iterations):
+    """Time is_valid_position over a fixed probe set."""
+    keys = list(shapes.keys())
+    probes = [(shapes[keys[i % len(keys)]], 0, i % (BOARD_WIDTH - 2), i % (BOARD_HEIGHT - 3))
+              for i in range(1000)]
+    check = engine.is_valid_position
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for shape, rotation, pos_x, pos_y in probes:
+            check(board, shape, rotation, pos_x, pos_y)
+    return (time.perf_counter() - start) / (iterations * len(probes))
+
+
+def main():
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    rng = random.Random(1234)
+    shapes = tetris_logic.create_tetris_shapes()
+
+    total_pieces = total_probes = total_lines = 0
+    for _ in range(games):
+        pieces, probes, lines = play_random_game(rng, shapes)
+        total_pieces += pieces
+        total_probes += probes
+        total_lines += lines
+    print(f"Equivalent over {games} games: {total_pieces} pieces, "
+          f"{total_lines} lines cleared, {total_probes} random probes")
+
+    # Benchmark on a half-filled board
+    array_board = tetris_logic.create_tetris_board()
+    fill_rng = np.random.default_rng(0)
+    for r in range(BOARD_HEIGHT // 2, BOARD_HEIGHT):
+        array_board[r][fill_rng.choice(BOARD_WIDTH, BOARD_WIDTH - 2, replace=False)] = 1
+    bit_board = bitboard.bitboard_from_array(array_board)
+
+    array_time = time_collisions(tetris_logic, array_board, shapes, 5)
+    bit_time = time_collisions(bitboard, bit_board, shapes, 5)
+    print(f"is_valid_position: array {array_time * 1e6:.2f} us, "
+          f"bitboard {bit_time * 1e6:.2f} us, speedup {array_time / bit_time:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
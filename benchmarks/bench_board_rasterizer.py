@@ -0,0 +1,130 @@
+"""
+Motion Tetris - Board Rasterizer Benchmark
+=========================================
+Compares the per-cell cv2 renderer (draw_tetris_board + draw_tetris_shape)
+against the vectorized BoardRasterizer on random boards, checking that both
+produce identical pixels. Also checks that BoardRenderer's incremental
+repaint after piece locks matches a fresh render.
+
+Usage:
+    python benchmarks/bench_board_rasterizer.py [iterations]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import BOARD_WIDTH, BOARD_HEIGHT, CELL_SIZE
+from game_state import GameState
+from tetris_logic import create_tetris_shapes
+from video_processing import BoardRasterizer, BoardRenderer, draw_tetris_board, draw_tetris_shape
+
+
+def make_scenes(count, seed=0):
+    """Random boards of varying fill with a falling piece on each."""
+    rng = np.random.default_rng(seed)
+    shapes = create_tetris_shapes()
+    keys = list(shapes.keys())
+    scenes = []
+    for i in range(count):
+        fill = rng.random((BOARD_HEIGHT, BOARD_WIDTH)) < rng.uniform(0.1, 0.8)
+        board = rng.integers(1, 8, (BOARD_HEIGHT, BOARD_WIDTH)) * fill
+        shape = shapes[keys[i % len(keys)]]
+        rotation = i % len(shape['shape'])
+        pos_x = int(rng.integers(0, BOARD_WIDTH - 3))
+        pos_y = int(rng.integers(0, BOARD_HEIGHT - 3))
+        scenes.append((board, shape, rotation, pos_x, pos_y))
+    return scenes
+
+
+def render_reference(board, shape, rotation, pos_x, pos_y, cell_size):
+    canvas = draw_tetris_board(board, cell_size)
+    draw_tetris_shape(canvas, shape, rotation, pos_x, pos_y, cell_size)
+    return canvas
+
+
+def lock_and_compare(state, renderer, shapes):
+    """Lock the falling piece, repaint incrementally and compare with a fresh render."""
+    renderer.piece_locked(*state.lock_piece(shapes))
+    return np.array_equal(renderer.render(state.board), BoardRenderer(renderer.cell_size).render(state.board))
+
+
+def check_incremental_renderer(locks, seed=0):
+    """
+    BoardRenderer after piece_locked() must match a fresh render: first a
+    line clear with a touched row below it (vertical I over rows 16-19,
+    only row 18 full), then random drops.
+    """
+    shapes = create_tetris_shapes()
+    state = GameState(shapes.keys(), 0.0)
+    renderer = BoardRenderer()
+    board = state.own_board()
+    board[18] = 1
+    board[18, 5] = 0
+    renderer.render(board)
+    state.current_shape_key, state.current_rotation, state.pos_x, state.pos_y = 'I', 1, 3, 16
+    if not lock_and_compare(state, renderer, shapes):
+        print("MISMATCH: incremental render after a clear above touched rows")
+        return False
+
+    rng = np.random.default_rng(seed)
+    state.reset(0.0)
+    renderer = BoardRenderer()
+    renderer.render(state.board)
+    for _ in range(locks):
+        if state.game_over:
+            state.reset(0.0)
+            renderer.mark_dirty()
+        shape = shapes[state.current_shape_key]
+        state.current_rotation = int(rng.integers(len(shape['piece'].rotations)))
+        for _ in range(int(rng.integers(6))):
+            state.apply_key(ord('a') if rng.random() < 0.5 else ord('d'), 0.0, shapes)
+        state.apply_key(ord(' '), 0.0, shapes)
+        if not lock_and_compare(state, renderer, shapes):
+            print("MISMATCH: incremental render after a random lock")
+            return False
+        state.spawn_next_piece(shapes)
+    return True
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    scenes = make_scenes(iterations)
+
+    if not check_incremental_renderer(iterations):
+        return 1
+    print(f"BoardRenderer incremental repaint: identical to a fresh render over {iterations} locks")
+
+    for cell_size in (CELL_SIZE, 20):
+        rasterizer = BoardRasterizer(cell_size)
+        out = np.empty_like(rasterizer.background)
+
+        for scene in scenes:
+            expected = render_reference(*scene, cell_size)
+            if not np.array_equal(rasterizer.render(*scene, out=out), expected):
+                print(f"MISMATCH at cell size {cell_size}")
+                return 1
+
+        start = time.perf_counter()
+        for scene in scenes:
+            render_reference(*scene, cell_size)
+        reference_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for scene in scenes:
+            rasterizer.render(*scene, out=out)
+        vectorized_time = time.perf_counter() - start
+
+        print(f"cell size {cell_size:>3}: "
+              f"cv2 per-cell {reference_time / iterations * 1000:.3f} ms/frame, "
+              f"vectorized {vectorized_time / iterations * 1000:.3f} ms/frame, "
+              f"speedup {reference_time / vectorized_time:.1f}x (pixel-identical)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
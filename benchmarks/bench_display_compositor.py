@@ -0,0 +1,93 @@
+"""
+Motion Tetris - Display Compositor Benchmark
+===========================================
+Compares the per-frame allocating display functions
+(combine_board_and_webcam, overlay_tetris_on_webcam, a board copy) with
+the preallocated DisplayCompositor for each layout: checks identical
+pixels, then measures time and bytes allocated per frame (tracemalloc).
+
+Usage:
+    python benchmarks/bench_display_compositor.py [frames]
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from frame_sources import SyntheticSource
+from tetris_logic import create_tetris_shapes
+from video_processing import (
+    BoardRenderer, DisplayCompositor, combine_board_and_webcam, overlay_tetris_on_webcam
+)
+
+REFERENCE = {
+    "side_by_side": lambda board, webcam: combine_board_and_webcam(board, webcam),
+    "overlay": lambda board, webcam: overlay_tetris_on_webcam(webcam, board),
+    "board": lambda board, webcam: board.copy()
+}
+
+
+def make_frames(count):
+    """Webcam frames with a board canvas that changes every 15 frames."""
+    source = SyntheticSource(realtime=False)
+    shapes = create_tetris_shapes()
+    board = np.zeros((20, 10), dtype=np.uint8)
+    board[16:] = np.arange(1, 8).repeat(6)[:40].reshape(4, 10)
+    renderer = BoardRenderer()
+    frames = []
+    for i in range(count):
+        webcam = source.read()[1].copy()
+        canvas = renderer.render(board, shapes['L'], 0, 3, (i // 15) % 12)
+        frames.append((webcam, canvas.copy(), renderer.version))
+    return frames
+
+
+def measure(compose, frames):
+    """Seconds and traced bytes allocated per frame, after one warm-up frame."""
+    compose(*frames[0])
+    start = time.perf_counter()
+    for frame in frames:
+        compose(*frame)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    before = tracemalloc.get_traced_memory()[0]
+    allocated = 0
+    for frame in frames:
+        compose(*frame)
+        current, peak = tracemalloc.get_traced_memory()
+        allocated += peak - before
+        tracemalloc.reset_peak()
+    tracemalloc.stop()
+    return elapsed / len(frames), allocated / len(frames)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    frames = make_frames(count)
+    compositor = DisplayCompositor()
+
+    for layout, reference in REFERENCE.items():
+        for webcam, canvas, version in frames:
+            expected = reference(canvas, webcam)
+            if not np.array_equal(compositor.compose(layout, canvas, webcam, version), expected):
+                print(f"MISMATCH in layout {layout}")
+                return 1
+
+        reference_time, reference_bytes = measure(lambda w, c, v: reference(c, w), frames)
+        compositor = DisplayCompositor()
+        compositor_time, compositor_bytes = measure(lambda w, c, v: compositor.compose(layout, c, w, v), frames)
+        print(f"{layout:<12}: allocating {reference_time * 1000:.3f} ms, {reference_bytes / 1024:.0f} KiB/frame; "
+              f"preallocated {compositor_time * 1000:.3f} ms, {compositor_bytes / 1024:.1f} KiB/frame "
+              f"(pixel-identical)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,122 @@
+"""
+Motion Tetris - Capture-to-Inference Frame Path Benchmark
+=========================================================
+Compares the allocating frame path (flip into a new array, copy for
+annotations, cvtColor into a new RGB array) with the reusable-buffer one
+(read_frame(out=...), detect_hand_gesture(out=...), read-only RGB buffer)
+on synthetic frames: checks identical annotated frames, then measures
+time and bytes allocated per frame with tracemalloc.
+
+MediaPipe's own native allocations are not visible to tracemalloc; the
+numbers cover the Python/NumPy side of the path.
+
+Usage:
+    python benchmarks/bench_frame_path.py [frames]
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+
+import cv2
+import mediapipe as mp
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from frame_sources import SyntheticSource
+from gestures import (
+    hands_detector, mp_hands, classify_hand_results, detect_hand_gesture, visualize_gesture
+)
+from video_processing import read_frame
+
+
+class RecordedFrames:
+    """Hands out pre-generated raw frames like cap.read, so the source is not measured."""
+
+    def __init__(self, frames):
+        self.frames = frames
+        self.index = 0
+
+    def read(self):
+        frame = self.frames[self.index % len(self.frames)]
+        self.index += 1
+        return True, frame
+
+
+def legacy_frame_path(cap):
+    """The per-frame path before reusable buffers: three new frame-sized arrays."""
+    frame = read_frame(cap)
+    processed_frame = frame.copy()
+    rgb_frame = cv2.cvtColor(processed_frame, cv2.COLOR_BGR2RGB)
+    results = hands_detector.process(rgb_frame)
+    if results.multi_hand_landmarks:
+        for hand_landmarks in results.multi_hand_landmarks:
+            mp.solutions.drawing_utils.draw_landmarks(processed_frame, hand_landmarks, mp_hands.HAND_CONNECTIONS)
+    gesture = classify_hand_results(results)
+    visualize_gesture(processed_frame, gesture)
+    return processed_frame, gesture
+
+
+class FramePath:
+    """The reusable-buffer path: mirrored frame and annotated frame live in fixed buffers."""
+
+    def __init__(self, shape):
+        self.mirrored = np.empty(shape, dtype=np.uint8)
+        self.annotated = np.empty(shape, dtype=np.uint8)
+
+    def __call__(self, cap):
+        frame = read_frame(cap, out=self.mirrored)
+        return detect_hand_gesture(frame, out=self.annotated)
+
+
+def measure(path, cap, count):
+    """Seconds and traced bytes allocated per frame, after a few warm-up frames."""
+    for _ in range(5):
+        path(cap)
+    start = time.perf_counter()
+    for _ in range(count):
+        path(cap)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    allocated = 0
+    for _ in range(count):
+        path(cap)
+        allocated += tracemalloc.get_traced_memory()[1] - before
+        tracemalloc.reset_peak()
+    tracemalloc.stop()
+    return elapsed / count, allocated / count
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    source = SyntheticSource(realtime=False)
+    raw_frames = [source.read()[1] for _ in range(count)]
+    frame_bytes = raw_frames[0].nbytes
+
+    # Same input, same annotations (the detector is run in lockstep so its tracking state matches)
+    frame_path = FramePath(raw_frames[0].shape)
+    legacy_cap, cap = RecordedFrames(raw_frames), RecordedFrames(raw_frames)
+    for _ in range(10):
+        expected, expected_gesture = legacy_frame_path(legacy_cap)
+        actual, gesture = frame_path(cap)
+        if gesture != expected_gesture or not np.array_equal(actual, expected):
+            print("MISMATCH between legacy and reusable-buffer frame paths")
+            return 1
+
+    results = {}
+    for name, path in (("allocating", legacy_frame_path), ("reusable buffers", frame_path)):
+        results[name] = measure(path, RecordedFrames(raw_frames), count)
+        seconds, allocated = results[name]
+        print(f"{name:<16}: {seconds * 1000:.2f} ms/frame, {allocated / 1024:.1f} KiB/frame allocated "
+              f"(~{allocated / frame_bytes:.2f} frame buffers of {frame_bytes / 1024:.0f} KiB)")
+    reduction = results["allocating"][1] / max(results["reusable buffers"][1], 1)
+    print(f"allocation reduction: {reduction:.0f}x (annotated frames identical)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+"""
+Motion Tetris - Gesture Pipeline Throughput Benchmark
+====================================================
+Feeds frames from a camera-less frame source through read_frame and
+detect_hand_gesture as fast as possible and reports throughput, so the
+numbers are reproducible on machines without a webcam.
+
+Usage:
+    python benchmarks/bench_gesture_pipeline.py [frames] [kind] [path]
+
+kind is "synthetic" (default), "video" or "images"; path is the video file
+or image directory for the latter two.
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from frame_sources import create_frame_source
+from gestures import detect_hand_gesture
+from video_processing import read_frame
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    kind = sys.argv[2] if len(sys.argv) > 2 else "synthetic"
+    path = sys.argv[3] if len(sys.argv) > 3 else None
+
+    source = create_frame_source(kind, path, realtime=False, loop=True)
+    if source is None:
+        return 1
+
+    # Source alone, to separate decode/generation cost from inference
+    start = time.perf_counter()
+    for _ in range(frames):
+        read_frame(source)
+    source_time = time.perf_counter() - start
+
+    # Warm up the detector before timing
+    for _ in range(5):
+        detect_hand_gesture(read_frame(source))
+
+    latencies = []
+    gestures = {}
+    start = time.perf_counter()
+    for _ in range(frames):
+        frame = read_frame(source)
+        if frame is None:
+            break
+        t0 = time.perf_counter()
+        _, gesture = detect_hand_gesture(frame)
+        latencies.append(time.perf_counter() - t0)
+        gestures[gesture] = gestures.get(gesture, 0) + 1
+    total_time = time.perf_counter() - start
+    source.release()
+
+    latencies = np.array(latencies) * 1000
+    print(f"source only: {frames / source_time:,.0f} frames/s")
+    print(f"read_frame + detect_hand_gesture: {len(latencies) / total_time:.1f} frames/s, "
+          f"p50 {np.percentile(latencies, 50):.2f} ms, p95 {np.percentile(latencies, 95):.2f} ms")
+    print(f"gestures: {gestures}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,48 @@
+"""
+Motion Tetris - Hand Tracking Mode Benchmark
+===========================================
+Runs each HandTracker mode ("full", "downscaled", "roi") over the same
+frames and reports per-frame inference time for every path taken, plus how
+often ROI tracking fell back to a full search. Use a recording with hands in
+it for meaningful ROI numbers; the synthetic source contains no hands.
+
+Usage:
+    python benchmarks/bench_hand_tracking.py [frames] [kind] [path]
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from frame_sources import create_frame_source
+from hand_tracking import HandTracker, TRACKING_MODES, format_inference_timings
+from video_processing import read_frame
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    kind = sys.argv[2] if len(sys.argv) > 2 else "synthetic"
+    path = sys.argv[3] if len(sys.argv) > 3 else None
+
+    for mode in TRACKING_MODES:
+        source = create_frame_source(kind, path, realtime=False, loop=False)
+        if source is None:
+            return 1
+        tracker = HandTracker(mode)
+        hands_seen = 0
+        for _ in range(frames):
+            frame = read_frame(source)
+            if frame is None:
+                break
+            landmarks, _ = tracker.process(frame)
+            hands_seen += len(landmarks) > 0
+        source.release()
+
+        print(f"{mode:>10}: {format_inference_timings(tracker.timings)}; "
+              f"hands in {hands_seen} frames, {tracker.fallbacks} ROI fallbacks")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+"""
+Motion Tetris - HUD Text Benchmark
+=================================
+Compares drawing the HUD text with cv2.putText every frame (gesture
+instructions, score/lines/FPS, game over screen) with the cached sprites
+of hud.py: checks the output (identical for hard-edged text, within a few
+levels for anti-aliased text), then measures time per frame.
+
+As in the game loop, the FPS average changes every frame; the sprite HUD
+shows it through SampledValue, as main() does, and is also timed without
+it to show the cost of re-rasterizing a field every frame.
+
+Usage:
+    python benchmarks/bench_hud.py [frames]
+"""
+
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from gestures import visualize_gesture
+from hud import hud_layer, SampledValue
+from main import draw_game_info, draw_game_over_screen
+
+FONT = cv2.FONT_HERSHEY_SIMPLEX
+
+
+def legacy_visualize_gesture(frame):
+    instructions = [
+        ("Controls:", 0.5, -85),
+        ("- Angkat Tangan: Gerak Kiri/Kanan", 0.4, -65),
+        ("- Pinch: Rotasi", 0.4, -45),
+        ("- Genggam: Hard Drop", 0.4, -25)
+    ]
+    for text, scale, y_offset in instructions:
+        cv2.putText(frame, text, (10, frame.shape[0] + y_offset), FONT, scale, (255, 255, 255), 1)
+
+
+def legacy_draw_game_info(display_frame, score, lines_cleared_total, avg_fps, hard_drop_active):
+    cv2.putText(display_frame, f"Score: {score}", (10, 30), FONT, 0.7, (0, 255, 0), 2)
+    cv2.putText(display_frame, f"Lines: {lines_cleared_total}", (10, 60), FONT, 0.7, (0, 255, 0), 2)
+    cv2.putText(display_frame, f"FPS: {avg_fps:.1f}", (10, 90), FONT, 0.7, (0, 255, 0), 2)
+    if hard_drop_active:
+        cv2.putText(display_frame, "HARD DROP ACTIVE!", (10, 150), FONT, 0.7, (0, 255, 255), 2)
+
+
+def legacy_draw_game_over_screen(display_frame, score):
+    text_size, _ = cv2.getTextSize("Game Over!", FONT, 2, 3)
+    text_x = (display_frame.shape[1] - text_size[0]) // 2
+    text_y = (display_frame.shape[0] + text_size[1]) // 2
+    cv2.putText(display_frame, "Game Over!", (text_x, text_y - 30), FONT, 2, (0, 0, 255), 3, cv2.LINE_AA)
+    cv2.putText(display_frame, f"Final Score: {score}", (text_x, text_y + 20), FONT, 1, (0, 0, 255), 2, cv2.LINE_AA)
+    cv2.putText(display_frame, "Press 'R' to Restart or 'Q' to Quit", (text_x - 100, text_y + 70), FONT, 0.7,
+                (255, 255, 255), 2, cv2.LINE_AA)
+
+
+def game_frame(i):
+    """Score and lines change every 30 frames, the FPS average every frame, hard drop every other second."""
+    return i // 30 * 100, i // 30, 30.0 + 0.1 * (i % 13) + 0.37 * (i % 3), (i // 60) % 2 == 1
+
+
+def legacy_hud(frame, webcam, i, game_over, fps=None):
+    score, lines, avg_fps, hard_drop = game_frame(i)
+    legacy_visualize_gesture(webcam)
+    legacy_draw_game_info(frame, score, lines, avg_fps if fps is None else fps, hard_drop)
+    if game_over:
+        legacy_draw_game_over_screen(frame, score)
+
+
+def sprite_hud(frame, webcam, i, game_over, fps=None):
+    score, lines, avg_fps, hard_drop = game_frame(i)
+    visualize_gesture(webcam, "none")
+    draw_game_info(frame, score, lines, avg_fps if fps is None else fps, False, hard_drop)
+    if game_over:
+        draw_game_over_screen(frame, score)
+
+
+def measure(draw, background, webcam_background, count, game_over, fps_readout=None):
+    frame, webcam = background.copy(), webcam_background.copy()
+    start = time.perf_counter()
+    for i in range(count):
+        fps = None if fps_readout is None else fps_readout.update(game_frame(i)[2])
+        draw(frame, webcam, i, game_over, fps)
+    return (time.perf_counter() - start) / count
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    rng = np.random.default_rng(0)
+    background = rng.integers(0, 256, (480, 1120, 3), dtype=np.uint8)
+    webcam_background = rng.integers(0, 256, (480, 640, 3), dtype=np.uint8)
+
+    for game_over in (False, True):
+        for i in range(0, 120, 7):
+            expected, expected_webcam = background.copy(), webcam_background.copy()
+            actual, actual_webcam = background.copy(), webcam_background.copy()
+            legacy_hud(expected, expected_webcam, i, game_over)
+            sprite_hud(actual, actual_webcam, i, game_over)
+            difference = max(np.abs(expected.astype(int) - actual).max(),
+                             np.abs(expected_webcam.astype(int) - actual_webcam).max())
+            if difference > (8 if game_over else 0):  # Anti-aliased edges are blended from coverage
+                print(f"MISMATCH (max difference {difference}) at frame {i}, game over {game_over}")
+                return 1
+
+        legacy_time = measure(legacy_hud, background, webcam_background, count, game_over)
+        every_frame_time = measure(sprite_hud, background, webcam_background, count, game_over)
+        sprite_time = measure(sprite_hud, background, webcam_background, count, game_over, SampledValue())
+        state = "game over" if game_over else "playing"
+        print(f"{state:<9}: putText {legacy_time * 1000:.3f} ms/frame, "
+              f"sprites {sprite_time * 1000:.3f} ms/frame ({legacy_time / sprite_time:.1f}x), "
+              f"sprites with FPS re-rasterized every frame {every_frame_time * 1000:.3f} ms/frame")
+
+    print(f"sprite cache: {len(hud_layer.cache)} sprites, {hud_layer.cache.hits} hits, "
+          f"{hud_layer.cache.misses} misses; dynamic field updates: {hud_layer.field_updates}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+"""
+Motion Tetris - Overlay Compositor Benchmark
+===========================================
+Compares overlay_tetris_on_webcam with the cached OverlayCompositor on
+synthetic webcam frames and a falling piece that moves every few frames,
+checking that both produce identical pixels.
+
+Usage:
+    python benchmarks/bench_overlay.py [frames] [frames_per_move]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from frame_sources import SyntheticSource
+from tetris_logic import create_tetris_shapes
+from video_processing import BoardRenderer, OverlayCompositor, overlay_tetris_on_webcam
+
+
+def make_inputs(frames, frames_per_move, seed=0):
+    """Webcam frames plus board render arguments for each frame."""
+    rng = np.random.default_rng(seed)
+    source = SyntheticSource(realtime=False)
+    webcam_frames = [source.read()[1].copy() for _ in range(min(frames, 64))]
+    shapes = create_tetris_shapes()
+    board = np.zeros((20, 10), dtype=np.uint8)
+    board[14:] = rng.integers(0, 8, (6, 10))
+    scenes = []
+    pos_x, pos_y = 3, 0
+    for i in range(frames):
+        if i % frames_per_move == 0:
+            pos_y = (pos_y + 1) % 12
+            pos_x = int(rng.integers(0, 7))
+        scenes.append((webcam_frames[i % len(webcam_frames)], (board, shapes['T'], 0, pos_x, pos_y)))
+    return scenes
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 600
+    frames_per_move = int(sys.argv[2]) if len(sys.argv) > 2 else 15
+    scenes = make_inputs(frames, frames_per_move)
+
+    renderer = BoardRenderer()
+    compositor = OverlayCompositor()
+    for webcam_frame, render_args in scenes:
+        board_canvas = renderer.render(*render_args)
+        expected = overlay_tetris_on_webcam(webcam_frame, board_canvas)
+        if not np.array_equal(compositor.compose(webcam_frame, board_canvas, renderer.version), expected):
+            print("MISMATCH between OverlayCompositor and overlay_tetris_on_webcam")
+            return 1
+
+    canvases = []
+    for _, render_args in scenes:
+        canvases.append((renderer.render(*render_args), renderer.version))
+
+    start = time.perf_counter()
+    for (webcam_frame, _), (board_canvas, _) in zip(scenes, canvases):
+        overlay_tetris_on_webcam(webcam_frame, board_canvas)
+    reference_time = time.perf_counter() - start
+
+    for uncached in (False, True):
+        compositor = OverlayCompositor()
+        start = time.perf_counter()
+        for (webcam_frame, _), (board_canvas, version) in zip(scenes, canvases):
+            compositor.compose(webcam_frame, board_canvas, None if uncached else version)
+        cached_time = time.perf_counter() - start
+        label = "every frame changed" if uncached else f"board moves every {frames_per_move} frames"
+        print(f"{label}: overlay_tetris_on_webcam {reference_time / frames * 1000:.3f} ms/frame, "
+              f"OverlayCompositor {cached_time / frames * 1000:.3f} ms/frame, "
+              f"speedup {reference_time / cached_time:.1f}x (pixel-identical)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
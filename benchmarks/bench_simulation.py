@@ -0,0 +1,108 @@
+"""
+Motion Tetris - Headless Simulation Equivalence Check and Benchmark
+==================================================================
+Mirrors a few boards of the batched simulator with the array engine
+(tetris_logic), checking that placements, line clears and game-over
+resets agree. Then measures placement throughput for several batch sizes
+and tick throughput with random action streams.
+
+Usage:
+    python benchmarks/bench_simulation.py [batches]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import tetris_logic
+from simulation import BatchedTetrisSimulator, PIECE_KEYS, PIECE_NUM_ROTATIONS
+from config import BOARD_WIDTH, BOARD_HEIGHT
+from tetris_logic import SPAWN_X, SPAWN_Y
+
+
+def mirror_placements(batches, mirrored=64, seed=7):
+    """Replay placements of the first boards on tetris_logic boards; return lines cleared."""
+    sim = BatchedTetrisSimulator(64, seed=seed, piece_sequence="random")
+    shapes = tetris_logic.create_tetris_shapes()
+    boards = [tetris_logic.create_tetris_board() for _ in range(mirrored)]
+    rng = np.random.default_rng(seed)
+    lines = 0
+
+    # Start from nearly-full rows with one gap each so line clears get exercised
+    for b, board in enumerate(boards):
+        for r in range(BOARD_HEIGHT - 10, BOARD_HEIGHT):
+            board[r] = 1
+            board[r, rng.integers(0, BOARD_WIDTH)] = 0
+        sim.rows[b] = (board != 0) @ (1 << np.arange(BOARD_WIDTH))
+
+    for _ in range(batches):
+        rotations = rng.integers(0, 4, sim.num_boards)
+        xs = rng.integers(-3, 12, sim.num_boards)
+        pieces = sim.piece.copy()
+        games = sim.games_played.copy()
+        sim.place(rotations, xs)
+
+        for b, board in enumerate(boards):
+            shape = shapes[PIECE_KEYS[pieces[b]]]
+            rotation = int(rotations[b] % PIECE_NUM_ROTATIONS[pieces[b]])
+            min_x, max_x = tetris_logic.get_piece_rotation(shape, rotation).x_range
+            pos_x = int(np.clip(xs[b], min_x, max_x))
+            pos_y = SPAWN_Y
+
+            if tetris_logic.is_valid_position(board, shape, rotation, pos_x, pos_y):
+                while tetris_logic.is_valid_position(board, shape, rotation, pos_x, pos_y + 1):
+                    pos_y += 1
+                tetris_logic.add_piece_to_board(board, shape, rotation, pos_x, pos_y)
+                lines += tetris_logic.clear_full_rows(board)
+                next_shape = shapes[PIECE_KEYS[sim.piece[b]]]
+                topped_out = not tetris_logic.is_valid_position(board, next_shape, 0, SPAWN_X, SPAWN_Y)
+            else:
+                topped_out = True
+
+            if topped_out:
+                board[:] = 0
+            assert sim.games_played[b] - games[b] == topped_out
+            assert np.array_equal(sim.occupancy(b), board != 0), b
+
+    return sim, lines
+
+
+def time_placements(num_boards, batches):
+    sim = BatchedTetrisSimulator(num_boards, seed=1, piece_sequence="random")
+    start = time.perf_counter()
+    sim.run_random_placements(batches)
+    elapsed = time.perf_counter() - start
+    return sim.get_stats()['pieces_placed'] / elapsed
+
+
+def time_ticks(num_boards, steps):
+    sim = BatchedTetrisSimulator(num_boards, seed=2)
+    start = time.perf_counter()
+    sim.run("random", steps)
+    elapsed = time.perf_counter() - start
+    return num_boards * steps / elapsed, sim.get_stats()['pieces_placed'] / elapsed
+
+
+def main():
+    batches = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    sim, lines = mirror_placements(batches)
+    print(f"Equivalent over {batches} batches: {lines} lines cleared, "
+          f"{int(sim.games_played.sum())} game-over resets on 64 mirrored boards")
+
+    for num_boards in (256, 4096, 16384):
+        rate = time_placements(num_boards, batches)
+        print(f"place(): {num_boards:>6} boards -> {rate:,.0f} placements/s")
+
+    tick_rate, placement_rate = time_ticks(4096, batches)
+    print(f"step():    4096 boards -> {tick_rate:,.0f} board-ticks/s "
+          f"({placement_rate:,.0f} placements/s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,145 @@
+"""
+Motion Tetris - Bitboard Game Engine
+===================================
+Drop-in alternative to the board functions in tetris_logic, storing each
+board row as an integer bitmask:
+- Every piece rotation is precomputed as row masks already shifted to each
+  legal x position
+- Collision tests are a handful of AND operations
+- Full-row detection is a single mask compare per row
+- A per-cell color array is kept alongside for rendering
+
+The API mirrors create_tetris_board/is_valid_position/add_piece_to_board/
+clear_full_rows, so callers can switch engines by swapping the import.
+"""
+
+import numpy as np
+from config import BOARD_WIDTH, BOARD_HEIGHT
+from tetris_logic import get_piece_rotation
+
+# Row layout: board column c lives in bit (c + _PAD). Pieces may sit up to
+# two columns left of the board (piece_x >= -2) and their 4x4 box may reach
+# two columns past the right edge, so those bits are walls.
+_PAD = 3
+_FULL_ROW = ((1 << BOARD_WIDTH) - 1) << _PAD
+_WALLS = ((1 << _PAD) - 1) | (((1 << 4) - 1) << (_PAD + BOARD_WIDTH))
+_EMPTY_ROW = _WALLS
+
+_MIN_X = -2
+_MAX_X = BOARD_WIDTH - 2
+
+
+class BitBoard:
+    """Bitmask board: one int per row plus the color grid used for drawing."""
+
+    __slots__ = ('rows', 'cells')
+
+    def __init__(self):
+        self.rows = [_EMPTY_ROW] * BOARD_HEIGHT
+        self.cells = np.zeros((BOARD_HEIGHT, BOARD_WIDTH), dtype=np.uint8)
+
+    def to_array(self):
+        """Return the color grid in the same layout as tetris_logic boards."""
+        return self.cells
+
+
+def _build_piece_masks(rotation):
+    """Precompute row masks of one rotation for every legal x position."""
+    row_masks = {}
+    for r, c in rotation.cells:
+        row_masks[r] = row_masks.get(r, 0) | (1 << c)
+
+    return tuple(
+        tuple((r, mask << (piece_x + _PAD)) for r, mask in sorted(row_masks.items()))
+        for piece_x in range(_MIN_X, _MAX_X + 1)
+    )
+
+
+def _piece_masks(shape_details, rotation_idx):
+    """
+    Cached shifted masks for a shape rotation. They are stored on the shape
+    dictionary itself (next to its precompiled 'piece'), so two shapes can
+    never share masks.
+    """
+    masks = shape_details.get('bitboard_masks')
+    if masks is None:
+        rotation_count = len(shape_details['shape'])
+        masks = tuple(_build_piece_masks(get_piece_rotation(shape_details, i)) for i in range(rotation_count))
+        shape_details['bitboard_masks'] = masks
+    return masks[rotation_idx]
+
+
+def create_tetris_board():
+    """Create an empty bitboard."""
+    return BitBoard()
+
+
+def bitboard_from_array(cells):
+    """Build a bitboard from an array board (e.g. one from tetris_logic)."""
+    board = BitBoard()
+    board.cells[:] = cells
+    for r in range(BOARD_HEIGHT):
+        for c in np.flatnonzero(board.cells[r]):
+            board.rows[r] |= 1 << (int(c) + _PAD)
+    return board
+
+
+def is_valid_position(board, shape_details, rotation_idx, piece_x, piece_y):
+    """
+    Validate if piece can be placed at given position.
+
+    Args:
+        board: Current BitBoard
+        shape_details: Dictionary with shape data
+        rotation_idx: Current rotation index
+        piece_x, piece_y: Position to check
+
+    Returns:
+        bool: True if position is valid
+    """
+    # Same quick boundary check as the array engine
+    if (piece_x < _MIN_X or
+        piece_x > _MAX_X or
+        piece_y > BOARD_HEIGHT - 2):
+        return False
+
+    rows = board.rows
+    for r, mask in _piece_masks(shape_details, rotation_idx)[piece_x - _MIN_X]:
+        board_r = piece_y + r
+        if board_r < 0 or board_r >= BOARD_HEIGHT:
+            return False
+        if rows[board_r] & mask:
+            return False
+    return True
+
+
+def add_piece_to_board(board, shape_details, rotation_idx, piece_x, piece_y):
+    """Add landed piece to the board."""
+    rotation = get_piece_rotation(shape_details, rotation_idx)
+    rows = board.rows
+    cells = board.cells
+
+    for r, c in rotation.cells:
+        board_r = piece_y + r
+        board_c = piece_x + c
+        if (0 <= board_r < BOARD_HEIGHT and
+            0 <= board_c < BOARD_WIDTH):
+            rows[board_r] |= 1 << (board_c + _PAD)
+            cells[board_r, board_c] = rotation.color_index
+
+
+def clear_full_rows(board):
+    """
+    Clear completed rows and return count.
+    Full rows are found with one mask compare each and removed in one pass.
+    """
+    rows = board.rows
+    keep = [r for r in range(BOARD_HEIGHT) if rows[r] & _FULL_ROW != _FULL_ROW]
+    lines_cleared = BOARD_HEIGHT - len(keep)
+    if lines_cleared == 0:
+        return 0
+
+    board.rows = [_EMPTY_ROW] * lines_cleared + [rows[r] for r in keep]
+    board.cells[lines_cleared:] = board.cells[keep]
+    board.cells[:lines_cleared] = 0
+    return lines_cleared
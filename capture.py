@@ -0,0 +1,190 @@
+"""
+Motion Tetris - Threaded Frame Capture Module
+============================================
+This module moves webcam capture off the game loop:
+- A producer thread keeps reading frames from the capture device
+- Frames land in a bounded, preallocated ring buffer (no per-frame allocation)
+- The game loop always takes the newest frame together with its capture time
+- Stale frames are dropped instead of queueing up behind the game loop
+
+Counters for dropped and duplicated frames make it easy to see whether the
+camera or the game loop is the bottleneck.
+"""
+
+import threading
+import time
+
+import cv2
+import numpy as np
+from config import CAPTURE_RING_SIZE, CAPTURE_READ_TIMEOUT, CAPTURE_STARTUP_TIMEOUT
+
+
+class FrameCapture:
+    """
+    Latest-frame capture stage backed by a ring of preallocated buffers.
+
+    The producer thread writes into a free slot, never the one currently
+    handed out to the consumer, so a frame returned by read() stays valid
+    until the next call to read().
+    """
+
+    def __init__(self, cap, ring_size=CAPTURE_RING_SIZE, mirror=True):
+        if ring_size < 3:
+            raise ValueError("ring_size must be at least 3")
+
+        self._cap = cap
+        self._ring_size = ring_size
+        self._mirror = mirror
+
+        self._ring = None                       # Allocated from the first frame
+        self._scratch = None                    # Raw (unflipped) capture buffer
+        self._timestamps = [0.0] * ring_size
+        self._sequence = [0] * ring_size
+
+        self._cond = threading.Condition()
+        self._latest_slot = -1
+        self._reader_slot = -1
+        self._thread = None
+        self._running = False
+        self._failed = False
+
+        # Counters
+        self.frames_captured = 0
+        self.frames_delivered = 0
+        self.frames_dropped = 0
+        self.frames_duplicated = 0
+        self._last_delivered_seq = 0
+
+    # -------------------------------------------------------------------------
+    # Producer
+    # -------------------------------------------------------------------------
+
+    def start(self):
+        """Start the producer thread and return self for chaining."""
+        if self._thread is not None:
+            return self
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="FrameCapture", daemon=True)
+        self._thread.start()
+        return self
+
+    def _allocate(self, frame):
+        """Allocate the ring buffers to match the capture frame format."""
+        self._ring = np.empty((self._ring_size,) + frame.shape, dtype=frame.dtype)
+        self._scratch = np.empty_like(frame)
+
+    def _next_free_slot(self):
+        """Pick the next slot that is neither published nor held by the reader."""
+        slot = (self._latest_slot + 1) % self._ring_size
+        while slot == self._reader_slot or slot == self._latest_slot:
+            slot = (slot + 1) % self._ring_size
+        return slot
+
+    def _run(self):
+        """Capture loop: read, mirror into a free slot, publish."""
+        while self._running:
+            if self._scratch is None:
+                ret, frame = self._cap.read()
+            else:
+                ret, frame = self._cap.read(self._scratch)
+            capture_time = time.time()
+            if not ret or frame is None:
+                with self._cond:
+                    self._failed = True
+                    self._cond.notify_all()
+                break
+
+            if self._ring is None or frame.shape != self._ring.shape[1:]:
+                with self._cond:
+                    self._allocate(frame)
+                    self._latest_slot = -1
+                    self._reader_slot = -1
+
+            with self._cond:
+                slot = self._next_free_slot()
+
+            # Write outside the lock; the reader never touches this slot
+            if self._mirror:
+                cv2.flip(frame, 1, dst=self._ring[slot])  # Horizontal flip for mirror effect
+            else:
+                np.copyto(self._ring[slot], frame)
+
+            with self._cond:
+                self.frames_captured += 1
+                self._timestamps[slot] = capture_time
+                self._sequence[slot] = self.frames_captured
+                self._latest_slot = slot
+                self._cond.notify_all()
+
+    # -------------------------------------------------------------------------
+    # Consumer
+    # -------------------------------------------------------------------------
+
+    def read(self, timeout=CAPTURE_READ_TIMEOUT, startup_timeout=CAPTURE_STARTUP_TIMEOUT):
+        """
+        Return the newest frame and its capture timestamp.
+
+        Waits up to `timeout` seconds for a frame newer than the last one
+        delivered. If none arrives, the previous frame is returned again and
+        counted as duplicated. Until the first frame has arrived the wait is
+        up to `startup_timeout` instead; a camera that delivers nothing in
+        that time is treated as failed.
+
+        Returns:
+            tuple: (frame, capture_time), or (None, None) if capture failed
+        """
+        with self._cond:
+            if self._latest_slot < 0:
+                timeout = startup_timeout
+            deadline = time.time() + timeout
+            while not self._has_new_frame() and not self._failed:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+
+            if self._latest_slot < 0:
+                self._failed = True
+                return None, None
+
+            slot = self._latest_slot
+            seq = self._sequence[slot]
+            if seq == self._last_delivered_seq:
+                if self._failed:
+                    return None, None
+                self.frames_duplicated += 1
+            else:
+                self.frames_dropped += seq - self._last_delivered_seq - 1
+                self._last_delivered_seq = seq
+                self.frames_delivered += 1
+
+            self._reader_slot = slot
+            return self._ring[slot], self._timestamps[slot]
+
+    def _has_new_frame(self):
+        return (self._latest_slot >= 0 and
+                self._sequence[self._latest_slot] != self._last_delivered_seq)
+
+    def get_stats(self):
+        """Return capture counters as a dictionary."""
+        with self._cond:
+            return {
+                'captured': self.frames_captured,
+                'delivered': self.frames_delivered,
+                'dropped': self.frames_dropped,
+                'duplicated': self.frames_duplicated
+            }
+
+    def stop(self):
+        """Stop the producer thread. The capture device is not released."""
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+
+def start_frame_capture(cap, ring_size=CAPTURE_RING_SIZE):
+    """Wrap an opened capture device in a running FrameCapture stage."""
+    if cap is None:
+        return None
+    return FrameCapture(cap, ring_size=ring_size).start()
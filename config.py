@@ -48,6 +48,28 @@ CLAP_COOLDOWN = 0.5                 # Cooldown between clap detections (seconds)
 ROTATION_RECOGNITION_DELAY = 0.6    # Delay between rotations (seconds)
 GESTURE_COOLDOWN = 0.3              # General gesture cooldown (seconds)
 
+# =============================================================================
+# GESTURE INFERENCE SETTINGS
+# =============================================================================
+
+GESTURE_INFERENCE_MODE = "process"  # "inline" (main thread) or "process" (worker process)
+INFERENCE_RESULT_MAX_AGE = 0.25     # Ignore worker results older than this (seconds)
+INFERENCE_WORKER_RESTART_DELAY = 1.0  # Min time between worker restarts (seconds)
+GESTURE_TRACKING_MODE = "full"      # "full", "downscaled" or "roi" (crop around tracked hands)
+INFERENCE_DOWNSCALE = 0.5           # Frame scale for downscaled full-frame searches
+HAND_ROI_EXPAND = 1.6               # ROI side relative to the hands' bounding box
+HAND_ROI_SIZE = 256                 # ROI crops are resized to this square size (pixels)
+HAND_ROI_RESEARCH_INTERVAL = 10     # While fewer than the max hands are tracked, search the whole frame every N frames
+ADAPTIVE_INFERENCE = True           # Infer every N frames and extrapolate landmarks in between
+INFERENCE_LATENCY_BUDGET = 0.008    # Max average inference time per frame (seconds)
+INFERENCE_MAX_INTERVAL = 6          # Max frames between inferences
+INFERENCE_EXTRAPOLATION_MAX = 0.2   # Hold landmarks instead of extrapolating past this age (seconds)
+MOTION_GATE_ENABLED = True          # Skip inference while the scene is static
+MOTION_GATE_SIZE = (32, 24)         # Grayscale thumbnail size for the motion check (width, height)
+MOTION_GATE_PIXEL_THRESHOLD = 12    # Gray-level change for a thumbnail pixel to count as changed
+MOTION_GATE_MIN_CHANGED = 0.01      # Fraction of changed thumbnail pixels counted as motion
+MOTION_GATE_MAX_SKIP = 15           # Max consecutive skipped frames before forcing inference
+
 # =============================================================================
 # GAME TIMING PARAMETERS  
 # =============================================================================
@@ -56,6 +78,8 @@ DEFAULT_MOVE_DELAY = 0.5            # Auto-drop delay (seconds)
 ROTATION_DELAY = 0.5                # Delay between rotations
 HARD_DROP_SPEED_MULTIPLIER = 3.0    # Speed multiplier for hard drop
 HARD_DROP_DELAY = DEFAULT_MOVE_DELAY / HARD_DROP_SPEED_MULTIPLIER
+SIMULATION_TICK_RATE = 60           # Fixed game logic ticks per second
+SIMULATION_MAX_TICKS_PER_FRAME = 10  # Drop simulation backlog beyond this after a stall
 
 # =============================================================================
 # AUDIO SETTINGS
@@ -65,6 +89,26 @@ BGM_PATH = "sfx/bgm.mp3"            # Background music file
 CLEAR_ROW_SOUND_PATH = "sfx/clearRow.mp3"  # Line clear sound
 DEFAULT_MUSIC_VOLUME = 0.3          # Music volume (0.0 to 1.0)
 
+# =============================================================================
+# FRAME SOURCE SETTINGS
+# =============================================================================
+
+FRAME_SOURCE = "webcam"             # "webcam", "video", "images" or "synthetic"
+FRAME_SOURCE_PATH = None            # Device id, video file or image directory
+FRAME_SOURCE_REALTIME = True        # Pace non-camera sources to their frame rate
+FRAME_SOURCE_LOOP = True            # Restart video/image sources at the end
+SYNTHETIC_FRAME_WIDTH = 640         # Synthetic source frame size
+SYNTHETIC_FRAME_HEIGHT = 480
+SYNTHETIC_FPS = 30                  # Nominal rate for synthetic and image sources
+
+# =============================================================================
+# CAPTURE SETTINGS
+# =============================================================================
+
+CAPTURE_RING_SIZE = 4               # Preallocated frame slots in the capture ring
+CAPTURE_READ_TIMEOUT = 0.05         # Max wait for a fresh frame before reusing the last one (seconds)
+CAPTURE_STARTUP_TIMEOUT = 10.0      # Max wait for the first frame; cameras can take seconds to start
+
 # =============================================================================
 # VIDEO RECORDING SETTINGS
 # =============================================================================
@@ -72,6 +116,40 @@ DEFAULT_MUSIC_VOLUME = 0.3          # Music volume (0.0 to 1.0)
 VIDEO_OUTPUT_DIRECTORY = "game_recordings"     
 OUTPUT_VIDEO_FILENAME = "tetris_gameplay.avi"  
 VIDEO_FOURCC = "XVID"                         # Video codec for AVI
+VIDEO_RECORDING_ENABLED = True      # Encode gameplay video live (the session log can be replayed instead)
+RECORDING_QUEUE_SIZE = 32           # Frames buffered for the recording thread
+RECORDING_BACKPRESSURE = "drop"     # "drop", "block" or "decimate" when the encoder falls behind
+RECORDING_DECIMATE_FACTOR = 2       # Keep every Nth frame while decimating
+RECORDING_BLOCK_TIMEOUT = 1.0       # Max seconds a "block" write waits for the encoder before dropping
+
+# =============================================================================
+# SESSION LOG SETTINGS
+# =============================================================================
+
+SESSION_LOG_ENABLED = True          # Log input events for deterministic replay (replay.py)
+SESSION_LOG_FILENAME = "session.mtlog"  # Written to VIDEO_OUTPUT_DIRECTORY
+OFFLINE_RENDER_FPS = 30             # Frame rate of videos rendered from session logs
+OFFLINE_RENDER_SEGMENT_FRAMES = 300 # Frames per parallel render task
+OFFLINE_RENDER_FILENAME = "session_replay.avi"
+
+# =============================================================================
+# PROFILING SETTINGS
+# =============================================================================
+
+PROFILE_WINDOW = 512                # Samples kept per stage histogram
+PROFILE_HUD = False                 # Draw per-stage p50/p95/p99 on screen
+PROFILE_HUD_REFRESH = 15            # Frames between HUD percentile updates
+PROFILE_EXPORT_FILENAME = "stage_timings.json"  # Written on exit (.json or .csv); None to disable
+
+# =============================================================================
+# LATENCY TRACING SETTINGS
+# =============================================================================
+
+LATENCY_TAG_HISTORY = 256           # Frames whose capture times are remembered
+LATENCY_TRACE_SYNTHETIC = False     # Replace detected gestures with LATENCY_SCRIPT (use with FRAME_SOURCE = "synthetic")
+LATENCY_SCRIPT = (                  # Repeating (gesture, frames) sequence for the synthetic test mode
+    ("none", 20), ("left", 10), ("none", 20), ("right", 10), ("none", 20), ("rotate", 10)
+)
 
 # =============================================================================
 # DISPLAY SETTINGS
@@ -81,3 +159,7 @@ OVERLAY_ALPHA = 0.6                 # Transparency for board overlay
 DEBUG_INFO_FONT_SIZE = 0.5          # Font size for debug info
 INSTRUCTION_FONT_SIZE = 0.4         # Font size for instructions
 SCORE_FONT_SIZE = 0.7              # Font size for score display
+HEADLESS = False                    # No window and no sound (e.g. CI benchmarks with FRAME_SOURCE = "synthetic")
+HEADLESS_FRAMES = 600               # Frames to run before exiting when headless; None to run until the source ends
+HUD_SPRITE_CACHE_SIZE = 128         # Rasterized HUD strings kept (least recently used are evicted)
+HUD_FPS_REFRESH = 15                # Frames between FPS readout updates (each new value is re-rasterized)
@@ -0,0 +1,245 @@
+"""
+Motion Tetris - Frame Sources Module
+===================================
+Interchangeable frame sources so the gesture pipeline and the game loop can
+run without a physical camera:
+- Webcam (cv2.VideoCapture on a device)
+- Video file
+- Directory of still images
+- Synthetic generator (moving skin-toned blob over a gradient)
+
+Every source duck-types the parts of cv2.VideoCapture the game uses
+(read/isOpened/release/get/set), so it can be handed to read_frame or
+start_frame_capture unchanged. File, directory and synthetic sources can be
+paced to their nominal frame rate ("realtime") or deliver frames as fast as
+they are read, which gives reproducible throughput numbers.
+"""
+
+import os
+import time
+
+import cv2
+import numpy as np
+from config import (
+    FRAME_SOURCE, FRAME_SOURCE_PATH, FRAME_SOURCE_REALTIME, FRAME_SOURCE_LOOP,
+    SYNTHETIC_FRAME_WIDTH, SYNTHETIC_FRAME_HEIGHT, SYNTHETIC_FPS
+)
+from video_processing import setup_webcam
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp')
+
+
+class FrameSource:
+    """
+    Base class for camera-less sources.
+
+    Subclasses implement _next_frame(image) returning a frame or None at the
+    end of the stream; pacing, looping and the VideoCapture interface live here.
+    """
+
+    def __init__(self, width, height, fps, realtime=FRAME_SOURCE_REALTIME):
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.realtime = realtime
+        self.frames_read = 0
+        self._opened = True
+        self._start_time = None
+
+    def _next_frame(self, image):
+        raise NotImplementedError
+
+    def _pace(self):
+        """Sleep until the nominal time of the next frame (realtime mode only)."""
+        if self._start_time is None:
+            self._start_time = time.perf_counter()
+            return
+        due = self._start_time + self.frames_read / self.fps
+        delay = due - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+
+    def read(self, image=None):
+        """Return (ret, frame) like cv2.VideoCapture.read."""
+        if not self._opened:
+            return False, None
+        if self.realtime:
+            self._pace()
+        frame = self._next_frame(image)
+        if frame is None:
+            return False, None
+        self.frames_read += 1
+        return True, frame
+
+    def isOpened(self):
+        return self._opened
+
+    def release(self):
+        self._opened = False
+
+    def get(self, prop_id):
+        """Subset of VideoCapture properties used by the game and benchmarks."""
+        if prop_id == cv2.CAP_PROP_FRAME_WIDTH:
+            return float(self.width)
+        if prop_id == cv2.CAP_PROP_FRAME_HEIGHT:
+            return float(self.height)
+        if prop_id == cv2.CAP_PROP_FPS:
+            return float(self.fps)
+        if prop_id == cv2.CAP_PROP_POS_FRAMES:
+            return float(self.frames_read)
+        return 0.0
+
+    def set(self, prop_id, value):
+        """Properties are fixed at construction."""
+        return False
+
+
+class VideoFileSource(FrameSource):
+    """Frames decoded from a video file."""
+
+    def __init__(self, path, realtime=FRAME_SOURCE_REALTIME, loop=FRAME_SOURCE_LOOP):
+        # No path leaves the source closed instead of raising
+        self._cap = cv2.VideoCapture(path) if path is not None else cv2.VideoCapture()
+        fps = self._cap.get(cv2.CAP_PROP_FPS) or SYNTHETIC_FPS
+        super().__init__(int(self._cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+                         int(self._cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+                         fps, realtime)
+        self._opened = self._cap.isOpened()
+        self.loop = loop
+
+    def _next_frame(self, image):
+        ret, frame = self._cap.read(image)
+        if not ret and self.loop and self.frames_read > 0:
+            self._cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, frame = self._cap.read(image)
+        return frame if ret else None
+
+    def get(self, prop_id):
+        if prop_id == cv2.CAP_PROP_FRAME_COUNT:
+            return self._cap.get(prop_id)
+        return super().get(prop_id)
+
+    def release(self):
+        super().release()
+        self._cap.release()
+
+
+class ImageDirectorySource(FrameSource):
+    """
+    Frames read from the images in a directory, in file name order.
+
+    With preload=True all images are decoded up front so that reading does
+    not include disk or decode time.
+    """
+
+    def __init__(self, directory, fps=SYNTHETIC_FPS, realtime=FRAME_SOURCE_REALTIME,
+                 loop=FRAME_SOURCE_LOOP, preload=True):
+        # A missing directory leaves the source closed instead of raising
+        names = os.listdir(directory) if directory is not None and os.path.isdir(directory) else ()
+        self.paths = sorted(
+            os.path.join(directory, name) for name in names
+            if name.lower().endswith(IMAGE_EXTENSIONS)
+        )
+        self.loop = loop
+        self._frames = [cv2.imread(path) for path in self.paths] if preload else None
+
+        first = self._load(0) if self.paths else None
+        height, width = first.shape[:2] if first is not None else (0, 0)
+        super().__init__(width, height, fps, realtime)
+        self._opened = first is not None
+
+    def _load(self, index):
+        if self._frames is not None:
+            return self._frames[index]
+        return cv2.imread(self.paths[index])
+
+    def _next_frame(self, image):
+        index = self.frames_read
+        if index >= len(self.paths):
+            if not self.loop:
+                return None
+            index %= len(self.paths)
+
+        frame = self._load(index)
+        if frame is None:
+            return None
+        if image is not None and image.shape == frame.shape:
+            np.copyto(image, frame)
+            return image
+        # Hand out a copy of preloaded frames so callers may draw on them
+        return frame.copy() if self._frames is not None else frame
+
+    def get(self, prop_id):
+        if prop_id == cv2.CAP_PROP_FRAME_COUNT:
+            return float(len(self.paths))
+        return super().get(prop_id)
+
+
+class SyntheticSource(FrameSource):
+    """
+    Generated frames: a static gradient with a skin-toned blob moving on a
+    Lissajous path. Deterministic for a given size, so runs are comparable.
+    """
+
+    def __init__(self, width=SYNTHETIC_FRAME_WIDTH, height=SYNTHETIC_FRAME_HEIGHT,
+                 fps=SYNTHETIC_FPS, realtime=FRAME_SOURCE_REALTIME, num_frames=None):
+        super().__init__(width, height, fps, realtime)
+        self.num_frames = num_frames
+
+        ramp_x = np.linspace(40, 120, width, dtype=np.float32)
+        ramp_y = np.linspace(30, 90, height, dtype=np.float32)[:, np.newaxis]
+        background = np.empty((height, width, 3), dtype=np.uint8)
+        background[..., 0] = ramp_x + ramp_y
+        background[..., 1] = ramp_y + 40
+        background[..., 2] = ramp_x
+        self._background = background
+        self._radius = max(4, min(width, height) // 8)
+
+    def _next_frame(self, image):
+        if self.num_frames is not None and self.frames_read >= self.num_frames:
+            return None
+        if image is None or image.shape != self._background.shape:
+            image = np.empty_like(self._background)
+        np.copyto(image, self._background)
+
+        t = self.frames_read / self.fps
+        cx = int(self.width * (0.5 + 0.35 * np.sin(1.3 * t)))
+        cy = int(self.height * (0.5 + 0.3 * np.sin(2.1 * t + 0.5)))
+        cv2.circle(image, (cx, cy), self._radius, (120, 160, 210), -1)
+        return image
+
+    def get(self, prop_id):
+        if prop_id == cv2.CAP_PROP_FRAME_COUNT:
+            return float(self.num_frames or 0)
+        return super().get(prop_id)
+
+
+def create_frame_source(kind=FRAME_SOURCE, path=FRAME_SOURCE_PATH, realtime=FRAME_SOURCE_REALTIME,
+                        loop=FRAME_SOURCE_LOOP, width=640, height=480):
+    """
+    Open a frame source by kind: "webcam", "video", "images" or "synthetic".
+
+    For "webcam", path is the device id (default 0); the camera paces itself.
+
+    Returns:
+        Opened source, or None if it could not be opened
+    """
+    if kind == "webcam":
+        return setup_webcam(device_id=path or 0, width=width, height=height)
+
+    if kind == "video":
+        source = VideoFileSource(path, realtime=realtime, loop=loop)
+    elif kind == "images":
+        source = ImageDirectorySource(path, realtime=realtime, loop=loop)
+    elif kind == "synthetic":
+        source = SyntheticSource(width, height, realtime=realtime)
+    else:
+        raise ValueError(f"Unknown frame source: {kind}")
+
+    if not source.isOpened():
+        print(f"Error: Could not open {kind} source {path}")
+        return None
+
+    pacing = "realtime" if realtime else "unpaced"
+    print(f"Frame source: {kind} {source.width}x{source.height} @ {source.fps:g}fps ({pacing})")
+    return source
@@ -0,0 +1,128 @@
+"""
+Motion Tetris - Fixed-Timestep Simulation Clock Module
+=====================================================
+Decouples game logic from the camera/render loop:
+- FixedTimestep accumulates wall-clock time and releases it as logic ticks
+  of constant length, however fast or slow frames arrive
+- Gesture and keyboard input are queued as timestamped events and applied
+  by the first tick at or after their timestamp
+- The leftover fraction of a tick (alpha) lets rendering interpolate
+  between the last two simulated states
+
+Simulation time runs on the same clock as frame capture (time.time), so
+event timestamps and tick times can be compared directly. Tick n always
+happens at start_time + n * tick_duration, so the tick index alone is
+enough to reproduce a tick's time (see session_log).
+"""
+
+import heapq
+import itertools
+import time
+from collections import namedtuple
+
+from config import SIMULATION_TICK_RATE, SIMULATION_MAX_TICKS_PER_FRAME
+
+# A timestamped input: source is "gesture" or "key"; frame_id is the frame a
+# gesture was recognized in (None for keys)
+InputEvent = namedtuple('InputEvent', ['time', 'source', 'value', 'frame_id'], defaults=(None,))
+
+
+class FixedTimestep:
+    """
+    Accumulator-based fixed tick clock.
+
+    Each call to advance() adds the wall-clock time elapsed since the last
+    call and yields the simulation time of every whole tick that fits. If
+    more than max_ticks_per_frame are due (e.g. after a stall), the backlog
+    is dropped so the simulation cannot spiral behind real time.
+    """
+
+    def __init__(self, tick_rate=SIMULATION_TICK_RATE,
+                 max_ticks_per_frame=SIMULATION_MAX_TICKS_PER_FRAME, start_time=None):
+        self.tick_duration = 1.0 / tick_rate
+        self.max_ticks_per_frame = max_ticks_per_frame
+        self.reset(start_time)
+
+    def reset(self, start_time=None):
+        """Restart the clock at start_time (default: now)."""
+        self.start_time = time.time() if start_time is None else start_time
+        self.sim_time = self.start_time
+        self._last_wall_time = self.start_time
+        self.accumulator = 0.0
+        self.tick_index = 0                     # Index of the latest tick, dropped ones included
+        self.ticks = 0
+        self.dropped_ticks = 0
+
+    def tick_time(self, tick_index):
+        """Simulation time of a tick."""
+        return self.start_time + tick_index * self.tick_duration
+
+    def advance(self, now=None):
+        """Yield the simulation time of each tick due by wall time `now`."""
+        if now is None:
+            now = time.time()
+        self.accumulator += max(0.0, now - self._last_wall_time)
+        self._last_wall_time = now
+
+        due = int(self.accumulator / self.tick_duration)
+        if due > self.max_ticks_per_frame:
+            skipped = due - self.max_ticks_per_frame
+            self.dropped_ticks += skipped
+            self.accumulator -= skipped * self.tick_duration
+            self.tick_index += skipped
+            self.sim_time = self.tick_time(self.tick_index)
+            due = self.max_ticks_per_frame
+
+        for _ in range(due):
+            self.accumulator -= self.tick_duration
+            self.tick_index += 1
+            self.sim_time = self.tick_time(self.tick_index)
+            self.ticks += 1
+            yield self.sim_time
+
+    @property
+    def alpha(self):
+        """Fraction of the next tick already elapsed, for render interpolation."""
+        return min(1.0, self.accumulator / self.tick_duration)
+
+
+class InputQueue:
+    """
+    Timestamped input events, released in timestamp order.
+
+    Gestures are stamped with the capture time of their frame and keys with
+    the time they were read, so events do not arrive sorted.
+    """
+
+    def __init__(self):
+        self._events = []
+        self._sequence = itertools.count()      # Keeps equal timestamps in arrival order
+
+    def push(self, event_time, source, value, frame_id=None):
+        heapq.heappush(self._events, (event_time, next(self._sequence),
+                                      InputEvent(event_time, source, value, frame_id)))
+
+    def pop_until(self, sim_time):
+        """Remove and yield events stamped at or before sim_time."""
+        events = self._events
+        while events and events[0][0] <= sim_time:
+            yield heapq.heappop(events)[2]
+
+    def clear(self):
+        self._events.clear()
+
+    def __len__(self):
+        return len(self._events)
+
+
+def interpolate_position(previous, current, alpha):
+    """
+    Blend two (x, y) cell positions of the same piece for rendering.
+
+    Returns (x, y) as floats. Jumps of more than one cell (spawns, hard
+    drops) are not blended.
+    """
+    (prev_x, prev_y), (cur_x, cur_y) = previous, current
+    if abs(cur_x - prev_x) > 1 or abs(cur_y - prev_y) > 1:
+        return float(cur_x), float(cur_y)
+    return prev_x + (cur_x - prev_x) * alpha, prev_y + (cur_y - prev_y) * alpha
@@ -0,0 +1,270 @@
+"""
+Motion Tetris - Game State Module
+================================
+All mutable state of one game in a single slotted object:
+- A compact uint8 board with its column surface
+- The falling piece, score, timers and hard drop / overlay flags
+- The per-tick rules: keyboard and gesture input, gravity, locking
+- snapshot()/restore() for rewinding or searching over moves
+
+The rules only read the simulation time they are given, so the live game
+loop and an offline replay of the same inputs produce the same boards.
+
+Snapshots share the board with the live state (copy-on-write): taking or
+restoring one copies only the scalar fields, and the board is duplicated
+the first time a piece is locked afterwards. Shared boards are made
+read-only, so a write that skips the copy fails loudly instead of
+corrupting a snapshot.
+"""
+
+from collections import namedtuple
+
+from config import (
+    BOARD_WIDTH, DEFAULT_MOVE_DELAY, HARD_DROP_DELAY, ROTATION_DELAY, GESTURE_COOLDOWN
+)
+from tetris_logic import (
+    create_tetris_board,
+    create_column_surface,
+    is_valid_position,
+    add_piece_to_board,
+    clear_touched_rows,
+    calculate_score,
+    perform_instant_hard_drop
+)
+
+# Immutable copy of a GameState; board and column_surface are shared read-only arrays
+GameSnapshot = namedtuple('GameSnapshot', [
+    'board', 'column_surface', 'score', 'lines_cleared_total', 'game_over',
+    'shape_index', 'current_shape_key', 'current_rotation', 'pos_x', 'pos_y',
+    'last_move_time', 'last_gesture_time', 'last_rotation_time', 'hard_drop_active'
+])
+
+
+class GameState:
+    """
+    Mutable state of one game.
+
+    The board and column surface may only be modified through lock_piece()
+    (or after calling own_board()), which takes care of copy-on-write.
+    overlay_mode is a display preference and survives reset(), as do the
+    timing settings given to the constructor. The previous_* fields hold
+    the piece placement at the start of the current tick (remember_piece),
+    for interpolating the piece between ticks when rendering.
+    """
+
+    __slots__ = (
+        'board', 'column_surface', 'score', 'lines_cleared_total', 'game_over',
+        'shape_keys', 'shape_index', 'current_shape_key', 'current_rotation', 'pos_x', 'pos_y',
+        'last_move_time', 'last_gesture_time', 'last_rotation_time', 'hard_drop_active',
+        'overlay_mode', '_board_shared',
+        'previous_shape_key', 'previous_rotation', 'previous_pos_x', 'previous_pos_y',
+        'move_delay', 'hard_drop_delay', 'rotation_delay', 'gesture_cooldown'
+    )
+
+    def __init__(self, shape_keys, current_time, move_delay=DEFAULT_MOVE_DELAY, hard_drop_delay=HARD_DROP_DELAY,
+                 rotation_delay=ROTATION_DELAY, gesture_cooldown=GESTURE_COOLDOWN):
+        self.shape_keys = list(shape_keys)
+        self.overlay_mode = False
+        self.move_delay = move_delay
+        self.hard_drop_delay = hard_drop_delay
+        self.rotation_delay = rotation_delay
+        self.gesture_cooldown = gesture_cooldown
+        self.reset(current_time)
+
+    def reset(self, current_time):
+        """Start a new game: empty board, first piece at the spawn position."""
+        self.board = create_tetris_board()
+        self.column_surface = create_column_surface(self.board)
+        self._board_shared = False
+        self.score = 0
+        self.lines_cleared_total = 0
+        self.game_over = False
+        self.shape_index = 0
+        self.current_shape_key = self.shape_keys[0]
+        self.current_rotation = 0
+        self.pos_x = BOARD_WIDTH // 2 - 2
+        self.pos_y = 0
+        self.last_move_time = current_time
+        self.last_gesture_time = current_time
+        self.last_rotation_time = current_time
+        self.hard_drop_active = False
+        self.remember_piece()
+
+    def remember_piece(self):
+        """Record the current piece placement as the previous one (call at the start of a tick)."""
+        self.previous_shape_key = self.current_shape_key
+        self.previous_rotation = self.current_rotation
+        self.previous_pos_x = self.pos_x
+        self.previous_pos_y = self.pos_y
+
+    # -------------------------------------------------------------------------
+    # Snapshots
+    # -------------------------------------------------------------------------
+
+    def snapshot(self):
+        """Capture the state without copying the board."""
+        self._share_board()
+        return GameSnapshot(
+            self.board, self.column_surface, self.score, self.lines_cleared_total, self.game_over,
+            self.shape_index, self.current_shape_key, self.current_rotation, self.pos_x, self.pos_y,
+            self.last_move_time, self.last_gesture_time, self.last_rotation_time, self.hard_drop_active
+        )
+
+    def restore(self, snapshot):
+        """Return to a snapshot; its board stays shared until the next lock."""
+        (self.board, self.column_surface, self.score, self.lines_cleared_total, self.game_over,
+         self.shape_index, self.current_shape_key, self.current_rotation, self.pos_x, self.pos_y,
+         self.last_move_time, self.last_gesture_time, self.last_rotation_time,
+         self.hard_drop_active) = snapshot
+        self._board_shared = True
+        self.remember_piece()
+
+    def _share_board(self):
+        if not self._board_shared:
+            self.board.flags.writeable = False
+            self.column_surface.flags.writeable = False
+            self._board_shared = True
+
+    def own_board(self):
+        """Make the board and column surface private (copying them if shared) before writing."""
+        if self._board_shared:
+            self.board = self.board.copy()
+            self.column_surface = self.column_surface.copy()
+            self._board_shared = False
+        return self.board
+
+    # -------------------------------------------------------------------------
+    # Piece handling
+    # -------------------------------------------------------------------------
+
+    def lock_piece(self, tetris_shapes_data):
+        """
+        Lock the falling piece into the board, clear full rows and score them.
+
+        Returns:
+            tuple: (touched_rows, cleared_rows) as returned by
+            add_piece_to_board and clear_touched_rows
+        """
+        board = self.own_board()
+        touched_rows = add_piece_to_board(board, tetris_shapes_data[self.current_shape_key], self.current_rotation,
+                                          self.pos_x, self.pos_y, self.column_surface)
+        cleared_rows = clear_touched_rows(board, touched_rows, self.column_surface)
+        if cleared_rows:
+            self.lines_cleared_total += len(cleared_rows)
+            self.score += calculate_score(len(cleared_rows))
+        return touched_rows, cleared_rows
+
+    def spawn_next_piece(self, tetris_shapes_data):
+        """Bring in the next piece of the sequence; sets game_over if it does not fit."""
+        self.shape_index = (self.shape_index + 1) % len(self.shape_keys)
+        self.current_shape_key = self.shape_keys[self.shape_index]
+        self.current_rotation = 0
+        self.pos_x = BOARD_WIDTH // 2 - 2
+        self.pos_y = 0
+        self.hard_drop_active = False  # Reset hard drop state for new piece
+        if not is_valid_position(self.board, tetris_shapes_data[self.current_shape_key],
+                                 self.current_rotation, self.pos_x, self.pos_y):
+            self.game_over = True
+        return not self.game_over
+
+    # -------------------------------------------------------------------------
+    # Per-tick rules
+    # -------------------------------------------------------------------------
+
+    def apply_key(self, key, current_time, tetris_shapes_data):
+        """Apply a keyboard command (a/d/w/s/space/n/o)."""
+        board = self.board
+        shape_details = tetris_shapes_data[self.current_shape_key]
+        pos_x, pos_y, current_rotation = self.pos_x, self.pos_y, self.current_rotation
+
+        if key == ord('a'):  # Move left
+            if is_valid_position(board, shape_details, current_rotation, pos_x - 1, pos_y):
+                self.pos_x = pos_x - 1
+        elif key == ord('d'):  # Move right
+            if is_valid_position(board, shape_details, current_rotation, pos_x + 1, pos_y):
+                self.pos_x = pos_x + 1
+        elif key == ord('w'):  # Rotate
+            # Keyboard rotation repeats with the key; only gesture rotation waits for rotation_delay
+            next_rotation = (current_rotation + 1) % len(shape_details['piece'].rotations)
+            if is_valid_position(board, shape_details, next_rotation, pos_x, pos_y):
+                self.current_rotation = next_rotation
+                self.last_rotation_time = current_time
+        elif key == ord('s'):  # Soft drop
+            if is_valid_position(board, shape_details, current_rotation, pos_x, pos_y + 1):
+                self.pos_y = pos_y + 1
+                self.last_move_time = current_time
+        elif key == ord(' '):  # Hard drop (instant)
+            drop_y = perform_instant_hard_drop(board, tetris_shapes_data, self.current_shape_key, current_rotation,
+                                               pos_x, pos_y, self.column_surface)
+            if drop_y != pos_y:
+                self.pos_y = drop_y
+                self.last_move_time = current_time - self.move_delay  # Force immediate landing check
+        elif key == ord('n'):  # Change shape
+            new_shape_index = (self.shape_index + 1) % len(self.shape_keys)
+            potential_new_shape_key = self.shape_keys[new_shape_index]
+            if is_valid_position(board, tetris_shapes_data[potential_new_shape_key], 0, pos_x, pos_y):
+                self.shape_index = new_shape_index
+                self.current_shape_key = potential_new_shape_key
+                self.current_rotation = 0
+        elif key == ord('o'):
+            self.overlay_mode = not self.overlay_mode
+
+    def apply_gesture(self, gesture, current_time, tetris_shapes_data):
+        """
+        Apply a recognized gesture, subject to the gesture cooldown.
+
+        Returns:
+            bool: True if the piece moved or rotated
+        """
+        if current_time - self.last_gesture_time <= self.gesture_cooldown:
+            return False
+
+        shape_details = tetris_shapes_data[self.current_shape_key]
+        if gesture == "left" or gesture == "right":
+            self.hard_drop_active = False  # Deactivate hard drop on other gestures
+            next_pos_x = self.pos_x - 1 if gesture == "left" else self.pos_x + 1
+            if is_valid_position(self.board, shape_details, self.current_rotation, next_pos_x, self.pos_y):
+                self.pos_x = next_pos_x
+                self.last_gesture_time = current_time
+                return True
+        elif gesture == "rotate":
+            # Apply rotation delay for gesture too
+            if current_time - self.last_rotation_time > self.rotation_delay:
+                self.hard_drop_active = False  # Deactivate hard drop on other gestures
+                next_rotation = (self.current_rotation + 1) % len(shape_details['piece'].rotations)
+                if is_valid_position(self.board, shape_details, next_rotation, self.pos_x, self.pos_y):
+                    self.current_rotation = next_rotation
+                    self.last_gesture_time = current_time
+                    self.last_rotation_time = current_time
+                    return True
+        elif gesture == "hardDrop":
+            self.hard_drop_active = True  # Activate controlled hard drop
+            self.last_gesture_time = current_time
+        elif gesture == "none":
+            self.hard_drop_active = False  # Deactivate hard drop when no gesture
+        return False
+
+    def apply_gravity(self, current_time, tetris_shapes_data):
+        """
+        Move the piece down one row if its fall delay has passed, locking
+        it and spawning the next piece when it cannot fall further. The
+        landing row comes from the column surface, so gravity (and gesture
+        hard drop) skips the per-row collision scan.
+
+        Returns:
+            tuple or None: (touched_rows, cleared_rows) if a piece locked
+        """
+        fall_delay = self.hard_drop_delay if self.hard_drop_active else self.move_delay
+        if current_time - self.last_move_time <= fall_delay:
+            return None
+
+        locked = None
+        landing_y = perform_instant_hard_drop(self.board, tetris_shapes_data, self.current_shape_key,
+                                              self.current_rotation, self.pos_x, self.pos_y, self.column_surface)
+        if landing_y > self.pos_y:
+            self.pos_y += 1
+        else:  # Piece lands
+            locked = self.lock_piece(tetris_shapes_data)
+            self.spawn_next_piece(tetris_shapes_data)
+        self.last_move_time = current_time
+        return locked
@@ -13,21 +13,31 @@ Each gesture is carefully designed to avoid interference and includes cooldown p
 
 import cv2
 import mediapipe as mp
+import numpy as np
 from config import (
     FIST_THRESHOLD, PINCH_THRESHOLD, HAND_WIDTH_MIN,
     PINCH_DISTANCE_THRESHOLD, RAISED_HAND_HEIGHT
 )
+from hud import hud_layer
 
 # Initialize MediaPipe hands detector
 mp_hands = mp.solutions.hands
-hands_detector = mp_hands.Hands(
-    static_image_mode=False,
-    max_num_hands=2, 
-    min_detection_confidence=0.5,
-    min_tracking_confidence=0.3
-)
+
+MAX_NUM_HANDS = 2
+
+def create_hands_detector():
+    """Create a MediaPipe hands detector with the game's settings."""
+    return mp_hands.Hands(
+        static_image_mode=False,
+        max_num_hands=MAX_NUM_HANDS, 
+        min_detection_confidence=0.5,
+        min_tracking_confidence=0.3
+    )
+
+hands_detector = create_hands_detector()
 
 # MediaPipe hand landmark indices
+NUM_LANDMARKS = 21
 WRIST = 0
 THUMB_TIP = 4
 THUMB_IP = 3
@@ -44,98 +54,212 @@ PINKY_TIP = 20
 PINKY_PIP = 18
 PINKY_MCP = 17
 
+# Gesture codes used by the vectorized classifier
+GESTURE_NAMES = ("none", "hardDrop", "rotate", "left", "right")
+GESTURE_NONE = 0
+GESTURE_HARD_DROP = 1
+GESTURE_ROTATE = 2
+GESTURE_LEFT = 3
+GESTURE_RIGHT = 4
+
+# All predicates below take landmark arrays of shape (..., 21, 3) holding
+# normalized (x, y, z) per landmark, and evaluate every hand at once.
+
 def detect_pinch_gesture(landmarks):
     """Detect pinch gesture (thumb and index together) for rotation."""
-    if not landmarks:
-        return False
-
-    # Get landmarks
-    thumb_tip = landmarks.landmark[THUMB_TIP]
-    index_tip = landmarks.landmark[INDEX_TIP]
-    middle_tip = landmarks.landmark[MIDDLE_TIP] 
-    ring_tip = landmarks.landmark[RING_TIP]
-    pinky_tip = landmarks.landmark[PINKY_TIP]
-    wrist = landmarks.landmark[WRIST]
-    middle_pip = landmarks.landmark[MIDDLE_PIP]
-    ring_pip = landmarks.landmark[RING_PIP]
-    pinky_pip = landmarks.landmark[PINKY_PIP]
+    y = landmarks[..., 1]
+    thumb_tip = landmarks[..., THUMB_TIP, :2]
+    index_tip = landmarks[..., INDEX_TIP, :2]
 
     # Validate pinch gesture
-    pinch_distance = ((thumb_tip.x - index_tip.x) ** 2 + 
-                     (thumb_tip.y - index_tip.y) ** 2) ** 0.5
-    
-    # Quick fail conditions
-    if (pinch_distance > PINCH_DISTANCE_THRESHOLD or  # Thumb and index too far
-        abs(thumb_tip.y - index_tip.y) > 0.15 or     # Height mismatch
-        middle_tip.y > middle_pip.y or               # Other fingers not extended
-        ring_tip.y > ring_pip.y or
-        pinky_tip.y > pinky_pip.y or
-        thumb_tip.y > wrist.y or                     # Hand not raised
-        index_tip.y > wrist.y):
-        return False
-
-    return True
-
-def detect_fist_gesture(landmarks): 
+    pinch_distance = np.sqrt(((thumb_tip - index_tip) ** 2).sum(axis=-1))
+
+    # Fail conditions
+    return ~(
+        (pinch_distance > PINCH_DISTANCE_THRESHOLD) |                  # Thumb and index too far
+        (np.abs(y[..., THUMB_TIP] - y[..., INDEX_TIP]) > 0.15) |      # Height mismatch
+        (y[..., MIDDLE_TIP] > y[..., MIDDLE_PIP]) |                   # Other fingers not extended
+        (y[..., RING_TIP] > y[..., RING_PIP]) |
+        (y[..., PINKY_TIP] > y[..., PINKY_PIP]) |
+        (y[..., THUMB_TIP] > y[..., WRIST]) |                         # Hand not raised
+        (y[..., INDEX_TIP] > y[..., WRIST])
+    )
+
+def detect_fist_gesture(landmarks):
     """Detect fist gesture (all fingers curled) for hard drop."""
-    if not landmarks:
-        return False
-
-    # Get landmarks
-    thumb_tip = landmarks.landmark[THUMB_TIP]
-    index_tip = landmarks.landmark[INDEX_TIP]
-    middle_tip = landmarks.landmark[MIDDLE_TIP]
-    ring_tip = landmarks.landmark[RING_TIP]
-    pinky_tip = landmarks.landmark[PINKY_TIP]
-    
-    index_mcp = landmarks.landmark[INDEX_MCP]
-    middle_mcp = landmarks.landmark[MIDDLE_MCP] 
-    ring_mcp = landmarks.landmark[RING_MCP]
-    pinky_mcp = landmarks.landmark[PINKY_MCP]
-    thumb_ip = landmarks.landmark[THUMB_IP]
+    y = landmarks[..., 1]
 
     # Check all fingers are curled
     return (
-        index_tip.y > index_mcp.y and      # Main fingers below MCP joints
-        middle_tip.y > middle_mcp.y and
-        ring_tip.y > ring_mcp.y and
-        pinky_tip.y > pinky_mcp.y and
-        thumb_tip.y > thumb_ip.y           # Thumb curled
+        (y[..., INDEX_TIP] > y[..., INDEX_MCP]) &       # Main fingers below MCP joints
+        (y[..., MIDDLE_TIP] > y[..., MIDDLE_MCP]) &
+        (y[..., RING_TIP] > y[..., RING_MCP]) &
+        (y[..., PINKY_TIP] > y[..., PINKY_MCP]) &
+        (y[..., THUMB_TIP] > y[..., THUMB_IP])          # Thumb curled
     )
 
-def detect_raised_hand(landmarks, hand_label):
-    """Detect raised hand gesture (left/right) for movement."""
-    if not landmarks:
-        return "none"
+def detect_raised_hand(landmarks, is_right):
+    """
+    Detect raised hand gesture (left/right) for movement.
 
-    # Get landmarks
-    wrist = landmarks.landmark[WRIST]
-    index_tip = landmarks.landmark[INDEX_TIP]
-    middle_tip = landmarks.landmark[MIDDLE_TIP]
-    ring_tip = landmarks.landmark[RING_TIP]
-    pinky_tip = landmarks.landmark[PINKY_TIP]
+    Returns:
+        Gesture codes: GESTURE_RIGHT/GESTURE_LEFT by handedness, else GESTURE_NONE
+    """
+    y = landmarks[..., 1]
 
     # Average finger height relative to wrist
     avg_fingers_height = (
-        index_tip.y + middle_tip.y + 
-        ring_tip.y + pinky_tip.y
+        y[..., INDEX_TIP] + y[..., MIDDLE_TIP] +
+        y[..., RING_TIP] + y[..., PINKY_TIP]
     ) / 4
+
+    raised = avg_fingers_height < (y[..., WRIST] - RAISED_HAND_HEIGHT)
+    direction = np.where(is_right, GESTURE_RIGHT, GESTURE_LEFT)
+    return np.where(raised, direction, GESTURE_NONE)
+
+def classify_landmark_batch(landmarks, is_right, hand_valid, label_valid=None):
+    """
+    Classify many frames of hands in one vectorized pass.
+    Priority per frame: hard drop > pinch > movement, earlier hands first.
+
+    Args:
+        landmarks: (frames, hands, 21, 3) landmark array
+        is_right: (frames, hands) bool, handedness label is "Right"
+        hand_valid: (frames, hands) bool, hand present in that frame
+        label_valid: (frames, hands) bool, handedness known (defaults to hand_valid)
+
+    Returns:
+        int array (frames,) of gesture codes (index into GESTURE_NAMES)
+    """
+    landmarks = np.asarray(landmarks, dtype=np.float64)
+    if label_valid is None:
+        label_valid = hand_valid
+
+    fist = (detect_fist_gesture(landmarks) & hand_valid).any(axis=-1)
+    pinch = (detect_pinch_gesture(landmarks) & hand_valid).any(axis=-1)
+
+    # First hand (in detection order) with a movement wins
+    movement = np.where(label_valid, detect_raised_hand(landmarks, is_right), GESTURE_NONE)
+    moving = movement != GESTURE_NONE
+    first_move = np.take_along_axis(movement, moving.argmax(axis=-1)[..., np.newaxis], axis=-1)[..., 0]
+
+    return np.select([fist, pinch], [GESTURE_HARD_DROP, GESTURE_ROTATE], first_move)
+
+def classify_landmarks(landmarks, labels):
+    """
+    Map one frame of hand landmarks to a Tetris control.
+    Priority: hard drop > pinch > movement
+
+    Args:
+        landmarks: (hands, 21, 3) array as returned by extract_landmarks
+        labels: handedness labels, possibly fewer than hands
+
+    Returns:
+        str: gesture name ("hardDrop", "rotate", "left", "right" or "none")
+    """
+    num_hands = len(landmarks)
+    if num_hands == 0:
+        return "none"
+
+    is_right = np.array([labels[i] == "Right" if i < len(labels) else False
+                         for i in range(num_hands)])
+    hand_valid = np.ones(num_hands, dtype=bool)
+    label_valid = np.arange(num_hands) < len(labels)
+    code = classify_landmark_batch(landmarks[np.newaxis], is_right[np.newaxis],
+                                   hand_valid[np.newaxis], label_valid[np.newaxis])[0]
+    return GESTURE_NAMES[code]
+
+def classify_hand_results(results):
+    """
+    Map MediaPipe hand results to a Tetris control.
+    Each hand's landmarks are converted to an array once.
+
+    Returns:
+        str: gesture name ("hardDrop", "rotate", "left", "right" or "none")
+    """
+    return classify_landmarks(*extract_landmarks(results))
+
+def extract_landmarks(results):
+    """
+    Pack MediaPipe hand results into plain arrays.
     
-    if avg_fingers_height < (wrist.y - RAISED_HAND_HEIGHT):
-        return "right" if hand_label == "Right" else "left"
-    return "none"
+    Returns:
+        tuple: (landmarks float32 array of shape (hands, 21, 3), handedness labels)
+    """
+    if not results.multi_hand_landmarks:
+        return np.zeros((0, NUM_LANDMARKS, 3), dtype=np.float32), ()
+
+    landmarks = np.array(
+        [[(lm.x, lm.y, lm.z) for lm in hand.landmark]
+         for hand in results.multi_hand_landmarks],
+        dtype=np.float32
+    )
+    labels = tuple(
+        handedness.classification[0].label
+        for handedness in (results.multi_handedness or [])
+    )
+    return landmarks, labels
+
+def draw_hand_landmarks(frame, landmarks):
+    """Draw hand skeletons from a (hands, 21, 3) normalized landmark array."""
+    height, width = frame.shape[:2]
+    for hand in landmarks:
+        points = [(int(x * width), int(y * height)) for x, y, _ in hand]
+        for start, end in mp_hands.HAND_CONNECTIONS:
+            cv2.line(frame, points[start], points[end], (224, 224, 224), 2)
+        for point in points:
+            cv2.circle(frame, point, 2, (0, 0, 255), 2)
+
+def to_rgb(frame, rgb=None):
+    """
+    Convert a BGR frame to RGB for MediaPipe, into a reusable buffer.
+
+    The buffer is reallocated only when the frame size changes and is
+    handed out read-only, which lets MediaPipe take it by reference
+    instead of copying it.
 
-def detect_hand_gesture(frame):
+    Returns:
+        ndarray: The (possibly new) read-only RGB buffer
+    """
+    if rgb is None or rgb.shape != frame.shape:
+        rgb = np.empty_like(frame)
+    rgb.flags.writeable = True
+    cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=rgb)
+    rgb.flags.writeable = False
+    return rgb
+
+_rgb_buffer = None
+
+def detect_hand_gesture(frame, tracker=None, out=None):
     """
     Detect hand gestures and map to Tetris controls.
     Priority: hard drop > pinch > movement
+
+    With a tracker from hand_tracking.create_hand_tracker, inference runs on the tracker's
+    downscaled or ROI input instead of the full frame.
+
+    Annotations are drawn on frame itself, or on out (a reusable buffer of
+    the same shape) after inference has seen the clean frame.
     
     Returns:
         tuple: (processed_frame, gesture_name)
     """
-    rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-    results = hands_detector.process(rgb_frame)
-    gesture = "none"
+    global _rgb_buffer
+
+    if tracker is not None:
+        landmarks, labels, gesture = tracker.process_gesture(frame)
+        if out is not None:
+            np.copyto(out, frame)
+            frame = out
+        draw_hand_landmarks(frame, landmarks)
+        visualize_gesture(frame, gesture)
+        return frame, gesture
+
+    _rgb_buffer = to_rgb(frame, _rgb_buffer)
+    results = hands_detector.process(_rgb_buffer)
+    if out is not None:
+        np.copyto(out, frame)
+        frame = out
 
     if results.multi_hand_landmarks:
         # Draw hand landmarks
@@ -144,28 +268,7 @@ def detect_hand_gesture(frame):
                 frame, hand_landmarks, mp_hands.HAND_CONNECTIONS
             )
 
-        # First check for hard drop (highest priority)
-        for hand_landmarks in results.multi_hand_landmarks:
-            if detect_fist_gesture(hand_landmarks):
-                gesture = "hardDrop"
-                break
-
-        # Then check for pinch if no hard drop
-        if gesture == "none":
-            for hand_landmarks in results.multi_hand_landmarks:
-                if detect_pinch_gesture(hand_landmarks):
-                    gesture = "rotate"
-                    break
-
-        # Finally check for movement if no other gesture
-        if gesture == "none":
-            for i, hand_landmarks in enumerate(results.multi_hand_landmarks):
-                if i < len(results.multi_handedness):
-                    hand_label = results.multi_handedness[i].classification[0].label
-                    movement = detect_raised_hand(hand_landmarks, hand_label)
-                    if movement != "none":
-                        gesture = movement
-                        break
+    gesture = classify_hand_results(results)
 
     # Add gesture visualization
     visualize_gesture(frame, gesture)
@@ -185,8 +288,8 @@ def visualize_gesture(frame, gesture):
         ("- Genggam: Hard Drop", 0.4, -25)
     ]
 
-    # Draw instructions at bottom of frame
+    # Draw instructions at bottom of frame (cached sprites, see hud.py)
     for text, scale, y_offset in instructions:
-        cv2.putText(frame, text,
+        hud_layer.draw_text(frame, text,
                    (10, frame.shape[0] + y_offset),
                    font, scale, white, 1)
@@ -0,0 +1,399 @@
+"""
+Motion Tetris - Hand Tracking Module
+===================================
+Reduces the number of pixels MediaPipe has to look at:
+- "full": the whole frame, as detect_hand_gesture always did
+- "downscaled": a resized copy of the whole frame
+- "roi": once hands are found, only a square crop around the previous
+  landmarks (resized to a fixed input size) is searched; when the hands
+  are lost, a downscaled full-frame search finds them again. While fewer
+  than MAX_NUM_HANDS hands are tracked, the full-frame search also runs
+  every HAND_ROI_RESEARCH_INTERVAL frames, so a second hand entering
+  outside the crop is picked up
+
+Landmarks are always returned normalized to the full frame, so gesture
+classification and drawing do not depend on the mode. Inference time is
+accumulated per mode for reporting.
+
+A MotionGate in front of the detector compares tiny grayscale thumbnails
+and, while the scene is static, reuses the last result instead of running
+MediaPipe.
+
+InferenceScheduler wraps a tracker and runs inference only every N frames,
+extrapolating landmarks in between. N adapts to the measured inference
+cost and to how often the recognized gesture changes.
+"""
+
+import time
+
+import cv2
+import numpy as np
+from config import (
+    GESTURE_TRACKING_MODE, INFERENCE_DOWNSCALE, HAND_ROI_EXPAND, HAND_ROI_SIZE, HAND_ROI_RESEARCH_INTERVAL,
+    ADAPTIVE_INFERENCE, INFERENCE_LATENCY_BUDGET, INFERENCE_MAX_INTERVAL,
+    INFERENCE_EXTRAPOLATION_MAX, MOTION_GATE_ENABLED, MOTION_GATE_SIZE,
+    MOTION_GATE_PIXEL_THRESHOLD, MOTION_GATE_MIN_CHANGED, MOTION_GATE_MAX_SKIP
+)
+from gestures import (
+    hands_detector, create_hands_detector, extract_landmarks, classify_landmarks, to_rgb, MAX_NUM_HANDS
+)
+
+TRACKING_MODES = ("full", "downscaled", "roi")
+
+
+class MotionGate:
+    """
+    Decides whether a frame differs enough from the last processed one to
+    be worth running inference on.
+
+    Frames are reduced to a small grayscale thumbnail and compared against
+    the thumbnail of the last processed frame; the frame counts as moving
+    when enough thumbnail pixels changed by more than a gray-level
+    threshold. Comparing against the last processed frame (not the
+    previous one) lets slow drift accumulate until it triggers.
+    """
+
+    def __init__(self, size=MOTION_GATE_SIZE, pixel_threshold=MOTION_GATE_PIXEL_THRESHOLD,
+                 min_changed=MOTION_GATE_MIN_CHANGED, max_skip=MOTION_GATE_MAX_SKIP):
+        self.size = size
+        self.pixel_threshold = pixel_threshold
+        self.min_changed = min_changed
+        self.max_skip = max_skip
+
+        self._small = np.empty((size[1], size[0], 3), dtype=np.uint8)
+        self._thumbnail = np.empty((size[1], size[0]), dtype=np.uint8)
+        self._difference = np.empty_like(self._thumbnail)
+        self._reference = None
+        self._skipped_in_row = 0
+
+        self.frames_processed = 0
+        self.frames_skipped = 0
+        self.last_changed = 0.0
+
+    def should_process(self, frame):
+        """Return True if the frame needs inference; False to reuse the last result."""
+        cv2.resize(frame, self.size, dst=self._small, interpolation=cv2.INTER_AREA)
+        cv2.cvtColor(self._small, cv2.COLOR_BGR2GRAY, dst=self._thumbnail)
+
+        if self._reference is not None:
+            cv2.absdiff(self._thumbnail, self._reference, dst=self._difference)
+            changed = np.count_nonzero(self._difference > self.pixel_threshold)
+            self.last_changed = changed / self._difference.size
+            if self.last_changed < self.min_changed and self._skipped_in_row < self.max_skip:
+                self._skipped_in_row += 1
+                self.frames_skipped += 1
+                return False
+            np.copyto(self._reference, self._thumbnail)
+        else:
+            self._reference = self._thumbnail.copy()
+
+        self._skipped_in_row = 0
+        self.frames_processed += 1
+        return True
+
+    def get_stats(self):
+        return {
+            'processed': self.frames_processed,
+            'skipped': self.frames_skipped
+        }
+
+
+class HandTracker:
+    """
+    Runs hand inference on a reduced input and maps landmarks back.
+
+    A separate detector instance is used for ROI crops so that MediaPipe's
+    own frame-to-frame tracking never mixes crops with full-frame images.
+    """
+
+    def __init__(self, mode=GESTURE_TRACKING_MODE, downscale=INFERENCE_DOWNSCALE,
+                 roi_expand=HAND_ROI_EXPAND, roi_size=HAND_ROI_SIZE, motion_gate=None,
+                 research_interval=HAND_ROI_RESEARCH_INTERVAL):
+        if mode not in TRACKING_MODES:
+            raise ValueError(f"Unknown tracking mode: {mode}")
+        self.mode = mode
+        self.downscale = 1.0 if mode == "full" else downscale
+        self.roi_expand = roi_expand
+        self.roi_size = roi_size
+        self.research_interval = research_interval
+
+        self._search_detector = hands_detector
+        self._roi_detector = create_hands_detector() if mode == "roi" else None
+        self._roi_box = None                    # (x0, y0, side) in frame pixels
+        self._roi_frames = 0                    # ROI frames since the last full-frame search
+        self.motion_gate = motion_gate
+        self._last_result = None
+
+        # Reused conversion buffers (RGB ones are read-only between conversions)
+        self._search_bgr = None
+        self._search_rgb = None
+        self._roi_bgr = np.empty((roi_size, roi_size, 3), dtype=np.uint8)
+        self._roi_rgb = np.empty_like(self._roi_bgr)
+
+        # Per-mode timing: name -> [frames, total seconds]
+        self.timings = {}
+        self.fallbacks = 0
+        self.last_mode = None
+
+    # -------------------------------------------------------------------------
+    # Inference paths
+    # -------------------------------------------------------------------------
+
+    def _search(self, frame):
+        """Full-frame search, optionally on a downscaled copy."""
+        if self.downscale != 1.0:
+            height, width = frame.shape[:2]
+            size = (max(1, int(width * self.downscale)), max(1, int(height * self.downscale)))
+            if self._search_bgr is None or self._search_bgr.shape[1::-1] != size:
+                self._search_bgr = np.empty((size[1], size[0], 3), dtype=np.uint8)
+            cv2.resize(frame, size, dst=self._search_bgr, interpolation=cv2.INTER_AREA)
+            frame = self._search_bgr
+
+        self._search_rgb = to_rgb(frame, self._search_rgb)
+
+        # Uniform scaling leaves normalized coordinates unchanged
+        return extract_landmarks(self._search_detector.process(self._search_rgb))
+
+    def _track(self, frame):
+        """Search only the square ROI around the previous hands."""
+        x0, y0, side = self._roi_box
+        crop = frame[y0:y0 + side, x0:x0 + side]
+        interpolation = cv2.INTER_AREA if side > self.roi_size else cv2.INTER_LINEAR
+        cv2.resize(crop, (self.roi_size, self.roi_size), dst=self._roi_bgr,
+                   interpolation=interpolation)
+        self._roi_rgb = to_rgb(self._roi_bgr, self._roi_rgb)
+        landmarks, labels = extract_landmarks(self._roi_detector.process(self._roi_rgb))
+        if len(landmarks) == 0:
+            return landmarks, labels
+
+        # Map crop-normalized coordinates back to the full frame
+        height, width = frame.shape[:2]
+        scale = np.array([side / width, side / height, side / width])
+        offset = np.array([x0 / width, y0 / height, 0.0])
+        return (landmarks * scale + offset).astype(np.float32), labels
+
+    def _update_roi(self, landmarks, frame_shape):
+        """Square box around all hands, expanded and kept inside the frame."""
+        height, width = frame_shape[:2]
+        xs = landmarks[..., 0] * width
+        ys = landmarks[..., 1] * height
+        side = max(xs.max() - xs.min(), ys.max() - ys.min()) * self.roi_expand
+        side = int(min(max(side, self.roi_size // 2), width, height))
+        center_x = (xs.max() + xs.min()) / 2
+        center_y = (ys.max() + ys.min()) / 2
+        x0 = int(np.clip(center_x - side / 2, 0, width - side))
+        y0 = int(np.clip(center_y - side / 2, 0, height - side))
+        self._roi_box = (x0, y0, side)
+
+    def process(self, frame):
+        """
+        Detect hands in a BGR frame.
+
+        Returns:
+            tuple: (landmarks float32 (hands, 21, 3) normalized to the full
+                    frame, handedness labels)
+        """
+        start_time = time.perf_counter()
+
+        if (self.motion_gate is not None and self._last_result is not None and
+                not self.motion_gate.should_process(frame)):
+            self._record("motion skip", start_time)
+            return self._last_result
+
+        if (self._roi_box is not None and self._roi_frames >= self.research_interval and
+                len(self._last_result[0]) < MAX_NUM_HANDS):
+            # Look for hands outside the crop; keep the search if it sees no fewer hands
+            self._roi_frames = 0
+            landmarks, labels = self._search(frame)
+            if len(landmarks) >= len(self._last_result[0]):
+                self._update_roi(landmarks, frame.shape)
+                self._record("roi + search", start_time)
+                self._last_result = (landmarks, labels)
+                return landmarks, labels
+
+        if self._roi_box is not None:
+            self._roi_frames += 1
+            landmarks, labels = self._track(frame)
+            if len(landmarks):
+                self._update_roi(landmarks, frame.shape)
+                self._record("roi", start_time)
+                self._last_result = (landmarks, labels)
+                return landmarks, labels
+            # Tracking lost: search the whole frame again
+            self._roi_box = None
+            self.fallbacks += 1
+            mode_name = "roi lost + search"
+        else:
+            mode_name = "full" if self.downscale == 1.0 else "downscaled"
+
+        landmarks, labels = self._search(frame)
+        if self.mode == "roi" and len(landmarks):
+            self._update_roi(landmarks, frame.shape)
+            self._roi_frames = 0
+        self._record(mode_name, start_time)
+        self._last_result = (landmarks, labels)
+        return landmarks, labels
+
+    def process_gesture(self, frame):
+        """
+        Detect hands and classify the gesture.
+
+        Returns:
+            tuple: (landmarks, labels, gesture_name)
+        """
+        landmarks, labels = self.process(frame)
+        return landmarks, labels, classify_landmarks(landmarks, labels)
+
+    def _record(self, mode_name, start_time):
+        entry = self.timings.setdefault(mode_name, [0, 0.0])
+        entry[0] += 1
+        entry[1] += time.perf_counter() - start_time
+        self.last_mode = mode_name
+
+
+class InferenceScheduler:
+    """
+    Runs tracker inference on a subset of frames and extrapolates between.
+
+    The interval N between inferences is bounded above by
+    INFERENCE_MAX_INTERVAL. When the gesture changes, the next frame is
+    inferred right away and N is halved, even below the floor set by the
+    latency budget (average inference time per frame may not exceed
+    INFERENCE_LATENCY_BUDGET). After every inference that sees the same
+    gesture, N doubles back towards that floor, or grows by one once it
+    is there, so the budget is only exceeded briefly after a change.
+
+    Gestures are classified from real inference results only; on
+    extrapolated frames process_gesture() holds the last gesture, so
+    extrapolated landmarks (used for drawing) cannot invent gestures.
+
+    Exposes the same process()/process_gesture()/timings/last_mode/
+    motion_gate interface as HandTracker.
+    """
+
+    def __init__(self, tracker, latency_budget=INFERENCE_LATENCY_BUDGET,
+                 max_interval=INFERENCE_MAX_INTERVAL,
+                 max_extrapolation=INFERENCE_EXTRAPOLATION_MAX):
+        self.tracker = tracker
+        self.latency_budget = latency_budget
+        self.max_interval = max_interval
+        self.max_extrapolation = max_extrapolation
+
+        self.interval = 1
+        self.cost_estimate = None               # EMA of inference time (seconds)
+        self._frames_since_inference = 0
+        self._last_gesture = None
+        self._infer_next = False                # Gesture just changed: confirm on the next frame
+
+        # Last two inference results for extrapolation: (time, landmarks, labels)
+        self._previous = None
+        self._latest = None
+
+        self.timings = tracker.timings
+        self.motion_gate = tracker.motion_gate
+        self.last_mode = None
+        self.frames = 0
+        self.inferences = 0
+
+    def _min_interval(self):
+        """Smallest interval that keeps average inference cost within budget."""
+        if self.cost_estimate is None or self.latency_budget <= 0:
+            return 1
+        return min(self.max_interval, max(1, int(np.ceil(self.cost_estimate / self.latency_budget))))
+
+    def _infer(self, frame, timestamp):
+        start_time = time.perf_counter()
+        landmarks, labels = self.tracker.process(frame)
+        cost = time.perf_counter() - start_time
+        self.cost_estimate = cost if self.cost_estimate is None else 0.8 * self.cost_estimate + 0.2 * cost
+
+        # Adapt the interval to how often the gesture changes
+        gesture = classify_landmarks(landmarks, labels)
+        if self._last_gesture is not None and gesture != self._last_gesture:
+            self.interval = max(1, self.interval // 2)
+            self._infer_next = True
+        else:
+            min_interval = self._min_interval()
+            if self.interval < min_interval:
+                self.interval = min(self.interval * 2, min_interval)
+            else:
+                self.interval += 1
+            self._infer_next = False
+        self.interval = min(self.interval, self.max_interval)
+        self._last_gesture = gesture
+
+        self._previous, self._latest = self._latest, (timestamp, landmarks, labels)
+        self._frames_since_inference = 0
+        self.inferences += 1
+        self.last_mode = self.tracker.last_mode
+        return landmarks, labels
+
+    def _extrapolate(self, timestamp):
+        """Linear extrapolation from the last two results, when they match up."""
+        start_time = time.perf_counter()
+        latest_time, landmarks, labels = self._latest
+        elapsed = timestamp - latest_time
+
+        if (self._previous is not None and len(landmarks) and
+                elapsed <= self.max_extrapolation):
+            previous_time, previous_landmarks, previous_labels = self._previous
+            span = latest_time - previous_time
+            if span > 0 and previous_labels == labels and previous_landmarks.shape == landmarks.shape:
+                velocity = (landmarks - previous_landmarks) / span
+                landmarks = (landmarks + velocity * elapsed).astype(np.float32)
+
+        entry = self.timings.setdefault("extrapolated", [0, 0.0])
+        entry[0] += 1
+        entry[1] += time.perf_counter() - start_time
+        self.last_mode = "extrapolated"
+        return landmarks, labels
+
+    def process(self, frame, timestamp=None):
+        """
+        Detect or extrapolate hands for this frame.
+
+        Returns:
+            tuple: (landmarks, labels) as from HandTracker.process
+        """
+        if timestamp is None:
+            timestamp = time.perf_counter()
+        self.frames += 1
+        self._frames_since_inference += 1
+
+        if (self._latest is None or self._infer_next or
+                self._frames_since_inference >= self.interval):
+            return self._infer(frame, timestamp)
+        return self._extrapolate(timestamp)
+
+    def process_gesture(self, frame, timestamp=None):
+        """
+        Detect or extrapolate hands and report the gesture of the latest
+        real inference.
+
+        Returns:
+            tuple: (landmarks, labels, gesture_name)
+        """
+        landmarks, labels = self.process(frame, timestamp)
+        return landmarks, labels, self._last_gesture
+
+    def get_stats(self):
+        return {
+            'frames': self.frames,
+            'inferences': self.inferences,
+            'interval': self.interval,
+            'cost_ms': (self.cost_estimate or 0.0) * 1000
+        }
+
+
+def create_hand_tracker(mode=GESTURE_TRACKING_MODE, adaptive=ADAPTIVE_INFERENCE,
+                        motion_gated=MOTION_GATE_ENABLED):
+    """HandTracker for the given mode, optionally motion-gated and wrapped in an InferenceScheduler."""
+    tracker = HandTracker(mode, motion_gate=MotionGate() if motion_gated else None)
+    return InferenceScheduler(tracker) if adaptive else tracker
+
+
+def format_inference_timings(timings):
+    """One-line summary of {mode: [frames, total seconds]} timings."""
+    parts = [f"{mode} {frames} frames @ {total / frames * 1000:.2f} ms"
+             for mode, (frames, total) in timings.items() if frames]
+    return ", ".join(parts) if parts else "no frames"
@@ -0,0 +1,161 @@
+"""
+Motion Tetris - HUD Text Module
+==============================
+Text for the on-screen HUD, rasterized once and reused:
+- TextSprite: a string drawn with cv2.putText into a small BGR image plus
+  an alpha mask, blitted onto frames as array slices
+- TextSpriteCache: sprites keyed by string, font, scale, color, thickness
+  and line type, with least-recently-used eviction
+- HudLayer: draws cached text and named dynamic fields (score, lines,
+  FPS, ...) that are only re-rasterized when their text changes
+- SampledValue: holds a value that changes every frame (the FPS average)
+  so its field is re-rasterized a few times per second, not every frame
+
+Hard-edged text (cv2.LINE_8) blits pixel-identical to cv2.putText on the
+frame; anti-aliased text (cv2.LINE_AA) is alpha blended from its coverage
+mask and may differ from putText by a few levels at the glyph edges.
+"""
+
+from collections import OrderedDict
+
+import cv2
+import numpy as np
+from config import HUD_SPRITE_CACHE_SIZE, HUD_FPS_REFRESH
+
+
+class TextSprite:
+    """
+    One rasterized string.
+
+    text_size and baseline are what cv2.getTextSize returns for the
+    string; origin_x/origin_y locate the putText origin (left end of the
+    baseline) inside the sprite image.
+    """
+
+    __slots__ = ('image', 'mask', 'weights', 'origin_x', 'origin_y', 'text_size', 'baseline')
+
+    def __init__(self, text, font, scale, color, thickness=1, line_type=cv2.LINE_8):
+        (width, height), baseline = cv2.getTextSize(text, font, scale, thickness)
+        self.text_size = (width, height)
+        self.baseline = baseline
+
+        # Strokes reach past the getTextSize box by about half the thickness
+        pad = thickness + 2
+        self.origin_x = pad
+        self.origin_y = pad + height
+        self.mask = np.zeros((height + baseline + 2 * pad, width + 2 * pad), dtype=np.uint8)
+        cv2.putText(self.mask, text, (self.origin_x, self.origin_y), font, scale, 255, thickness, line_type)
+        self.image = np.empty(self.mask.shape + (3,), dtype=np.uint8)
+        self.image[:] = color
+
+        if np.all((self.mask == 0) | (self.mask == 255)):
+            self.weights = None             # Hard edges: a masked copy is enough
+        else:
+            coverage = self.mask.astype(np.float32) / 255
+            self.weights = (1 - coverage, coverage)     # Frame and text weights for cv2.blendLinear
+
+    def blit(self, frame, org):
+        """Draw the sprite on frame with its text origin at org, clipped to the frame."""
+        x0 = org[0] - self.origin_x
+        y0 = org[1] - self.origin_y
+        height, width = self.mask.shape
+        frame_height, frame_width = frame.shape[:2]
+        left, top = max(0, -x0), max(0, -y0)
+        right, bottom = min(width, frame_width - x0), min(height, frame_height - y0)
+        if left >= right or top >= bottom:
+            return
+
+        roi = frame[y0 + top:y0 + bottom, x0 + left:x0 + right]
+        if self.weights is None:
+            cv2.copyTo(self.image[top:bottom, left:right], self.mask[top:bottom, left:right], roi)
+        else:
+            frame_weight, text_weight = self.weights
+            cv2.blendLinear(roi, self.image[top:bottom, left:right], frame_weight[top:bottom, left:right],
+                            text_weight[top:bottom, left:right], dst=roi)
+
+
+class TextSpriteCache:
+    """Rasterized strings with least-recently-used eviction."""
+
+    def __init__(self, max_sprites=HUD_SPRITE_CACHE_SIZE):
+        self.max_sprites = max_sprites
+        self._sprites = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, text, font, scale, color, thickness=1, line_type=cv2.LINE_8):
+        key = (text, font, scale, tuple(color), thickness, line_type)
+        sprite = self._sprites.get(key)
+        if sprite is not None:
+            self._sprites.move_to_end(key)
+            self.hits += 1
+            return sprite
+
+        self.misses += 1
+        sprite = TextSprite(text, font, scale, color, thickness, line_type)
+        self._sprites[key] = sprite
+        if len(self._sprites) > self.max_sprites:
+            self._sprites.popitem(last=False)
+        return sprite
+
+    def __len__(self):
+        return len(self._sprites)
+
+
+class HudLayer:
+    """
+    Draws HUD text from cached sprites.
+
+    draw_text() is for strings that repeat (labels, instructions, messages);
+    draw_field() is for a value that changes now and then, such as the
+    score: each named field keeps the sprite of its current text and
+    rasterizes a new one only when the text differs, without filling the
+    shared cache with every value it has shown.
+    """
+
+    def __init__(self, cache=None):
+        self.cache = cache if cache is not None else TextSpriteCache()
+        self._fields = {}                   # name -> (sprite key, sprite)
+        self.field_updates = 0
+
+    def sprite(self, text, font, scale, color, thickness=1, line_type=cv2.LINE_8):
+        """Cached sprite of a string; its text_size replaces cv2.getTextSize for layout."""
+        return self.cache.get(text, font, scale, color, thickness, line_type)
+
+    def draw_text(self, frame, text, org, font, scale, color, thickness=1, line_type=cv2.LINE_8):
+        """Drop-in for cv2.putText with a cached sprite."""
+        self.cache.get(text, font, scale, color, thickness, line_type).blit(frame, org)
+
+    def draw_field(self, frame, name, text, org, font, scale, color, thickness=1, line_type=cv2.LINE_8):
+        """Like draw_text, for a named field whose text changes over time."""
+        key = (text, font, scale, tuple(color), thickness, line_type)
+        field = self._fields.get(name)
+        if field is None or field[0] != key:
+            field = (key, TextSprite(text, font, scale, color, thickness, line_type))
+            self._fields[name] = field
+            self.field_updates += 1
+        field[1].blit(frame, org)
+
+
+class SampledValue:
+    """
+    Takes a new reading of a fast-changing value every `interval` updates
+    and holds it in between. A field whose text changes every frame would
+    rasterize a new sprite every frame, which costs more than cv2.putText.
+    """
+
+    def __init__(self, interval=HUD_FPS_REFRESH):
+        self.interval = interval
+        self.value = None
+        self._updates = 0
+
+    def update(self, value):
+        """Offer the current value; returns the one to display."""
+        if self._updates % self.interval == 0:
+            self.value = value
+        self._updates += 1
+        return self.value
+
+
+# Shared HUD for the game display and gesture overlay
+hud_layer = HudLayer()
@@ -0,0 +1,231 @@
+"""
+Motion Tetris - Out-of-Process Gesture Inference Module
+======================================================
+This module runs MediaPipe hand inference in a separate worker process so it
+no longer competes with board logic, drawing and display for the main thread:
+- Frames are handed over through a shared-memory ring (no pickling)
+- The worker always picks up the newest submitted frame
+- Results (gesture, landmarks, handedness) come back tagged with frame IDs
+- The main loop polls for the freshest result without blocking
+- A crashed worker is restarted automatically
+"""
+
+import multiprocessing as mp
+import queue
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+from config import (
+    INFERENCE_RESULT_MAX_AGE, INFERENCE_WORKER_RESTART_DELAY, GESTURE_TRACKING_MODE
+)
+from gestures import draw_hand_landmarks, visualize_gesture
+from hand_tracking import create_hand_tracker
+
+# Shared control block layout (int64 slots)
+_PENDING_SLOT = 0       # Slot holding the newest unprocessed frame (-1 if none)
+_PENDING_FRAME_ID = 1   # Frame ID of the pending slot
+_BUSY_SLOT = 2          # Slot the worker is currently reading (-1 if idle)
+_CONTROL_SIZE = 3
+
+_NUM_SLOTS = 3          # busy + pending + one free slot for the writer
+
+
+def _inference_worker_main(shm_name, frame_shape, dtype_str, control, wake_event,
+                           stop_event, result_queue, tracking_mode):
+    """Worker process entry point: wait for frames, run inference, post results."""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    dtype = np.dtype(dtype_str)
+    frames = np.ndarray((_NUM_SLOTS,) + tuple(frame_shape), dtype=dtype, buffer=shm.buf)
+    tracker = create_hand_tracker(tracking_mode)
+
+    try:
+        while not stop_event.is_set():
+            if not wake_event.wait(timeout=0.1):
+                continue
+
+            with control.get_lock():
+                slot = control[_PENDING_SLOT]
+                frame_id = control[_PENDING_FRAME_ID]
+                control[_PENDING_SLOT] = -1
+                control[_BUSY_SLOT] = slot
+                wake_event.clear()
+            if slot < 0:
+                continue
+
+            # The slot stays reserved until the tracker is done with it
+            start_time = time.perf_counter()
+            landmarks, labels, gesture = tracker.process_gesture(frames[slot])
+            with control.get_lock():
+                control[_BUSY_SLOT] = -1
+            inference_time = time.perf_counter() - start_time
+
+            result_queue.put((frame_id, gesture, landmarks, labels, inference_time,
+                              tracker.last_mode))
+    finally:
+        del frames
+        shm.close()
+
+
+class GestureInferenceEngine:
+    """
+    Supervisor for the gesture inference worker process.
+
+    Usage per frame:
+        engine.submit(frame, frame_id)
+        result = engine.poll()   # freshest result, never blocks
+    """
+
+    def __init__(self, frame_shape, dtype=np.uint8, tracking_mode=GESTURE_TRACKING_MODE):
+        self._tracking_mode = tracking_mode
+        self._frame_shape = tuple(frame_shape)
+        self._dtype = np.dtype(dtype)
+        frame_bytes = int(np.prod(self._frame_shape)) * self._dtype.itemsize
+
+        self._ctx = mp.get_context("spawn")
+        self._shm = shared_memory.SharedMemory(create=True, size=frame_bytes * _NUM_SLOTS)
+        self._frames = np.ndarray((_NUM_SLOTS,) + self._frame_shape,
+                                  dtype=self._dtype, buffer=self._shm.buf)
+        self._control = self._ctx.Array('q', [-1] * _CONTROL_SIZE)
+        self._wake_event = self._ctx.Event()
+        self._stop_event = self._ctx.Event()
+        self._result_queue = self._ctx.Queue()
+        self._process = None
+
+        self._latest_result = None
+        self._latest_result_time = 0.0
+        self._last_restart_time = 0.0
+        self.restarts = 0
+        self.frames_submitted = 0
+        self.results_received = 0
+        self.inference_timings = {}             # mode -> [frames, total seconds]
+
+    def start(self):
+        """Launch the worker process and return self for chaining."""
+        self._stop_event.clear()
+        with self._control.get_lock():
+            for i in range(_CONTROL_SIZE):
+                self._control[i] = -1
+        self._process = self._ctx.Process(
+            target=_inference_worker_main,
+            args=(self._shm.name, self._frame_shape, self._dtype.str, self._control,
+                  self._wake_event, self._stop_event, self._result_queue,
+                  self._tracking_mode),
+            name="GestureInferenceWorker",
+            daemon=True
+        )
+        self._process.start()
+        self._last_restart_time = time.time()
+        return self
+
+    def _ensure_alive(self):
+        """Restart the worker if it has died."""
+        if self._process is None or self._process.is_alive():
+            return
+        if time.time() - self._last_restart_time < INFERENCE_WORKER_RESTART_DELAY:
+            return
+        print(f"Warning: Inference worker exited (code {self._process.exitcode}). Restarting.")
+        self.restarts += 1
+        self.start()
+
+    def submit(self, frame, frame_id):
+        """
+        Copy a frame into shared memory and make it the worker's next job.
+
+        An older frame that the worker has not picked up yet is replaced.
+        Returns False if the frame does not match the shared buffer format.
+        """
+        self._ensure_alive()
+        if frame.shape != self._frame_shape or frame.dtype != self._dtype:
+            return False
+
+        with self._control.get_lock():
+            in_use = (self._control[_PENDING_SLOT], self._control[_BUSY_SLOT])
+            slot = next(i for i in range(_NUM_SLOTS) if i not in in_use)
+            # Withdraw the stale pending frame so its slot is not reused mid-write
+            self._control[_PENDING_SLOT] = -1
+
+        np.copyto(self._frames[slot], frame)
+
+        with self._control.get_lock():
+            self._control[_PENDING_SLOT] = slot
+            self._control[_PENDING_FRAME_ID] = frame_id
+        self._wake_event.set()
+        self.frames_submitted += 1
+        return True
+
+    def poll(self):
+        """
+        Return the freshest result without waiting.
+
+        Returns:
+            tuple or None: (frame_id, gesture, landmarks, labels, inference_time,
+            inference_mode),
+            or None if no result is available or the last one is too old
+        """
+        while True:
+            try:
+                result = self._result_queue.get_nowait()
+            except queue.Empty:
+                break
+            if self._latest_result is None or result[0] >= self._latest_result[0]:
+                self._latest_result = result
+                self._latest_result_time = time.time()
+            self.results_received += 1
+            timing = self.inference_timings.setdefault(result[5], [0, 0.0])
+            timing[0] += 1
+            timing[1] += result[4]
+
+        if self._latest_result is None:
+            return None
+        if time.time() - self._latest_result_time > INFERENCE_RESULT_MAX_AGE:
+            return None
+        return self._latest_result
+
+    @property
+    def latest_frame_id(self):
+        """Frame ID the freshest result was computed from, or None."""
+        return self._latest_result[0] if self._latest_result is not None else None
+
+    def stop(self):
+        """Stop the worker process and release the shared frame buffer."""
+        self._stop_event.set()
+        self._wake_event.set()
+        if self._process is not None:
+            self._process.join(timeout=2.0)
+            if self._process.is_alive():
+                self._process.terminate()
+                self._process.join(timeout=1.0)
+            self._process = None
+        self._result_queue.close()
+        del self._frames
+        self._shm.close()
+        self._shm.unlink()
+
+
+def detect_hand_gesture_async(engine, frame, frame_id, out=None):
+    """
+    Asynchronous counterpart of gestures.detect_hand_gesture.
+
+    Submits the frame to the worker and annotates a copy of it with the
+    freshest available result; the copy goes into out when a reusable
+    buffer is given.
+    
+    Returns:
+        tuple: (processed_frame, gesture_name)
+    """
+    engine.submit(frame, frame_id)
+    if out is None:
+        processed_frame = frame.copy()
+    else:
+        np.copyto(out, frame)
+        processed_frame = out
+    result = engine.poll()
+
+    gesture = "none"
+    if result is not None:
+        _, gesture, landmarks = result[:3]
+        draw_hand_landmarks(processed_frame, landmarks)
+
+    visualize_gesture(processed_frame, gesture)
+    return processed_frame, gesture
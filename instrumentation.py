@@ -0,0 +1,161 @@
+"""
+Motion Tetris - Hot-Path Instrumentation Module
+==============================================
+Lightweight per-stage timing for the game loop:
+- Named spans (capture, inference, logic, render, compose, display, ...)
+  are timed with time.perf_counter
+- Each stage feeds a fixed-size ring-buffer histogram, so memory stays
+  constant and percentiles always describe the recent window
+- p50/p95/p99 summaries for an on-screen HUD and for JSON/CSV export
+
+Recording a sample is an array store and an index increment; percentiles
+are only computed when a summary is requested (the HUD refreshes them
+every few frames).
+"""
+
+import csv
+import json
+import time
+
+import numpy as np
+from config import PROFILE_WINDOW, PROFILE_HUD_REFRESH
+
+PERCENTILES = (50, 95, 99)
+
+
+class SpanHistogram:
+    """Ring buffer of the most recent duration samples (seconds)."""
+
+    __slots__ = ('_samples', '_index', 'count')
+
+    def __init__(self, capacity=PROFILE_WINDOW):
+        self._samples = np.zeros(capacity, dtype=np.float64)
+        self._index = 0
+        self.count = 0
+
+    def add(self, duration):
+        self._samples[self._index] = duration
+        self._index = (self._index + 1) % len(self._samples)
+        self.count += 1
+
+    def window(self):
+        """Samples currently held (unordered once the buffer has wrapped)."""
+        return self._samples[:min(self.count, len(self._samples))]
+
+    def summary(self):
+        """Count plus mean/percentiles/max of the window, in milliseconds."""
+        samples = self.window()
+        if len(samples) == 0:
+            return {'count': 0}
+        p50, p95, p99 = np.percentile(samples, PERCENTILES) * 1000
+        return {
+            'count': self.count,
+            'mean_ms': float(samples.mean() * 1000),
+            'p50_ms': float(p50),
+            'p95_ms': float(p95),
+            'p99_ms': float(p99),
+            'max_ms': float(samples.max() * 1000)
+        }
+
+
+class _Span:
+    """Reusable context manager timing one named stage."""
+
+    __slots__ = ('_histogram', '_start')
+
+    def __init__(self, histogram):
+        self._histogram = histogram
+        self._start = 0.0
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._histogram.add(time.perf_counter() - self._start)
+        return False
+
+
+class StageProfiler:
+    """
+    Collection of named stage histograms.
+
+    Usage:
+        with profiler.span("render"):
+            ...
+        start = time.perf_counter(); ...; profiler.record("logic", start)
+        profiler.frame_tick()     # once per loop iteration
+    """
+
+    def __init__(self, capacity=PROFILE_WINDOW, hud_refresh=PROFILE_HUD_REFRESH):
+        self.capacity = capacity
+        self.hud_refresh = hud_refresh
+        self._histograms = {}
+        self._spans = {}
+        self._last_tick = None
+        self._frames = 0
+        self._hud_lines = []
+
+    def histogram(self, name):
+        """Histogram for a stage, created on first use (insertion order is display order)."""
+        histogram = self._histograms.get(name)
+        if histogram is None:
+            histogram = SpanHistogram(self.capacity)
+            self._histograms[name] = histogram
+            self._spans[name] = _Span(histogram)
+        return histogram
+
+    def span(self, name):
+        """Context manager timing the named stage. Spans are not re-entrant per name."""
+        span = self._spans.get(name)
+        if span is None:
+            self.histogram(name)
+            span = self._spans[name]
+        return span
+
+    def record(self, name, start_time):
+        """Record a stage that started at start_time (perf_counter) and ends now."""
+        self.histogram(name).add(time.perf_counter() - start_time)
+
+    def frame_tick(self):
+        """Record the time since the previous tick as the 'frame' stage."""
+        now = time.perf_counter()
+        if self._last_tick is not None:
+            self.histogram("frame").add(now - self._last_tick)
+        self._last_tick = now
+        self._frames += 1
+
+    def summary(self):
+        """Per-stage summaries keyed by stage name."""
+        return {name: histogram.summary() for name, histogram in self._histograms.items()}
+
+    def hud_lines(self):
+        """Short per-stage lines for an on-screen HUD, refreshed every few frames."""
+        if not self._hud_lines or self._frames % self.hud_refresh == 0:
+            self._hud_lines = [
+                f"{name:<9} {s['p50_ms']:6.2f} {s['p95_ms']:6.2f} {s['p99_ms']:6.2f}"
+                for name, s in self.summary().items() if s['count']
+            ]
+            if self._hud_lines:
+                self._hud_lines.insert(0, f"{'ms':<9} {'p50':>6} {'p95':>6} {'p99':>6}")
+        return self._hud_lines
+
+    def export_json(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.summary(), f, indent=2)
+
+    def export_csv(self, path):
+        fields = ['stage', 'count', 'mean_ms', 'p50_ms', 'p95_ms', 'p99_ms', 'max_ms']
+        with open(path, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=fields)
+            writer.writeheader()
+            for name, stats in self.summary().items():
+                writer.writerow({'stage': name, **stats})
+
+    def export(self, path):
+        """Export the summary as JSON or CSV, chosen by file extension."""
+        if path.endswith('.csv'):
+            self.export_csv(path)
+        else:
+            self.export_json(path)
+        print(f"Stage timings saved to {path}")
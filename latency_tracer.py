@@ -0,0 +1,117 @@
+"""
+Motion Tetris - Gesture Latency Tracer Module
+============================================
+Measures gesture-to-screen latency: the time from the capture of the frame
+in which a gesture appeared to the display of the frame in which the piece
+actually moved or rotated because of it.
+
+- Every captured frame is tagged with (frame_id, capture_time)
+- Each loop iteration reports which gesture was recognized and from which
+  frame (with out-of-process inference the result lags the current frame)
+- When the gesture-handling block moves or rotates the piece, the action
+  is held until the frame showing it has been displayed, then the latency
+  is recorded in a per-gesture histogram
+
+The first action of a gesture is measured from the frame where that
+gesture first appeared (its onset); actions repeated while the gesture is
+held are measured from the frame they were recognized in, which the
+gesture's InputEvent carries through the input queue.
+
+A scripted gesture sequence (scripted_gesture) allows checking the tracer
+with synthetic frames and no camera or hand.
+"""
+
+from config import LATENCY_TAG_HISTORY, LATENCY_SCRIPT
+from instrumentation import SpanHistogram
+
+TRACED_GESTURES = ("left", "right", "rotate")
+
+
+class GestureLatencyTracer:
+    """
+    Per-gesture capture-to-display latency histograms.
+
+    All timestamps must come from the same clock as the capture stage
+    (time.time).
+    """
+
+    def __init__(self, profiler=None, history=LATENCY_TAG_HISTORY):
+        self._profiler = profiler
+        self._histograms = {}
+        self._history = history
+        self._capture_times = {}                # frame_id -> capture_time
+        self._observed_gesture = "none"
+        self._onset_time = None                 # Capture time where the current gesture began
+        self._onset_used = False
+        self._pending = []                      # (gesture, start_time) awaiting display
+
+    def histogram(self, gesture):
+        histogram = self._histograms.get(gesture)
+        if histogram is None:
+            if self._profiler is not None:
+                histogram = self._profiler.histogram(f"latency {gesture}")
+            else:
+                histogram = SpanHistogram()
+            self._histograms[gesture] = histogram
+        return histogram
+
+    def tag(self, frame_id, capture_time):
+        """Remember the capture time of a frame."""
+        self._capture_times[frame_id] = capture_time
+        self._capture_times.pop(frame_id - self._history, None)
+
+    def observe(self, gesture, source_frame_id):
+        """Report the gesture recognized this iteration and the frame it came from."""
+        if source_frame_id is None:
+            return
+        if gesture != self._observed_gesture:
+            self._onset_time = self._capture_times.get(source_frame_id)
+            self._onset_used = False
+        self._observed_gesture = gesture
+
+    def gesture_applied(self, gesture, source_frame_id):
+        """
+        The piece moved or rotated because of a gesture recognized in
+        source_frame_id. Queued events can be applied frames later, so the
+        latency is measured from that frame, not the latest observed one.
+        """
+        if gesture not in TRACED_GESTURES:
+            return
+        start_time = self._capture_times.get(source_frame_id)
+        if (gesture == self._observed_gesture and not self._onset_used and self._onset_time is not None
+                and (start_time is None or start_time >= self._onset_time)):
+            start_time = self._onset_time
+            self._onset_used = True
+        if start_time is not None:
+            self._pending.append((gesture, start_time))
+
+    def frame_shown(self, display_time):
+        """The frame reflecting all applied actions has been displayed."""
+        for gesture, start_time in self._pending:
+            self.histogram(gesture).add(display_time - start_time)
+        self._pending.clear()
+
+    def summary(self):
+        return {gesture: histogram.summary() for gesture, histogram in self._histograms.items()}
+
+
+def scripted_gesture(frame_id, script=LATENCY_SCRIPT):
+    """
+    Gesture for a frame from a repeating script of (gesture, frames) pairs,
+    used instead of hand detection in the synthetic latency test mode.
+    """
+    cycle = sum(frames for _, frames in script)
+    position = frame_id % cycle
+    for gesture, frames in script:
+        if position < frames:
+            return gesture
+        position -= frames
+    return "none"
+
+
+def print_latency_summary(tracer):
+    """Print per-gesture latency percentiles."""
+    for gesture, stats in tracer.summary().items():
+        if stats['count']:
+            print(f"Latency {gesture}: {stats['count']} actions, p50 {stats['p50_ms']:.1f} ms, "
+                  f"p95 {stats['p95_ms']:.1f} ms, p99 {stats['p99_ms']:.1f} ms")
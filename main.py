@@ -33,10 +33,13 @@ Version: 1.0
 """
 
 import cv2
+import numpy as np
 import time
 import pygame
 import os
+import sys
 import traceback
+from collections import deque
 
 # =============================================================================
 # IMPORTS FROM PROJECT MODULES
@@ -47,29 +50,29 @@ import traceback
 # =============================================================================
 
 from config import (
-    BOARD_WIDTH, DEFAULT_MOVE_DELAY, GESTURE_COOLDOWN,
     BGM_PATH, CLEAR_ROW_SOUND_PATH, DEFAULT_MUSIC_VOLUME,
-    VIDEO_OUTPUT_DIRECTORY, OUTPUT_VIDEO_FILENAME, VIDEO_FOURCC,
-    HARD_DROP_DELAY, ROTATION_DELAY, ROTATION_RECOGNITION_DELAY
+    VIDEO_OUTPUT_DIRECTORY, OUTPUT_VIDEO_FILENAME, VIDEO_FOURCC, VIDEO_RECORDING_ENABLED,
+    SESSION_LOG_ENABLED, SESSION_LOG_FILENAME,
+    GESTURE_INFERENCE_MODE, PROFILE_HUD, PROFILE_EXPORT_FILENAME, LATENCY_TRACE_SYNTHETIC,
+    HEADLESS, HEADLESS_FRAMES
 )
+from capture import start_frame_capture
 from gestures import detect_hand_gesture
-from tetris_logic import (
-    create_tetris_board,
-    create_tetris_shapes,
-    is_valid_position,
-    add_piece_to_board,
-    clear_full_rows,
-    calculate_score
-)
+from inference_worker import GestureInferenceEngine, detect_hand_gesture_async
+from hand_tracking import create_hand_tracker, format_inference_timings
+from tetris_logic import create_tetris_shapes, perform_instant_hard_drop
+from game_state import GameState
+from session_log import SessionLogWriter
+from frame_sources import create_frame_source
 from video_processing import (
-    read_frame,
-    setup_webcam,
-    draw_tetris_board,
-    draw_tetris_shape,
-    combine_board_and_webcam,
-    overlay_tetris_on_webcam,
-    setup_video_writer
+    BoardRenderer,
+    DisplayCompositor
 )
+from recording import start_async_recorder, print_recording_stats
+from instrumentation import StageProfiler
+from hud import hud_layer, SampledValue
+from game_clock import FixedTimestep, InputQueue, interpolate_position
+from latency_tracer import GestureLatencyTracer, scripted_gesture, print_latency_summary
 
 # =============================================================================
 # AUDIO INITIALIZATION AND MANAGEMENT
@@ -82,7 +85,11 @@ def initialize_pygame_mixer():
     Returns:
         pygame.mixer.Sound or None: Clear row sound effect, None if failed to load
     """
-    pygame.mixer.init()
+    try:
+        pygame.mixer.init()
+    except pygame.error as e:
+        print(f"Warning: Could not initialize audio, playing without sound: {e}")
+        return None
     
     # Load and play background music
     try:
@@ -106,101 +113,17 @@ def initialize_pygame_mixer():
 # GAME STATE MANAGEMENT
 # =============================================================================
 
-def reset_game_state(tetris_shapes_data):
-    """
-    Reset the game state to start a new game.
-    
-    Args:
-        tetris_shapes_data: Dictionary containing Tetris piece shapes
-        
-    Returns:
-        tuple: Complete game state variables for a new game
-    """
-    tetris_board = create_tetris_board()
-    score = 0
-    lines_cleared_total = 0
-    game_over = False
-    shape_keys = list(tetris_shapes_data.keys())
-    shape_index = 0
-    current_shape_key = shape_keys[shape_index]
-    current_rotation = 0
-    pos_x = BOARD_WIDTH // 2 - 2
-    pos_y = 0
-    last_move_time = time.time()
-    last_gesture_time = time.time()
-    last_rotation_time = time.time()
-    hard_drop_active = False
+def start_new_game(game_state, current_time):
+    """Reset a GameState for a new game at simulation time current_time."""
+    game_state.reset(current_time)
     print("Game Restarted!")
-    return (
-        tetris_board, score, lines_cleared_total, game_over,
-        shape_keys, shape_index, current_shape_key, current_rotation,
-        pos_x, pos_y, last_move_time, last_gesture_time, last_rotation_time, hard_drop_active
-    )
-
-# =============================================================================
-# INPUT HANDLING
-# =============================================================================
-
-def handle_input(key, game_state, tetris_board, tetris_shapes_data, current_time):
-    """
-    Handle keyboard input for controlling the game.
-    
-    Args:
-        key: Pressed key code
-        game_state: Current game state tuple
-        tetris_board: Current Tetris board state
-        tetris_shapes_data: Dictionary containing Tetris piece shapes
-        current_time: Current time for delay calculations
-        
-    Returns:
-        tuple: Updated game state values
-    """
-    (pos_x, current_rotation, current_shape_key, shape_keys, shape_index,
-     last_move_time, overlay_mode, pos_y, hard_drop_active, last_rotation_time) = game_state
-    
-    new_pos_x = pos_x
-    new_current_rotation = current_rotation
-    new_current_shape_key = current_shape_key
-    new_shape_index = shape_index
-    new_pos_y = pos_y
-    new_hard_drop_active = hard_drop_active
-    new_last_rotation_time = last_rotation_time
-
-    if key == ord('a'):  # Move left
-        if is_valid_position(tetris_board, tetris_shapes_data[current_shape_key], current_rotation, pos_x - 1, pos_y):
-            new_pos_x = pos_x - 1
-    elif key == ord('d'):  # Move right
-        if is_valid_position(tetris_board, tetris_shapes_data[current_shape_key], current_rotation, pos_x + 1, pos_y):
-            new_pos_x = pos_x + 1
-    elif key == ord('w'):  # Rotate
-        # Apply rotation delay        if current_time - last_rotation_time > ROTATION_DELAY:
-            next_rotation = (current_rotation + 1) % len(tetris_shapes_data[current_shape_key]['shape'])
-            if is_valid_position(tetris_board, tetris_shapes_data[current_shape_key], next_rotation, pos_x, pos_y):
-                new_current_rotation = next_rotation
-                new_last_rotation_time = current_time
-    elif key == ord('s'):  # Soft drop
-        if is_valid_position(tetris_board, tetris_shapes_data[current_shape_key], current_rotation, pos_x, pos_y + 1):
-            new_pos_y = pos_y + 1
-    elif key == ord(' '):  # Hard drop (instant)
-        new_pos_y = perform_instant_hard_drop(tetris_board, tetris_shapes_data, current_shape_key, current_rotation, pos_x, pos_y)
-    elif key == ord('n'):  # Change shape
-        new_shape_index = (shape_index + 1) % len(shape_keys)
-        potential_new_shape_key = shape_keys[new_shape_index]
-        if is_valid_position(tetris_board, tetris_shapes_data[potential_new_shape_key], 0, pos_x, pos_y):
-            new_current_shape_key = potential_new_shape_key
-            new_current_rotation = 0
-        else:
-            new_shape_index = shape_index
-    elif key == ord('o'):
-        overlay_mode = not overlay_mode
-
-    return new_pos_x, new_current_rotation, new_current_shape_key, new_shape_index, new_pos_y, overlay_mode, new_hard_drop_active, new_last_rotation_time
 
 # =============================================================================
 # DISPLAY AND UI FUNCTIONS
 # =============================================================================
 
-def draw_game_info(display_frame, score, lines_cleared_total, avg_fps, overlay_mode, hard_drop_active):
+def draw_game_info(display_frame, score, lines_cleared_total, avg_fps, overlay_mode, hard_drop_active,
+                   timing_lines=None):
     """
     Draw game information (score, lines, FPS, mode, hard drop status) on the display frame.
     
@@ -211,13 +134,19 @@ def draw_game_info(display_frame, score, lines_cleared_total, avg_fps, overlay_m
         avg_fps: Average FPS value
         overlay_mode: Whether overlay mode is active
         hard_drop_active: Whether hard drop is currently active
+        timing_lines: Optional per-stage timing HUD lines (StageProfiler.hud_lines)
     """
-    cv2.putText(display_frame, f"Score: {score}", (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
-    cv2.putText(display_frame, f"Lines: {lines_cleared_total}", (10, 60), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
-    cv2.putText(display_frame, f"FPS: {avg_fps:.1f}", (10, 90), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+    hud_layer.draw_field(display_frame, "score", f"Score: {score}", (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+    hud_layer.draw_field(display_frame, "lines", f"Lines: {lines_cleared_total}", (10, 60), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+    hud_layer.draw_field(display_frame, "fps", f"FPS: {avg_fps:.1f}", (10, 90), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
     # Show hard drop status
     if hard_drop_active:
-        cv2.putText(display_frame, "HARD DROP ACTIVE!", (10, 150), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
+        hud_layer.draw_text(display_frame, "HARD DROP ACTIVE!", (10, 150), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
+    # Per-stage timing HUD (top right)
+    if timing_lines:
+        hud_x = display_frame.shape[1] - 260
+        for i, line in enumerate(timing_lines):
+            hud_layer.draw_field(display_frame, f"timing{i}", line, (hud_x, 20 + i * 16), cv2.FONT_HERSHEY_PLAIN, 1.0, (255, 255, 255), 1)
 
 def draw_game_over_screen(display_frame, score):
     """
@@ -227,51 +156,41 @@ def draw_game_over_screen(display_frame, score):
         display_frame: Frame to draw game over screen on
         score: Final game score
     """
-    text_size, _ = cv2.getTextSize("Game Over!", cv2.FONT_HERSHEY_SIMPLEX, 2, 3)
+    game_over = hud_layer.sprite("Game Over!", cv2.FONT_HERSHEY_SIMPLEX, 2, (0, 0, 255), 3, cv2.LINE_AA)
+    text_size = game_over.text_size
     text_x = (display_frame.shape[1] - text_size[0]) // 2
     text_y = (display_frame.shape[0] + text_size[1]) // 2
-    cv2.putText(display_frame, "Game Over!", (text_x, text_y - 30), cv2.FONT_HERSHEY_SIMPLEX, 2, (0, 0, 255), 3, cv2.LINE_AA)
-    cv2.putText(display_frame, f"Final Score: {score}", (text_x, text_y + 20), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2, cv2.LINE_AA)
-    cv2.putText(display_frame, "Press 'R' to Restart or 'Q' to Quit", (text_x - 100, text_y + 70), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255,255,255), 2, cv2.LINE_AA)
+    game_over.blit(display_frame, (text_x, text_y - 30))
+    hud_layer.draw_field(display_frame, "final_score", f"Final Score: {score}", (text_x, text_y + 20), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2, cv2.LINE_AA)
+    hud_layer.draw_text(display_frame, "Press 'R' to Restart or 'Q' to Quit", (text_x - 100, text_y + 70), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255,255,255), 2, cv2.LINE_AA)
 
 # =============================================================================
-# GAME MECHANICS UTILITIES
+# MAIN GAME LOOP
 # =============================================================================
 
-def perform_instant_hard_drop(tetris_board, tetris_shapes_data, current_shape_key, current_rotation, pos_x, pos_y):
+def main(headless=HEADLESS, max_frames=HEADLESS_FRAMES):
     """
-    Drop the piece all the way down instantly until it collides with something.
-    
-    Args:
-        tetris_board: Current Tetris board state
-        tetris_shapes_data: Dictionary containing Tetris piece shapes
-        current_shape_key: Current piece type
-        current_rotation: Current piece rotation
-        pos_x: Current X position
-        pos_y: Current Y position
-        
-    Returns:
-        int: Final Y position after hard drop
+    Run the game. When headless, no window is opened, no sound is played
+    and the game exits after max_frames frames (or when the frame source
+    ends), so main() can be benchmarked on machines without a display or
+    audio device.
     """
-    drop_y = pos_y
-    
-    # Keep dropping until collision
-    while is_valid_position(tetris_board, tetris_shapes_data[current_shape_key], current_rotation, pos_x, drop_y + 1):
-        drop_y += 1
-    
-    return drop_y
-
-# =============================================================================
-# MAIN GAME LOOP
-# =============================================================================
-
-def main():
     webcam = None
-    video_writer = None
+    frame_capture = None
+    inference_engine = None
+    hand_tracker = None
+    annotated_frame = None              # Reused buffer for the annotated webcam frame
+    frame_id = 0
+    video_recorder = None
     prev_time = time.time()
-    fps_values = []
+    fps_values = deque(maxlen=30)
+    fps_readout = SampledValue()          # FPS text changes a few times per second, not every frame
+    profiler = StageProfiler()
+    latency_tracer = GestureLatencyTracer(profiler)
     tetris_shapes_data = create_tetris_shapes()
-    clear_row_sound = initialize_pygame_mixer()
+    board_renderer = BoardRenderer()
+    display_compositor = DisplayCompositor(overlay_alpha=0.6)
+    clear_row_sound = None if headless else initialize_pygame_mixer()
 
     # Create video output directory if it doesn't exist
     if not os.path.exists(VIDEO_OUTPUT_DIRECTORY):
@@ -280,188 +199,173 @@ def main():
     
     video_file_path = os.path.join(VIDEO_OUTPUT_DIRECTORY, OUTPUT_VIDEO_FILENAME)
     
-    # Initialize game state
-    (
-        tetris_board, score, lines_cleared_total, game_over,
-        shape_keys, shape_index, current_shape_key, current_rotation,
-        pos_x, pos_y, last_move_time, last_gesture_time, last_rotation_time, hard_drop_active
-    ) = reset_game_state(tetris_shapes_data)
-
-    move_delay = DEFAULT_MOVE_DELAY
-    gesture_cooldown = GESTURE_COOLDOWN
-    overlay_mode = False
+    # Initialize game state; logic runs on the simulation clock
+    sim_clock = FixedTimestep()
+    input_queue = InputQueue()
+    state = GameState(tetris_shapes_data.keys(), sim_clock.sim_time)
+    print("Game Restarted!")
+    session_log = None
 
     try:
-        webcam = setup_webcam(width=640, height=480)
+        if SESSION_LOG_ENABLED:
+            session_log = SessionLogWriter(os.path.join(VIDEO_OUTPUT_DIRECTORY, SESSION_LOG_FILENAME),
+                                           sim_clock.start_time, 1.0 / sim_clock.tick_duration, state.shape_keys,
+                                           state.move_delay, state.hard_drop_delay,
+                                           state.rotation_delay, state.gesture_cooldown)
+
+        webcam = create_frame_source(width=640, height=480)
         if webcam is None:
-            print("Failed to setup webcam. Exiting.")
+            print("Failed to open frame source. Exiting.")
             return
+        frame_capture = start_frame_capture(webcam)
 
         print("Press 'q' to quit, 'r' to restart.")
         print("Controls: a/d/w/s for movement, space for instant hard drop, n to change shape")
         print("Gestures: left/right hand for movement, clap for rotation, fist (genggam tangan) for controlled hard drop")
 
         while True:
-            current_time = time.time()
-            delta_time = current_time - prev_time
+            frame_time = time.time()
+            delta_time = frame_time - prev_time
             if delta_time > 0:
-                fps = 1 / delta_time
-                fps_values.append(fps)
-                if len(fps_values) > 30:
-                    fps_values.pop(0)
-            prev_time = current_time
+                fps_values.append(1 / delta_time)
+            prev_time = frame_time
             avg_fps = sum(fps_values) / len(fps_values) if fps_values else 0
+            profiler.frame_tick()
 
-            frame = read_frame(webcam)
+            with profiler.span("capture"):
+                frame, capture_time = frame_capture.read()
             if frame is None:
                 print("Error: Failed to capture image.")
                 break
 
-            processed_frame, gesture = detect_hand_gesture(frame.copy())
-            board_canvas = draw_tetris_board(tetris_board)
-
-            if not game_over:                # Handle gesture input
-                if current_time - last_gesture_time > gesture_cooldown:
-                    next_pos_x_gesture, next_rotation_gesture = pos_x, current_rotation
-                    gesture_moved = False
-                    
-                    if gesture == "left":
-                        next_pos_x_gesture = pos_x - 1
-                        gesture_moved = True
-                        hard_drop_active = False  # Deactivate hard drop on other gestures
-                    elif gesture == "right":
-                        next_pos_x_gesture = pos_x + 1
-                        gesture_moved = True
-                        hard_drop_active = False  # Deactivate hard drop on other gestures
-                    elif gesture == "rotate":
-                        # Apply rotation delay for gesture too
-                        if current_time - last_rotation_time > ROTATION_DELAY:
-                            next_rotation_gesture = (current_rotation + 1) % len(tetris_shapes_data[current_shape_key]['shape'])
-                            gesture_moved = True
-                            hard_drop_active = False  # Deactivate hard drop on other gestures
-                    elif gesture == "hardDrop":
-                        hard_drop_active = True  # Activate controlled hard drop
-                        gesture_moved = True
-                    elif gesture == "none":
-                        hard_drop_active = False  # Deactivate hard drop when no gesture
-
-                    if gesture_moved:
-                        if gesture == "rotate":
-                            if is_valid_position(tetris_board, tetris_shapes_data[current_shape_key], next_rotation_gesture, pos_x, pos_y):
-                                current_rotation = next_rotation_gesture
-                                last_gesture_time = current_time
-                                last_rotation_time = current_time  # Update rotation time for gesture
-                        elif gesture == "hardDrop":
-                            last_gesture_time = current_time
-                        else:  # Left or Right
-                            if is_valid_position(tetris_board, tetris_shapes_data[current_shape_key], current_rotation, next_pos_x_gesture, pos_y):
-                                pos_x = next_pos_x_gesture
-                                last_gesture_time = current_time
-
-                # Determine current move delay based on hard drop state
-                current_move_delay = HARD_DROP_DELAY if hard_drop_active else move_delay
-
-                # Automatic downward movement
-                if current_time - last_move_time > current_move_delay:
-                    if is_valid_position(tetris_board, tetris_shapes_data[current_shape_key], current_rotation, pos_x, pos_y + 1):
-                        pos_y += 1
-                    else:  # Piece lands
-                        add_piece_to_board(tetris_board, tetris_shapes_data[current_shape_key], current_rotation, pos_x, pos_y)
-                        lines_cleared_now = clear_full_rows(tetris_board)
-                        if lines_cleared_now > 0:
-                            lines_cleared_total += lines_cleared_now
-                            score += calculate_score(lines_cleared_now)
-                            if clear_row_sound:
-                                clear_row_sound.play()
-
-                        shape_index = (shape_index + 1) % len(shape_keys)
-                        current_shape_key = shape_keys[shape_index]
-                        current_rotation = 0
-                        pos_x = BOARD_WIDTH // 2 - 2
-                        pos_y = 0
-                        hard_drop_active = False  # Reset hard drop state for new piece
-
-                        if not is_valid_position(tetris_board, tetris_shapes_data[current_shape_key], current_rotation, pos_x, pos_y):
-                            game_over = True
-                            print("Game Over!")
-                    last_move_time = current_time
-
-                draw_tetris_shape(board_canvas, tetris_shapes_data[current_shape_key], current_rotation, pos_x, pos_y)
+            frame_id += 1
+            latency_tracer.tag(frame_id, capture_time)
+            if GESTURE_INFERENCE_MODE == "process" and inference_engine is None:
+                inference_engine = GestureInferenceEngine(frame.shape, frame.dtype).start()
+            elif GESTURE_INFERENCE_MODE != "process" and hand_tracker is None:
+                hand_tracker = create_hand_tracker()
+            if annotated_frame is None or annotated_frame.shape != frame.shape:
+                annotated_frame = np.empty_like(frame)
+
+            # The capture slot stays clean; annotations go on annotated_frame
+            with profiler.span("inference"):
+                if inference_engine is not None:
+                    processed_frame, gesture = detect_hand_gesture_async(inference_engine, frame, frame_id,
+                                                                         out=annotated_frame)
+                else:
+                    processed_frame, gesture = detect_hand_gesture(frame, hand_tracker, out=annotated_frame)
+
+            # Worker results lag the current frame; trace the frame they came from
+            gesture_frame_id = inference_engine.latest_frame_id if inference_engine is not None else frame_id
+            if LATENCY_TRACE_SYNTHETIC:
+                gesture, gesture_frame_id = scripted_gesture(frame_id), frame_id
+            latency_tracer.observe(gesture, gesture_frame_id)
+
+            # Gestures take effect at the capture time of their frame
+            if not state.game_over:
+                input_queue.push(capture_time, "gesture", gesture, gesture_frame_id)
+
+            # Fixed-timestep simulation: run every logic tick that is due,
+            # applying queued input events at their timestamps
+            logic_start = time.perf_counter()
+            for current_time in sim_clock.advance(frame_time):
+                if session_log is not None:
+                    session_log.begin_tick(sim_clock.tick_index)
+                if state.game_over:
+                    continue
+                state.remember_piece()
+
+                for event in input_queue.pop_until(current_time):
+                    if event.source == "key":
+                        state.apply_key(event.value, current_time, tetris_shapes_data)
+                        if session_log is not None:
+                            session_log.key(event.value)
+                    else:
+                        if state.apply_gesture(event.value, current_time, tetris_shapes_data):
+                            latency_tracer.gesture_applied(event.value, event.frame_id)
+                        if session_log is not None:
+                            session_log.gesture(event.value)
+
+                locked = state.apply_gravity(current_time, tetris_shapes_data)
+                if locked is not None:
+                    touched_rows, cleared_rows = locked
+                    board_renderer.piece_locked(touched_rows, cleared_rows)
+                    if cleared_rows and clear_row_sound:
+                        clear_row_sound.play()
+                    if session_log is not None:
+                        session_log.piece_locked(state.board)
+                    if state.game_over:
+                        print("Game Over!")
+            profiler.record("logic", logic_start)
+
+            with profiler.span("render"):
+                if not state.game_over:
+                    ghost_y = perform_instant_hard_drop(state.board, tetris_shapes_data, state.current_shape_key, state.current_rotation, state.pos_x, state.pos_y, state.column_surface)
+                    # Interpolate the falling piece between the last two ticks
+                    draw_x, draw_y = state.pos_x, state.pos_y
+                    if (state.previous_shape_key == state.current_shape_key
+                            and state.previous_rotation == state.current_rotation):
+                        draw_x, draw_y = interpolate_position((state.previous_pos_x, state.previous_pos_y),
+                                                              (state.pos_x, state.pos_y), sim_clock.alpha)
+                    board_canvas = board_renderer.render(state.board, tetris_shapes_data[state.current_shape_key], state.current_rotation, draw_x, draw_y, ghost_y)
+                else:
+                    board_canvas = board_renderer.render(state.board)
 
             # Display logic
-            if overlay_mode:
-                display_frame = overlay_tetris_on_webcam(processed_frame, board_canvas, alpha=0.6)
-            else:
-                display_frame = combine_board_and_webcam(board_canvas, processed_frame)
+            with profiler.span("compose"):
+                layout = "overlay" if state.overlay_mode else "side_by_side"
+                display_frame = display_compositor.compose(layout, board_canvas, processed_frame, board_renderer.version)
 
-            draw_game_info(display_frame, score, lines_cleared_total, avg_fps, overlay_mode, hard_drop_active)
+                draw_game_info(display_frame, state.score, state.lines_cleared_total, fps_readout.update(avg_fps), state.overlay_mode, state.hard_drop_active,
+                               profiler.hud_lines() if PROFILE_HUD else None)
 
-            if game_over:
-                draw_game_over_screen(display_frame, score)
+                if state.game_over:
+                    draw_game_over_screen(display_frame, state.score)
 
-            cv2.imshow('Motion Tetris', display_frame)
-
-            # Initialize video_writer with the first display_frame's dimensions
-            if video_writer is None and display_frame is not None:
+            # Initialize video_recorder with the first display_frame's dimensions
+            if VIDEO_RECORDING_ENABLED and video_recorder is None and display_frame is not None:
                 output_fps = webcam.get(cv2.CAP_PROP_FPS)
                 if output_fps == 0 or output_fps > 60:
                     output_fps = 30.0
                 display_frame_size = (display_frame.shape[1], display_frame.shape[0])
-                video_writer = setup_video_writer(video_file_path, VIDEO_FOURCC, output_fps, display_frame_size)
-                if video_writer is None:
+                video_recorder = start_async_recorder(video_file_path, VIDEO_FOURCC, output_fps, display_frame_size)
+                if video_recorder is None:
                     print("Warning: Video recording will not be available.")
+                else:
+                    video_recorder.encode_histogram = profiler.histogram("encode")
 
-            # Write frame to video
-            if video_writer is not None and display_frame is not None:
-                video_writer.write(display_frame)
+            # Queue frame for the recording thread
+            if video_recorder is not None and display_frame is not None:
+                with profiler.span("record"):
+                    video_recorder.write(display_frame)
 
-            key = cv2.waitKey(1) & 0xFF
+            if headless:
+                key = 0xFF
+            else:
+                with profiler.span("display"):
+                    cv2.imshow('Motion Tetris', display_frame)
+                    key = cv2.waitKey(1) & 0xFF
+            latency_tracer.frame_shown(time.time())
             
-            if key == ord('q'):
+            if key == ord('q') or (headless and max_frames is not None and frame_id >= max_frames):
                 break
                 
-            if game_over:
+            if state.game_over:
                 if key == ord('r'):
-                    (
-                        tetris_board, score, lines_cleared_total, game_over,
-                        shape_keys, shape_index, current_shape_key, current_rotation,
-                        pos_x, pos_y, last_move_time, last_gesture_time, last_rotation_time, hard_drop_active
-                    ) = reset_game_state(tetris_shapes_data)
-                    if video_writer is not None:
-                        video_writer.release()
+                    start_new_game(state, sim_clock.sim_time)
+                    if session_log is not None:
+                        session_log.restart()
+                    input_queue.clear()
+                    if video_recorder is not None:
+                        video_recorder.close()  # Flushes queued frames before releasing
+                        print_recording_stats(video_recorder)
                         print(f"Video segment saved to {video_file_path}. New recording will start.")
-                        video_writer = None
+                        video_recorder = None
                 continue
             
-            # Keyboard input (only if not game over)
-            game_state_tuple = (pos_x, current_rotation, current_shape_key, shape_keys, shape_index, last_move_time, overlay_mode, pos_y, hard_drop_active, last_rotation_time)
-            new_pos_x, new_current_rotation, new_current_shape_key, new_shape_index, new_pos_y, new_overlay_mode, new_hard_drop_active, new_last_rotation_time = handle_input(
-                key, game_state_tuple, tetris_board, tetris_shapes_data, current_time
-            )
-              # Update game state based on input if changed
-            if pos_x != new_pos_x or current_rotation != new_current_rotation or \
-               current_shape_key != new_current_shape_key or shape_index != new_shape_index or \
-               pos_y != new_pos_y or overlay_mode != new_overlay_mode or hard_drop_active != new_hard_drop_active or \
-               last_rotation_time != new_last_rotation_time:
-
-                pos_x = new_pos_x
-                current_rotation = new_current_rotation
-                current_shape_key = new_current_shape_key
-                shape_index = new_shape_index
-                overlay_mode = new_overlay_mode
-                hard_drop_active = new_hard_drop_active
-                last_rotation_time = new_last_rotation_time
-                
-                # If soft drop (s key) was pressed, update pos_y and last_move_time
-                if key == ord('s') and pos_y != new_pos_y:
-                    pos_y = new_pos_y
-                    last_move_time = current_time
-                # If instant hard drop (spacebar) was pressed, update pos_y and force landing
-                elif key == ord(' ') and pos_y != new_pos_y:
-                    pos_y = new_pos_y
-                    last_move_time = current_time - move_delay  # Force immediate landing check
-
-            time.sleep(0.01)  # Small delay to prevent high CPU usage
+            # Keyboard input (only if not game over) is applied by the next tick
+            if key != 0xFF:
+                input_queue.push(time.time(), "key", key)
 
     except KeyboardInterrupt:
         print("\nProgram interrupted by user. Cleaning up...")
@@ -469,18 +373,47 @@ def main():
         print(f"An error occurred: {str(e)}")
         traceback.print_exc()
     finally:
+        if frame_capture is not None:
+            frame_capture.stop()
+            stats = frame_capture.get_stats()
+            print(f"Capture: {stats['captured']} captured, {stats['dropped']} dropped, "
+                  f"{stats['duplicated']} duplicated")
+        if inference_engine is not None:
+            inference_engine.stop()
+            print(f"Inference worker: {inference_engine.results_received} results, "
+                  f"{inference_engine.restarts} restarts")
+            print(f"Inference time: {format_inference_timings(inference_engine.inference_timings)}")
+        if hand_tracker is not None:
+            print(f"Inference time: {format_inference_timings(hand_tracker.timings)}")
+            if hand_tracker.motion_gate is not None:
+                gate_stats = hand_tracker.motion_gate.get_stats()
+                print(f"Motion gate: {gate_stats['processed']} processed, {gate_stats['skipped']} skipped")
         if webcam is not None:
             webcam.release()
-        if video_writer is not None:
-            video_writer.release()
+        if video_recorder is not None:
+            video_recorder.close()
+            print_recording_stats(video_recorder)
             print(f"Video saved to {video_file_path}")
-        cv2.destroyAllWindows()
+        if not headless:
+            cv2.destroyAllWindows()
         if fps_values:
             print(f"Final average FPS: {sum(fps_values) / len(fps_values):.1f}")
+        print(f"Simulation: {sim_clock.ticks} ticks, {sim_clock.dropped_ticks} dropped")
+        if session_log is not None:
+            session_log.close(state.score)
+            print(f"Session log saved to {session_log.path} ({session_log.records} records)")
+        print_latency_summary(latency_tracer)
+        if PROFILE_EXPORT_FILENAME:
+            profiler.export(os.path.join(VIDEO_OUTPUT_DIRECTORY, PROFILE_EXPORT_FILENAME))
         if pygame.mixer.get_init():
             pygame.mixer.music.stop()
             pygame.quit()
         print("Cleanup complete.")
 
 if __name__ == "__main__":
-    main()
+    # python main.py [--headless [frames]]
+    if "--headless" in sys.argv:
+        args = sys.argv[sys.argv.index("--headless") + 1:]
+        main(headless=True, max_frames=int(args[0]) if args else HEADLESS_FRAMES)
+    else:
+        main()
@@ -0,0 +1,240 @@
+"""
+Motion Tetris - Offline Session Renderer
+=======================================
+Turns a session log (session_log) into gameplay video after the fact, so
+the booth machine does not have to encode while people are playing:
+- The session is replayed once (replay.SessionReplay, far faster than
+  real time) and a GameState snapshot is taken for every output frame;
+  snapshots share board arrays, so this costs little memory
+- The frames are cut into contiguous segments that a process pool renders
+  and encodes in parallel, one segment file per task
+- Segment files are joined in order: stream copy with ffmpeg when it is
+  installed, otherwise decoded and re-encoded with cv2
+
+Boards are drawn with BoardRenderer, which is pixel-identical to
+draw_tetris_board + draw_tetris_shape.
+
+Usage:
+    python offline_render.py [session_log] [output_video] [workers]
+    python offline_render.py --scaling [session_log] [max_workers]
+"""
+
+import math
+import multiprocessing as mp
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import cv2
+from config import (
+    VIDEO_OUTPUT_DIRECTORY, VIDEO_FOURCC, SESSION_LOG_FILENAME,
+    OFFLINE_RENDER_FPS, OFFLINE_RENDER_SEGMENT_FRAMES, OFFLINE_RENDER_FILENAME
+)
+from hud import hud_layer
+from replay import SessionReplay
+from session_log import read_session_log
+from tetris_logic import create_tetris_shapes, perform_instant_hard_drop
+from video_processing import BoardRenderer, DisplayCompositor
+
+
+def collect_frames(session_log, fps=OFFLINE_RENDER_FPS):
+    """
+    Replay a session and snapshot the game state for every output frame.
+
+    Frame k shows the state after the last tick at or before k / fps
+    seconds into the session.
+    """
+    replay = SessionReplay(session_log)
+    ticks_per_frame = replay.log.settings['tick_rate'] / fps
+    frames = []
+    next_frame_tick = 0.0
+    for tick in replay.ticks():
+        while next_frame_tick <= tick:
+            frames.append(replay.state.snapshot())
+            next_frame_tick = len(frames) * ticks_per_frame
+    return frames
+
+
+def split_segments(frames, segment_frames=OFFLINE_RENDER_SEGMENT_FRAMES):
+    """Cut the frame list into contiguous (first_frame, frames) segments."""
+    return [(first, frames[first:first + segment_frames]) for first in range(0, len(frames), segment_frames)]
+
+
+def draw_frame_info(canvas, snapshot):
+    """Score, lines and game over text, as on the live display."""
+    hud_layer.draw_field(canvas, "score", f"Score: {snapshot.score}", (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+    hud_layer.draw_field(canvas, "lines", f"Lines: {snapshot.lines_cleared_total}", (10, 60), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+    if snapshot.game_over:
+        game_over = hud_layer.sprite("Game Over!", cv2.FONT_HERSHEY_SIMPLEX, 1.5, (0, 0, 255), 3, cv2.LINE_AA)
+        text_x = (canvas.shape[1] - game_over.text_size[0]) // 2
+        game_over.blit(canvas, (text_x, canvas.shape[0] // 2))
+
+
+def render_segment(task):
+    """
+    Pool task: render and encode one segment to its own video file.
+
+    Returns:
+        tuple: (segment path, frames written, seconds spent)
+    """
+    path, frames, fps, fourcc = task
+    start = time.perf_counter()
+    tetris_shapes_data = create_tetris_shapes()
+    renderer = BoardRenderer()
+    compositor = DisplayCompositor()
+    writer = None
+    for snapshot in frames:
+        if snapshot.game_over:
+            canvas = renderer.render(snapshot.board)
+        else:
+            shape = tetris_shapes_data[snapshot.current_shape_key]
+            ghost_y = perform_instant_hard_drop(snapshot.board, tetris_shapes_data, snapshot.current_shape_key,
+                                                snapshot.current_rotation, snapshot.pos_x, snapshot.pos_y,
+                                                snapshot.column_surface)
+            canvas = renderer.render(snapshot.board, shape, snapshot.current_rotation,
+                                     snapshot.pos_x, snapshot.pos_y, ghost_y)
+        frame = compositor.compose("board", canvas)  # The renderer's canvas must not be drawn on
+        draw_frame_info(frame, snapshot)
+        if writer is None:
+            writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*fourcc), fps, (frame.shape[1], frame.shape[0]))
+        writer.write(frame)
+    if writer is not None:
+        writer.release()
+    return path, len(frames), time.perf_counter() - start
+
+
+def join_segments(segment_paths, output_path, fps=OFFLINE_RENDER_FPS, fourcc=VIDEO_FOURCC):
+    """
+    Concatenate segment files in order.
+
+    Returns:
+        str: "ffmpeg" (stream copy) or "cv2" (decode and re-encode)
+    """
+    ffmpeg = shutil.which("ffmpeg")
+    if ffmpeg is not None:
+        list_path = output_path + ".segments.txt"
+        with open(list_path, 'w') as f:
+            for path in segment_paths:
+                f.write(f"file '{os.path.abspath(path)}'\n")
+        try:
+            subprocess.run([ffmpeg, "-y", "-loglevel", "error", "-f", "concat", "-safe", "0",
+                            "-i", list_path, "-c", "copy", output_path], check=True)
+            return "ffmpeg"
+        except subprocess.CalledProcessError as e:
+            print(f"Warning: ffmpeg concat failed ({e}), re-encoding with cv2")
+        finally:
+            os.remove(list_path)
+
+    writer = None
+    for path in segment_paths:
+        cap = cv2.VideoCapture(path)
+        while True:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            if writer is None:
+                writer = cv2.VideoWriter(output_path, cv2.VideoWriter_fourcc(*fourcc), fps,
+                                         (frame.shape[1], frame.shape[0]))
+            writer.write(frame)
+        cap.release()
+    if writer is not None:
+        writer.release()
+    return "cv2"
+
+
+def render_session(session_log, output_path, workers=None, fps=OFFLINE_RENDER_FPS,
+                   segment_frames=OFFLINE_RENDER_SEGMENT_FRAMES, fourcc=VIDEO_FOURCC, frames=None):
+    """
+    Render a session log to a video file with a pool of worker processes.
+    Pass frames from collect_frames to skip the replay; an output_path of
+    None renders the segments without joining them.
+
+    Returns:
+        dict: Frame count, worker count and per-phase timings (seconds)
+    """
+    workers = workers or os.cpu_count() or 1
+    stats = {'workers': workers, 'replay_time': None, 'join_method': None, 'join_time': None}
+
+    if frames is None:
+        start = time.perf_counter()
+        frames = collect_frames(session_log, fps)
+        stats['replay_time'] = time.perf_counter() - start
+    stats['frames'] = len(frames)
+
+    segment_dir = tempfile.mkdtemp(prefix="motion_tetris_segments_")
+    try:
+        tasks = [
+            (os.path.join(segment_dir, f"segment_{first:08d}.avi"), segment, fps, fourcc)
+            for first, segment in split_segments(frames, segment_frames)
+        ]
+        start = time.perf_counter()
+        with mp.get_context("spawn").Pool(workers) as pool:
+            results = pool.map(render_segment, tasks, chunksize=1)
+        stats['render_time'] = time.perf_counter() - start
+        stats['segments'] = len(results)
+        stats['worker_time'] = sum(elapsed for _, _, elapsed in results)
+
+        if output_path is not None:
+            start = time.perf_counter()
+            stats['join_method'] = join_segments([path for path, _, _ in results], output_path, fps, fourcc)
+            stats['join_time'] = time.perf_counter() - start
+    finally:
+        shutil.rmtree(segment_dir, ignore_errors=True)
+    return stats
+
+
+def print_render_stats(stats):
+    render_fps = stats['frames'] / max(stats['render_time'], 1e-9)
+    line = (f"{stats['workers']} worker(s): {stats['frames']} frames in {stats['segments']} segments, "
+            f"render+encode {stats['render_time']:.2f} s = {render_fps:.0f} fps "
+            f"({render_fps / stats['workers']:.0f} fps per worker)")
+    if stats['replay_time'] is not None:
+        line += f", replay {stats['replay_time'] * 1000:.0f} ms"
+    if stats['join_method'] is not None:
+        line += f", join ({stats['join_method']}) {stats['join_time']:.2f} s"
+    print(line)
+
+
+def scaling_report(session_log, max_workers=None):
+    """
+    Render the same session with 1, 2, 4, ... workers and compare
+    render+encode throughput (the join is serial and left out).
+    """
+    cores = os.cpu_count() or 1
+    max_workers = max_workers or cores
+    print(f"{cores} CPU core(s) available")
+    frames = collect_frames(session_log)
+    base_fps = None
+    counts = sorted({2 ** i for i in range(int(math.log2(max_workers)) + 1)} | {max_workers})
+    for workers in counts:
+        stats = render_session(session_log, None, workers, frames=frames)
+        print_render_stats(stats)
+        render_fps = stats['frames'] / stats['render_time']
+        base_fps = base_fps or render_fps
+        note = " (more workers than cores)" if workers > cores else ""
+        print(f"  speedup vs 1 worker: {render_fps / base_fps:.2f}x{note}")
+
+
+def main():
+    args = sys.argv[1:]
+    scaling = "--scaling" in args
+    args = [arg for arg in args if arg != "--scaling"]
+    log_path = args[0] if args else os.path.join(VIDEO_OUTPUT_DIRECTORY, SESSION_LOG_FILENAME)
+    session_log = read_session_log(log_path)
+
+    if scaling:
+        scaling_report(session_log, int(args[1]) if len(args) > 1 else None)
+        return
+
+    output_path = args[1] if len(args) > 1 else os.path.join(VIDEO_OUTPUT_DIRECTORY, OFFLINE_RENDER_FILENAME)
+    workers = int(args[2]) if len(args) > 2 else None
+    stats = render_session(session_log, output_path, workers)
+    print_render_stats(stats)
+    print(f"Video saved to {output_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""
+Motion Tetris - Asynchronous Recording Module
+============================================
+This module moves gameplay video encoding off the game loop:
+- A writer thread owns the cv2.VideoWriter and does all encoding
+- Frames are copied into a bounded pool of preallocated buffers
+- Backpressure policy decides what happens when the encoder falls behind:
+  "drop" skips frames, "block" waits for the encoder,
+  "decimate" keeps only every Nth frame while the queue is filling up
+- Queue depth and per-frame encode time are tracked for reporting
+- If the writer fails, recording stops but the queue keeps draining, so
+  write(), flush() and close() never hang the game loop
+"""
+
+import queue
+import threading
+import time
+
+import numpy as np
+from config import (
+    RECORDING_QUEUE_SIZE, RECORDING_BACKPRESSURE, RECORDING_DECIMATE_FACTOR, RECORDING_BLOCK_TIMEOUT
+)
+from video_processing import setup_video_writer
+
+BACKPRESSURE_POLICIES = ("drop", "block", "decimate")
+
+
+class AsyncVideoRecorder:
+    """Background video writer fed through a bounded frame queue."""
+
+    def __init__(self, writer, output_filename, queue_size=RECORDING_QUEUE_SIZE,
+                 policy=RECORDING_BACKPRESSURE, decimate_factor=RECORDING_DECIMATE_FACTOR,
+                 block_timeout=RECORDING_BLOCK_TIMEOUT):
+        if policy not in BACKPRESSURE_POLICIES:
+            raise ValueError(f"Unknown backpressure policy: {policy}")
+
+        self.output_filename = output_filename
+        self._writer = writer
+        self._queue_size = queue_size
+        self._policy = policy
+        self._decimate_factor = max(1, int(decimate_factor))
+        self._block_timeout = block_timeout
+
+        self._pending = queue.Queue()           # Filled buffers waiting for encode
+        self._free = queue.Queue()              # Preallocated empty buffers
+        self._frame_shape = None
+        self._offered = 0
+
+        # Statistics
+        self.frames_written = 0
+        self.frames_dropped = 0
+        self.frames_decimated = 0
+        self.max_queue_depth = 0
+        self.total_encode_time = 0.0
+        self.last_encode_time = 0.0
+        self.encode_histogram = None            # Optional instrumentation.SpanHistogram
+
+        self.error = None                       # Exception that stopped the writer, if any
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="AsyncVideoRecorder", daemon=True)
+        self._thread.start()
+
+    def _allocate(self, frame):
+        """Preallocate the frame pool to match the recorded frame format."""
+        self._frame_shape = frame.shape
+        for _ in range(self._queue_size):
+            self._free.put(np.empty_like(frame))
+
+    def _run(self):
+        """
+        Writer thread: encode queued frames until the stop sentinel arrives.
+
+        After a write error, frames are no longer encoded but buffers still
+        go back to the pool and the queue is still drained, so a blocked
+        write(), flush() and close() all return.
+        """
+        while True:
+            buffer = self._pending.get()
+            if buffer is None:
+                self._pending.task_done()
+                break
+            if self.error is None:
+                self._encode(buffer)
+            self._free.put(buffer)
+            self._pending.task_done()
+
+    def _encode(self, buffer):
+        """Write one frame and time it; a write error stops all further encoding."""
+        start_time = time.perf_counter()
+        try:
+            self._writer.write(buffer)
+        except Exception as error:
+            self.error = error
+            print(f"Error: Video recording stopped: {error}")
+            return
+        self.last_encode_time = time.perf_counter() - start_time
+        self.total_encode_time += self.last_encode_time
+        self.frames_written += 1
+        if self.encode_histogram is not None:
+            self.encode_histogram.add(self.last_encode_time)
+
+    def write(self, frame):
+        """
+        Queue a frame for encoding according to the backpressure policy.
+
+        Under the "block" policy, waits at most block_timeout seconds for a
+        free buffer before dropping the frame.
+
+        Returns:
+            bool: True if the frame was queued
+        """
+        if self._closed:
+            return False
+        if self.error is not None:
+            self.frames_dropped += 1
+            return False
+        if self._frame_shape is None:
+            self._allocate(frame)
+        if frame.shape != self._frame_shape:
+            self.frames_dropped += 1
+            return False
+
+        self._offered += 1
+        depth = self._pending.qsize()
+        if (self._policy == "decimate" and depth >= self._queue_size // 2 and
+                self._offered % self._decimate_factor != 0):
+            self.frames_decimated += 1
+            return False
+
+        try:
+            if self._policy == "block":
+                buffer = self._free.get(timeout=self._block_timeout)
+            else:
+                buffer = self._free.get(block=False)
+        except queue.Empty:
+            self.frames_dropped += 1
+            return False
+
+        np.copyto(buffer, frame)
+        self._pending.put(buffer)
+        self.max_queue_depth = max(self.max_queue_depth, depth + 1)
+        return True
+
+    def flush(self):
+        """Block until every queued frame has been encoded."""
+        self._pending.join()
+
+    def close(self):
+        """Flush pending frames, stop the writer thread and release the file."""
+        if self._closed:
+            return
+        self._closed = True
+        self._pending.put(None)
+        self._thread.join()
+        self._writer.release()
+
+    @property
+    def queue_depth(self):
+        """Number of frames waiting to be encoded."""
+        return self._pending.qsize()
+
+    def get_stats(self):
+        """Return recording counters as a dictionary."""
+        avg_encode_ms = (self.total_encode_time / self.frames_written * 1000.0
+                         if self.frames_written else 0.0)
+        return {
+            'written': self.frames_written,
+            'dropped': self.frames_dropped,
+            'decimated': self.frames_decimated,
+            'queue_depth': self.queue_depth,
+            'max_queue_depth': self.max_queue_depth,
+            'avg_encode_ms': avg_encode_ms,
+            'last_encode_ms': self.last_encode_time * 1000.0,
+            'failed': self.error is not None
+        }
+
+
+def start_async_recorder(output_filename, fourcc_str, fps, frame_size,
+                         policy=RECORDING_BACKPRESSURE):
+    """Open a VideoWriter and wrap it in an AsyncVideoRecorder. Returns None on failure."""
+    writer = setup_video_writer(output_filename, fourcc_str, fps, frame_size)
+    if writer is None:
+        return None
+    return AsyncVideoRecorder(writer, output_filename, policy=policy)
+
+
+def print_recording_stats(recorder):
+    """Print a one-line recording summary."""
+    stats = recorder.get_stats()
+    failed = " (stopped by a write error)" if stats['failed'] else ""
+    print(f"Recording: {stats['written']} written, {stats['dropped']} dropped, "
+          f"{stats['decimated']} decimated, max queue {stats['max_queue_depth']}, "
+          f"avg encode {stats['avg_encode_ms']:.2f} ms/frame{failed}")
@@ -0,0 +1,145 @@
+"""
+Motion Tetris - Session Replay
+=============================
+Re-runs the game logic of a logged session (session_log) faster than real
+time. The same GameState rules the live loop uses are applied at the
+logged tick indices, so every board matches the original session; lock
+records carry board checksums to check exactly that.
+
+Usage:
+    python replay.py [session_log_path]
+"""
+
+import os
+import sys
+import time
+
+from config import VIDEO_OUTPUT_DIRECTORY, SESSION_LOG_FILENAME
+from game_clock import FixedTimestep
+from game_state import GameState
+from session_log import (
+    read_session_log, board_checksum, GESTURE_CODES,
+    RECORD_GESTURE, RECORD_KEY, RECORD_SKIP, RECORD_RESTART, RECORD_LOCK, RECORD_END
+)
+from tetris_logic import create_tetris_shapes
+
+
+class SessionReplay:
+    """
+    Deterministic re-simulation of a session log.
+
+    ticks() yields after every simulated tick, with self.state holding the
+    game state at that point; locks collects (tick, board checksum) of
+    every piece locked during the replay.
+    """
+
+    def __init__(self, session_log):
+        if isinstance(session_log, str):
+            session_log = read_session_log(session_log)
+        self.log = session_log
+        settings = session_log.settings
+        self._clock = FixedTimestep(settings['tick_rate'], start_time=settings['start_time'])
+        self.tetris_shapes_data = create_tetris_shapes()
+        self.state = GameState(
+            settings['shape_keys'], self.tick_time(0),
+            move_delay=settings['move_delay'],
+            hard_drop_delay=settings['hard_drop_delay'],
+            rotation_delay=settings['rotation_delay'],
+            gesture_cooldown=settings['gesture_cooldown']
+        )
+        self.locks = []
+        self.ticks_run = 0
+        self.final_score = None                 # Score from the end record, if the log has one
+
+    def tick_time(self, tick_index):
+        return self._clock.tick_time(tick_index)
+
+    def _run_ticks(self, first_tick, stop_tick):
+        """Finish ticks first_tick..stop_tick-1 (their input events are already applied)."""
+        state = self.state
+        tetris_shapes_data = self.tetris_shapes_data
+        for tick in range(first_tick, stop_tick):
+            if not state.game_over:
+                if state.apply_gravity(self.tick_time(tick), tetris_shapes_data) is not None:
+                    self.locks.append((tick, board_checksum(state.board)))
+            self.ticks_run += 1
+            yield tick
+
+    def ticks(self):
+        """Replay the whole log, yielding each simulated tick index."""
+        state = self.state
+        next_tick = 1
+        for tick, kind, value in self.log.records.tolist():
+            if kind == RECORD_GESTURE or kind == RECORD_KEY:
+                # Input is applied at the start of its tick, before gravity
+                yield from self._run_ticks(next_tick, tick)
+                next_tick = tick
+                if kind == RECORD_GESTURE:
+                    state.apply_gesture(GESTURE_CODES[value], self.tick_time(tick), self.tetris_shapes_data)
+                else:
+                    state.apply_key(value, self.tick_time(tick), self.tetris_shapes_data)
+            elif kind == RECORD_SKIP:
+                yield from self._run_ticks(next_tick, tick)
+                next_tick = tick + value
+            elif kind == RECORD_RESTART:
+                yield from self._run_ticks(next_tick, tick + 1)
+                next_tick = tick + 1
+                state.reset(self.tick_time(tick))
+            elif kind == RECORD_END:
+                yield from self._run_ticks(next_tick, tick + 1)
+                next_tick = tick + 1
+                self.final_score = value
+            # RECORD_LOCK entries are only used by verify()
+
+    def run(self):
+        for _ in self.ticks():
+            pass
+        return self
+
+    def verify(self):
+        """
+        Compare the replay with the logged locks and final score.
+
+        Returns:
+            list: Mismatch descriptions, empty if the replay is identical
+        """
+        records = self.log.records
+        logged = records[records['kind'] == RECORD_LOCK]
+        logged_locks = list(zip(logged['tick'].tolist(), logged['value'].tolist()))
+        mismatches = []
+        for i, (expected, actual) in enumerate(zip(logged_locks, self.locks)):
+            if expected != actual:
+                mismatches.append(f"lock {i}: logged tick {expected[0]} crc {expected[1]:08x}, "
+                                  f"replayed tick {actual[0]} crc {actual[1]:08x}")
+                break
+        if len(logged_locks) != len(self.locks):
+            mismatches.append(f"{len(logged_locks)} locks logged, {len(self.locks)} replayed")
+        if self.final_score is not None and self.final_score != self.state.score:
+            mismatches.append(f"final score logged {self.final_score}, replayed {self.state.score}")
+        return mismatches
+
+
+def main():
+    path = sys.argv[1] if len(sys.argv) > 1 else os.path.join(VIDEO_OUTPUT_DIRECTORY, SESSION_LOG_FILENAME)
+    session_log = read_session_log(path)
+    print(f"{path}: {len(session_log.records)} records, recorded {session_log.settings.get('recorded_at')}")
+
+    start = time.perf_counter()
+    replay = SessionReplay(session_log).run()
+    elapsed = time.perf_counter() - start
+
+    game_seconds = replay.ticks_run / session_log.settings['tick_rate']
+    print(f"Replayed {replay.ticks_run} ticks ({game_seconds:.1f} s of play) in {elapsed * 1000:.1f} ms, "
+          f"{game_seconds / max(elapsed, 1e-9):.0f}x real time")
+    print(f"Pieces locked: {len(replay.locks)}, final score: {replay.state.score}")
+    mismatches = replay.verify()
+    if mismatches:
+        print("Replay differs from the session:")
+        for mismatch in mismatches:
+            print(f"  {mismatch}")
+        sys.exit(1)
+    print("Replay matches the logged session.")
+
+
+if __name__ == "__main__":
+    main()
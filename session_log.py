@@ -0,0 +1,144 @@
+"""
+Motion Tetris - Session Log Module
+=================================
+Compact binary log of a play session, enough to re-run its game logic
+exactly (see replay.py):
+- A header with the session settings: simulation start time and tick
+  rate, piece sequence and game timing constants
+- One fixed-size record per applied input event (gesture or key), tagged
+  with the simulation tick that applied it
+- Records for dropped ticks, restarts, piece locks (with a board checksum
+  for verification) and the end of the session
+
+File layout (little endian):
+    b"MTSL", uint16 version, uint32 n, n bytes of UTF-8 JSON settings
+    records of uint32 tick, uint8 kind, uint32 value (9 bytes each)
+
+Tick n happens at start_time + n / tick_rate (see game_clock), so tick
+indices fully determine the simulation times the logic saw. A session of
+steady play costs a few hundred bytes per second.
+"""
+
+import json
+import struct
+import time
+import zlib
+from collections import namedtuple
+
+import numpy as np
+from config import (
+    BOARD_WIDTH, BOARD_HEIGHT, DEFAULT_MOVE_DELAY, HARD_DROP_DELAY, ROTATION_DELAY, GESTURE_COOLDOWN
+)
+
+MAGIC = b"MTSL"
+VERSION = 1
+HEADER = struct.Struct('<4sHI')
+RECORD = struct.Struct('<IBI')
+RECORD_DTYPE = np.dtype([('tick', '<u4'), ('kind', 'u1'), ('value', '<u4')])
+
+# Record kinds
+RECORD_GESTURE = 0      # value: index in GESTURE_CODES
+RECORD_KEY = 1          # value: key code
+RECORD_SKIP = 2         # tick: first dropped tick, value: number of dropped ticks
+RECORD_RESTART = 3      # New game after this tick
+RECORD_LOCK = 4         # A piece locked during this tick, value: crc32 of the board
+RECORD_END = 5          # Last tick of the session, value: final score
+
+# Same order as gestures.GESTURE_NAMES (not imported, to keep replay free of MediaPipe)
+GESTURE_CODES = ("none", "hardDrop", "rotate", "left", "right")
+_GESTURE_INDEX = {name: code for code, name in enumerate(GESTURE_CODES)}
+
+# Settings and records of a session read from disk
+SessionLog = namedtuple('SessionLog', ['settings', 'records'])
+
+
+def board_checksum(board):
+    """CRC32 of a board's cells, as stored in lock records."""
+    return zlib.crc32(np.ascontiguousarray(board, dtype=np.uint8))
+
+
+class SessionLogWriter:
+    """
+    Appends a session's input events to a log file as they are applied.
+
+    Call begin_tick() at the start of every simulation tick (including
+    ticks during game over), then gesture()/key()/piece_locked() for what
+    happened in that tick.
+    """
+
+    def __init__(self, path, start_time, tick_rate, shape_keys, move_delay=DEFAULT_MOVE_DELAY,
+                 hard_drop_delay=HARD_DROP_DELAY, rotation_delay=ROTATION_DELAY, gesture_cooldown=GESTURE_COOLDOWN):
+        self.path = path
+        self.records = 0
+        self._tick = 0
+        settings = {
+            'start_time': start_time,
+            'tick_rate': tick_rate,
+            'shape_keys': list(shape_keys),
+            'move_delay': move_delay,
+            'hard_drop_delay': hard_drop_delay,
+            'rotation_delay': rotation_delay,
+            'gesture_cooldown': gesture_cooldown,
+            'board_width': BOARD_WIDTH,
+            'board_height': BOARD_HEIGHT,
+            'recorded_at': time.strftime('%Y-%m-%d %H:%M:%S')
+        }
+        encoded = json.dumps(settings).encode('utf-8')
+        self._file = open(path, 'wb')
+        self._file.write(HEADER.pack(MAGIC, VERSION, len(encoded)))
+        self._file.write(encoded)
+
+    def _write(self, tick, kind, value):
+        self._file.write(RECORD.pack(tick, kind, value))
+        self.records += 1
+
+    def begin_tick(self, tick_index):
+        """Start a tick; a gap since the previous one is logged as dropped ticks."""
+        if tick_index != self._tick + 1:
+            self._write(self._tick + 1, RECORD_SKIP, tick_index - self._tick - 1)
+        self._tick = tick_index
+
+    def gesture(self, gesture):
+        self._write(self._tick, RECORD_GESTURE, _GESTURE_INDEX[gesture])
+
+    def key(self, key):
+        self._write(self._tick, RECORD_KEY, key)
+
+    def piece_locked(self, board):
+        self._write(self._tick, RECORD_LOCK, board_checksum(board))
+
+    def restart(self):
+        """A new game starts after the current tick."""
+        self._write(self._tick, RECORD_RESTART, 0)
+
+    def close(self, score=0):
+        if self._file is not None:
+            self._write(self._tick, RECORD_END, score)
+            self._file.close()
+            self._file = None
+
+
+def read_session_log(path):
+    """
+    Read a session log.
+
+    Returns:
+        SessionLog: settings dict and a structured array of records
+        (fields tick, kind, value). A partially written trailing record,
+        e.g. from a crash, is ignored.
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    if len(data) < HEADER.size:
+        raise ValueError(f"{path}: not a session log")
+    magic, version, settings_size = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError(f"{path}: not a session log")
+    if version != VERSION:
+        raise ValueError(f"{path}: unsupported session log version {version}")
+
+    records_start = HEADER.size + settings_size
+    settings = json.loads(data[HEADER.size:records_start].decode('utf-8'))
+    count = (len(data) - records_start) // RECORD_DTYPE.itemsize
+    records = np.frombuffer(data, dtype=RECORD_DTYPE, count=count, offset=records_start)
+    return SessionLog(settings, records)
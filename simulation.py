@@ -0,0 +1,314 @@
+"""
+Motion Tetris - Headless Batched Simulation Module
+=================================================
+Runs the Tetris rules without camera, display or wall-clock timing, for
+soak tests and balancing:
+- N independent boards are stepped in lockstep on stacked NumPy arrays
+- Each board row is an integer bitmask, each piece rotation a table of
+  precomputed row masks for every x (built from tetris_logic.PIECE_TABLE)
+- Gravity, collision, locking, line clears, spawning and game-over resets
+  are all vectorized across boards
+- Action streams can be scripted (arrays or callables) or random
+
+Two stepping modes are available:
+- step(actions): one gravity tick with per-board actions (move/rotate/drop)
+- place(rotations, xs): drop every board's current piece at a chosen
+  rotation and column (the fast path for placement throughput; the path
+  from the spawn point is not checked)
+"""
+
+import numpy as np
+from config import BOARD_WIDTH, BOARD_HEIGHT
+from tetris_logic import PIECE_TABLE, SPAWN_X, SPAWN_Y, calculate_score
+
+# Actions for step()
+ACTION_NONE = 0
+ACTION_LEFT = 1
+ACTION_RIGHT = 2
+ACTION_ROTATE = 3
+ACTION_SOFT_DROP = 4
+ACTION_HARD_DROP = 5
+NUM_ACTIONS = 6
+
+PIECE_KEYS = tuple(PIECE_TABLE.keys())
+NUM_PIECES = len(PIECE_KEYS)
+
+_MIN_X = -2
+_MAX_X = BOARD_WIDTH - 2
+_NUM_X = _MAX_X - _MIN_X + 1
+_MAX_ROTATIONS = 4
+_FULL_ROW = (1 << BOARD_WIDTH) - 1
+_SCORE_TABLE = np.array([calculate_score(n) for n in range(5)], dtype=np.int64)
+
+
+def _build_mask_tables():
+    """
+    Precompute per (piece, rotation, x) row masks and legality.
+
+    Returns:
+        tuple: (masks int32 [P, R, X, 4], legal bool [P, R, X],
+                num_rotations int64 [P], color_index uint8 [P])
+    """
+    masks = np.zeros((NUM_PIECES, _MAX_ROTATIONS, _NUM_X, 4), dtype=np.int32)
+    legal = np.zeros((NUM_PIECES, _MAX_ROTATIONS, _NUM_X), dtype=bool)
+    num_rotations = np.zeros(NUM_PIECES, dtype=np.int64)
+    color_index = np.zeros(NUM_PIECES, dtype=np.uint8)
+
+    for p, key in enumerate(PIECE_KEYS):
+        piece = PIECE_TABLE[key]
+        num_rotations[p] = len(piece.rotations)
+        color_index[p] = piece.color_index
+        for r in range(_MAX_ROTATIONS):
+            rotation = piece.rotations[r % len(piece.rotations)]
+            min_x, max_x = rotation.x_range
+            for xi in range(_NUM_X):
+                piece_x = xi + _MIN_X
+                legal[p, r, xi] = min_x <= piece_x <= max_x
+                if not legal[p, r, xi]:
+                    continue
+                for row, col in rotation.cells:
+                    masks[p, r, xi, row] |= 1 << (piece_x + col)
+    return masks, legal, num_rotations, color_index
+
+
+PIECE_MASKS, PIECE_LEGAL_X, PIECE_NUM_ROTATIONS, PIECE_COLOR_INDEX = _build_mask_tables()
+
+
+class BatchedTetrisSimulator:
+    """
+    N independent Tetris boards stepped in lockstep.
+
+    Boards that top out are reset immediately and counted in games_played,
+    so a simulator can run indefinitely.
+    """
+
+    def __init__(self, num_boards, seed=0, piece_sequence="cycle"):
+        if piece_sequence not in ("cycle", "random"):
+            raise ValueError(f"Unknown piece sequence: {piece_sequence}")
+        self.num_boards = num_boards
+        self.piece_sequence = piece_sequence
+        self.rng = np.random.default_rng(seed)
+        self._index = np.arange(num_boards)
+
+        self.rows = np.zeros((num_boards, BOARD_HEIGHT), dtype=np.int32)
+        self.piece = np.zeros(num_boards, dtype=np.int64)
+        self.rotation = np.zeros(num_boards, dtype=np.int64)
+        self.pos_x = np.full(num_boards, SPAWN_X, dtype=np.int64)
+        self.pos_y = np.full(num_boards, SPAWN_Y, dtype=np.int64)
+
+        # Statistics
+        self.score = np.zeros(num_boards, dtype=np.int64)
+        self.lines_cleared = np.zeros(num_boards, dtype=np.int64)
+        self.pieces_placed = np.zeros(num_boards, dtype=np.int64)
+        self.games_played = np.zeros(num_boards, dtype=np.int64)
+        self.ticks = 0
+
+    # -------------------------------------------------------------------------
+    # Vectorized rules
+    # -------------------------------------------------------------------------
+
+    def _collides(self, boards, piece, rotation, pos_x, pos_y):
+        """Collision test for a subset of boards; True where the placement is invalid."""
+        xi = np.clip(pos_x - _MIN_X, 0, _NUM_X - 1)
+        legal = PIECE_LEGAL_X[piece, rotation, xi] & (pos_x >= _MIN_X) & (pos_x <= _MAX_X)
+        masks = PIECE_MASKS[piece, rotation, xi]                     # (n, 4)
+        board_rows = pos_y[:, np.newaxis] + np.arange(4)             # (n, 4)
+        in_range = (board_rows >= 0) & (board_rows < BOARD_HEIGHT)
+        current = self.rows[boards[:, np.newaxis], np.clip(board_rows, 0, BOARD_HEIGHT - 1)]
+        hit = (masks != 0) & (~in_range | ((current & masks) != 0))
+        return ~legal | hit.any(axis=1)
+
+    def _landing_y(self, boards):
+        """Lowest valid row for each board's current piece, dropping from pos_y."""
+        piece = self.piece[boards]
+        rotation = self.rotation[boards]
+        pos_x = self.pos_x[boards]
+        pos_y = self.pos_y[boards].copy()
+        falling = np.ones(len(boards), dtype=bool)
+        for _ in range(BOARD_HEIGHT):
+            if not falling.any():
+                break
+            blocked = self._collides(boards, piece, rotation, pos_x, pos_y + 1)
+            falling &= ~blocked
+            pos_y += falling
+        return pos_y
+
+    def _lock(self, boards):
+        """Lock current pieces, clear full rows and spawn the next pieces."""
+        if len(boards) == 0:
+            return
+        piece = self.piece[boards]
+        xi = self.pos_x[boards] - _MIN_X
+        masks = PIECE_MASKS[piece, self.rotation[boards], xi]        # (n, 4)
+        board_rows = self.pos_y[boards][:, np.newaxis] + np.arange(4)
+        valid = (masks != 0) & (board_rows >= 0) & (board_rows < BOARD_HEIGHT)
+        lock_boards = np.broadcast_to(boards[:, np.newaxis], masks.shape)[valid]
+        np.bitwise_or.at(self.rows, (lock_boards, board_rows[valid]), masks[valid])
+        self.pieces_placed[boards] += 1
+
+        self._clear_lines(boards)
+        self._spawn(boards)
+
+    def _clear_lines(self, boards):
+        """Remove full rows on the given boards, compacting survivors downward."""
+        rows = self.rows[boards]
+        full = rows == _FULL_ROW
+        counts = full.sum(axis=1)
+        has_clear = counts > 0
+        if not has_clear.any():
+            return
+
+        cleared_boards = boards[has_clear]
+        full = full[has_clear]
+        counts = counts[has_clear]
+
+        # Stable sort puts full rows first (in order), survivors after them
+        order = np.argsort(~full, axis=1, kind='stable')
+        compacted = np.take_along_axis(rows[has_clear], order, axis=1)
+        compacted[np.arange(BOARD_HEIGHT) < counts[:, np.newaxis]] = 0
+        self.rows[cleared_boards] = compacted
+
+        self.lines_cleared[cleared_boards] += counts
+        self.score[cleared_boards] += _SCORE_TABLE[np.minimum(counts, 4)]
+
+    def _spawn(self, boards):
+        """Spawn the next piece; boards whose spawn collides are reset."""
+        if self.piece_sequence == "cycle":
+            self.piece[boards] = (self.piece[boards] + 1) % NUM_PIECES
+        else:
+            self.piece[boards] = self.rng.integers(0, NUM_PIECES, len(boards))
+        self.rotation[boards] = 0
+        self.pos_x[boards] = SPAWN_X
+        self.pos_y[boards] = SPAWN_Y
+
+        topped_out = self._collides(boards, self.piece[boards], self.rotation[boards],
+                                    self.pos_x[boards], self.pos_y[boards])
+        if topped_out.any():
+            self.reset_boards(boards[topped_out])
+
+    def reset_boards(self, boards):
+        """Start a new game on the given boards."""
+        self.rows[boards] = 0
+        self.games_played[boards] += 1
+        self.score[boards] = 0
+
+    # -------------------------------------------------------------------------
+    # Stepping
+    # -------------------------------------------------------------------------
+
+    def step(self, actions):
+        """
+        Advance every board by one gravity tick.
+
+        Args:
+            actions: int array (num_boards,) of ACTION_* codes applied
+                before gravity
+        """
+        boards = self._index
+        actions = np.asarray(actions)
+
+        # Horizontal moves and rotation
+        next_x = self.pos_x + (actions == ACTION_RIGHT) - (actions == ACTION_LEFT)
+        rotating = actions == ACTION_ROTATE
+        next_rotation = np.where(rotating,
+                                 (self.rotation + 1) % PIECE_NUM_ROTATIONS[self.piece],
+                                 self.rotation)
+        moving = (next_x != self.pos_x) | rotating
+        if moving.any():
+            moved = boards[moving]
+            ok = ~self._collides(moved, self.piece[moved], next_rotation[moved],
+                                 next_x[moved], self.pos_y[moved])
+            self.pos_x[moved[ok]] = next_x[moved[ok]]
+            self.rotation[moved[ok]] = next_rotation[moved[ok]]
+
+        # Hard drop goes straight to the landing row and locks this tick
+        dropping = actions == ACTION_HARD_DROP
+        if dropping.any():
+            dropped = boards[dropping]
+            self.pos_y[dropped] = self._landing_y(dropped)
+
+        # Gravity (soft drop is an extra row of gravity)
+        extra = boards[actions == ACTION_SOFT_DROP]
+        if len(extra):
+            can_fall = ~self._collides(extra, self.piece[extra], self.rotation[extra],
+                                       self.pos_x[extra], self.pos_y[extra] + 1)
+            self.pos_y[extra[can_fall]] += 1
+
+        can_fall = ~self._collides(boards, self.piece, self.rotation, self.pos_x, self.pos_y + 1)
+        self.pos_y[can_fall] += 1
+        self._lock(boards[~can_fall])
+        self.ticks += 1
+
+    def place(self, rotations, xs):
+        """
+        Drop every board's current piece at the given rotation and column.
+
+        Rotations wrap by the piece's rotation count; columns are clamped
+        to the legal range for that rotation. A placement that collides at
+        the spawn row tops the board out.
+        """
+        boards = self._index
+        self.rotation[:] = np.asarray(rotations) % PIECE_NUM_ROTATIONS[self.piece]
+        xs = np.asarray(xs)
+
+        # Clamp to the nearest legal x for this piece rotation
+        legal = PIECE_LEGAL_X[self.piece, self.rotation]                # (n, X)
+        first = legal.argmax(axis=1) + _MIN_X
+        last = _NUM_X - 1 - legal[:, ::-1].argmax(axis=1) + _MIN_X
+        self.pos_x[:] = np.clip(xs, first, last)
+        self.pos_y[:] = SPAWN_Y
+
+        blocked = self._collides(boards, self.piece, self.rotation, self.pos_x, self.pos_y)
+        if blocked.any():
+            self.reset_boards(boards[blocked])
+            self._spawn(boards[blocked])
+
+        placing = boards[~blocked]
+        self.pos_y[placing] = self._landing_y(placing)
+        self._lock(placing)
+        self.ticks += 1
+
+    def run(self, action_source, num_steps):
+        """
+        Run a scripted or random action stream through step().
+
+        Args:
+            action_source: (num_steps, num_boards) array of actions, a
+                callable(step_index, simulator) returning actions, or
+                "random" for uniformly random actions
+            num_steps: Number of ticks to run
+        """
+        for step_index in range(num_steps):
+            if isinstance(action_source, str) and action_source == "random":
+                actions = self.rng.integers(0, NUM_ACTIONS, self.num_boards)
+            elif callable(action_source):
+                actions = action_source(step_index, self)
+            else:
+                actions = action_source[step_index]
+            self.step(actions)
+
+    def run_random_placements(self, num_batches):
+        """Place num_batches pieces on every board at random rotations and columns."""
+        for _ in range(num_batches):
+            rotations = self.rng.integers(0, _MAX_ROTATIONS, self.num_boards)
+            xs = self.rng.integers(_MIN_X, _MAX_X + 1, self.num_boards)
+            self.place(rotations, xs)
+
+    # -------------------------------------------------------------------------
+    # Inspection
+    # -------------------------------------------------------------------------
+
+    def occupancy(self, board):
+        """Return one board as a (BOARD_HEIGHT, BOARD_WIDTH) bool array."""
+        bits = 1 << np.arange(BOARD_WIDTH)
+        return (self.rows[board][:, np.newaxis] & bits) != 0
+
+    def get_stats(self):
+        """Aggregate counters across all boards."""
+        return {
+            'boards': self.num_boards,
+            'ticks': self.ticks,
+            'pieces_placed': int(self.pieces_placed.sum()),
+            'lines_cleared': int(self.lines_cleared.sum()),
+            'games_played': int(self.games_played.sum())
+        }
@@ -8,12 +8,38 @@ Core Tetris game mechanics including:
 - Tetromino shapes and rotations
 """
 
+from collections import namedtuple
+from types import MappingProxyType
+
 import numpy as np
 from config import BOARD_WIDTH, BOARD_HEIGHT
 
+# =============================================================================
+# PRECOMPILED PIECE TABLE
+# =============================================================================
+
+# One rotation of a piece, precomputed from its 4x4 array:
+# - cells: occupied (row, col) offsets inside the 4x4 box
+# - cell_rows/cell_cols: the same offsets as read-only int arrays
+# - bbox: (min_row, min_col, max_row, max_col) of the occupied cells
+# - x_range: (min_x, max_x) piece_x values that keep every cell on the board
+# - bottom_profile: lowest occupied row per box column, -1 if the column is empty
+# - color_index: uint8 cell value written to the board
+PieceRotation = namedtuple('PieceRotation', [
+    'cells', 'cell_rows', 'cell_cols', 'bbox', 'x_range', 'bottom_profile', 'color_index'
+])
+
+# One piece type: its rotations plus spawn position
+PieceShape = namedtuple('PieceShape', [
+    'key', 'color', 'color_index', 'rotations', 'spawn_x', 'spawn_y'
+])
+
+SPAWN_X = BOARD_WIDTH // 2 - 2
+SPAWN_Y = 0
+
 def create_tetris_board():
-    """Create an empty Tetris board."""
-    return np.zeros((BOARD_HEIGHT, BOARD_WIDTH), dtype=int)
+    """Create an empty Tetris board (one uint8 color index per cell)."""
+    return np.zeros((BOARD_HEIGHT, BOARD_WIDTH), dtype=np.uint8)
 
 def is_valid_position(board, shape_details, rotation_idx, piece_x, piece_y):
     """
@@ -28,62 +54,167 @@ def is_valid_position(board, shape_details, rotation_idx, piece_x, piece_y):
     Returns:
         bool: True if position is valid
     """
-    shape_array = shape_details['shape'][rotation_idx]
+    rotation = get_piece_rotation(shape_details, rotation_idx)
     
     # Quick boundary check first
-    if (piece_x < -2 or 
-        piece_x > BOARD_WIDTH - 2 or
+    min_x, max_x = rotation.x_range
+    if (piece_x < min_x or 
+        piece_x > max_x or
         piece_y > BOARD_HEIGHT - 2):
         return False
 
-    # Check each cell of the piece
-    for r, c in np.ndindex(4, 4):
-        if shape_array[r][c] != 0:
-            board_r = piece_y + r
-            board_c = piece_x + c
+    # Check each occupied cell of the piece
+    for r, c in rotation.cells:
+        board_r = piece_y + r
+        
+        # Check board boundaries
+        if not 0 <= board_r < BOARD_HEIGHT:
+            return False
             
-            # Check board boundaries
-            if not (0 <= board_c < BOARD_WIDTH and 
-                   0 <= board_r < BOARD_HEIGHT):
-                return False
-                
-            # Check collision with placed pieces
-            if board[board_r][board_c] != 0:
-                return False
+        # Check collision with placed pieces
+        if board[board_r, piece_x + c] != 0:
+            return False
     
     return True
 
-def add_piece_to_board(board, shape_details, rotation_idx, piece_x, piece_y):
-    """Add landed piece to the board."""
-    shape_array = shape_details['shape'][rotation_idx]
+def add_piece_to_board(board, shape_details, rotation_idx, piece_x, piece_y, column_surface=None):
+    """
+    Add landed piece to the board.
+    If a column surface array is given it is updated in place.
+    
+    Returns:
+        tuple: Board rows touched by the piece, top to bottom
+    """
+    rotation = get_piece_rotation(shape_details, rotation_idx)
+    touched_rows = []
+    
+    # Add only occupied cells
+    for r, c in rotation.cells:
+        board_r = piece_y + r
+        board_c = piece_x + c
+        if (0 <= board_r < BOARD_HEIGHT and 
+            0 <= board_c < BOARD_WIDTH):
+            board[board_r, board_c] = rotation.color_index
+            if column_surface is not None and board_r < column_surface[board_c]:
+                column_surface[board_c] = board_r
+            if board_r not in touched_rows:
+                touched_rows.append(board_r)
+
+    touched_rows.sort()
+    return tuple(touched_rows)
+
+def clear_touched_rows(board, touched_rows, column_surface=None):
+    """
+    Clear the full rows among those touched by the last locked piece.
+    
+    Only the given rows are checked. Surviving rows are compacted in a
+    single move and the vacated top rows are zeroed. If a column surface
+    array is given it is updated in place.
     
-    # Add only non-empty cells
-    for r, c in np.ndindex(4, 4):
-        if shape_array[r][c] != 0:
-            board_r = piece_y + r
-            board_c = piece_x + c
-            if (0 <= board_r < BOARD_HEIGHT and 
-                0 <= board_c < BOARD_WIDTH):
-                board[board_r][board_c] = shape_array[r][c]
+    Returns:
+        tuple: Cleared row indices (pre-clear numbering), top to bottom
+    """
+    cleared_rows = tuple(r for r in touched_rows if board[r].all())
+    if not cleared_rows:
+        return cleared_rows
 
-def clear_full_rows(board):
+    lines_cleared = len(cleared_rows)
+    keep = np.ones(BOARD_HEIGHT, dtype=bool)
+    keep[list(cleared_rows)] = False
+    board[lines_cleared:] = board[keep]
+    board[:lines_cleared] = 0
+
+    if column_surface is not None:
+        update_column_surface_after_clear(board, column_surface, cleared_rows[0], lines_cleared)
+    return cleared_rows
+
+def clear_full_rows(board, column_surface=None):
     """
     Clear completed rows and return count.
-    Uses efficient numpy operations.
+    Checks every row; use clear_touched_rows when the locked piece is known.
+    If a column surface array is given it is updated in place.
+    """
+    return len(clear_touched_rows(board, range(BOARD_HEIGHT), column_surface))
+
+# =============================================================================
+# COLUMN SURFACE (INCREMENTAL HEIGHT MAP)
+# =============================================================================
+
+def create_column_surface(board):
+    """
+    Build the per-column surface array for a board.
+    
+    Entry c is the row index of the highest occupied cell in column c,
+    or BOARD_HEIGHT if the column is empty.
+    """
+    occupied = board != 0
+    return np.where(occupied.any(axis=0), occupied.argmax(axis=0), BOARD_HEIGHT)
+
+def update_column_surface_after_clear(board, column_surface, top_cleared_row, lines_cleared):
     """
-    lines_cleared = 0
-    row = BOARD_HEIGHT - 1
+    Update the column surface after rows were cleared.
     
-    while row >= 0:
-        if np.all(board[row] != 0):  # Row is full
-            lines_cleared += 1
-            # Shift rows down
-            board[1:row + 1] = board[0:row]
-            board[0] = 0
+    Every full row lies at or below each column's surface. Columns whose
+    surface was above the topmost cleared row simply sink by the number of
+    cleared rows; only columns topped by a cleared row are rescanned.
+    """
+    for c in range(BOARD_WIDTH):
+        if column_surface[c] < top_cleared_row:
+            column_surface[c] += lines_cleared
         else:
-            row -= 1
-            
-    return lines_cleared
+            occupied = np.flatnonzero(board[:, c])
+            column_surface[c] = occupied[0] if len(occupied) else BOARD_HEIGHT
+
+def drop_distance(column_surface, shape_details, rotation_idx, piece_x, piece_y):
+    """
+    Rows the piece can fall before landing, from the column surface alone.
+    
+    Returns:
+        int or None: Drop distance, or None if the piece sits below the
+        surface of a column it covers (e.g. tucked under an overhang), in
+        which case callers should fall back to is_valid_position.
+    """
+    rotation = get_piece_rotation(shape_details, rotation_idx)
+    distance = BOARD_HEIGHT
+    for j, bottom in enumerate(rotation.bottom_profile):
+        if bottom < 0:
+            continue
+        gap = column_surface[piece_x + j] - 1 - (piece_y + bottom)
+        if gap < 0:
+            return None
+        if gap < distance:
+            distance = gap
+    return int(distance)
+
+def perform_instant_hard_drop(tetris_board, tetris_shapes_data, current_shape_key, current_rotation, pos_x, pos_y,
+                              column_surface=None):
+    """
+    Drop the piece all the way down instantly until it collides with something.
+    
+    Args:
+        tetris_board: Current Tetris board state
+        tetris_shapes_data: Dictionary containing Tetris piece shapes
+        current_shape_key: Current piece type
+        current_rotation: Current piece rotation
+        pos_x: Current X position
+        pos_y: Current Y position
+        column_surface: Optional column surface array for an O(width) drop
+        
+    Returns:
+        int: Final Y position after hard drop
+    """
+    if column_surface is not None:
+        distance = drop_distance(column_surface, tetris_shapes_data[current_shape_key], current_rotation, pos_x, pos_y)
+        if distance is not None:
+            return pos_y + distance
+
+    drop_y = pos_y
+    
+    # Keep dropping until collision
+    while is_valid_position(tetris_board, tetris_shapes_data[current_shape_key], current_rotation, pos_x, drop_y + 1):
+        drop_y += 1
+    
+    return drop_y
 
 def calculate_score(lines_cleared):
     """Calculate score for cleared lines."""
@@ -95,9 +226,63 @@ def calculate_score(lines_cleared):
     }
     return score_map.get(lines_cleared, 0)
 
+def _compile_rotation(shape_array):
+    """Precompute the PieceRotation entry for one 4x4 shape array."""
+    rows, cols = np.nonzero(shape_array)
+    cell_rows = rows.astype(np.intp)
+    cell_cols = cols.astype(np.intp)
+    cell_rows.setflags(write=False)
+    cell_cols.setflags(write=False)
+
+    bottom_profile = tuple(
+        int(rows[cols == c].max()) if np.any(cols == c) else -1
+        for c in range(4)
+    )
+    min_col, max_col = int(cols.min()), int(cols.max())
+    return PieceRotation(
+        cells=tuple((int(r), int(c)) for r, c in zip(rows, cols)),
+        cell_rows=cell_rows,
+        cell_cols=cell_cols,
+        bbox=(int(rows.min()), min_col, int(rows.max()), max_col),
+        x_range=(-min_col, BOARD_WIDTH - 1 - max_col),
+        bottom_profile=bottom_profile,
+        color_index=np.uint8(shape_array[rows[0], cols[0]])
+    )
+
+def compile_piece(key, shape_details):
+    """Compile a shape dictionary into a frozen PieceShape table entry."""
+    rotations = tuple(_compile_rotation(array) for array in shape_details['shape'])
+    return PieceShape(
+        key=key,
+        color=shape_details['color'],
+        color_index=rotations[0].color_index,
+        rotations=rotations,
+        spawn_x=SPAWN_X,
+        spawn_y=SPAWN_Y
+    )
+
+def get_piece_rotation(shape_details, rotation_idx):
+    """Return the precompiled PieceRotation for a shape dictionary."""
+    piece = shape_details.get('piece')
+    if piece is None:
+        piece = compile_piece(None, shape_details)
+        shape_details['piece'] = piece
+    return piece.rotations[rotation_idx]
+
 def create_tetris_shapes():
     """
     Create Tetris shapes with rotations.
+    Each shape dictionary also carries its precompiled PIECE_TABLE entry
+    under 'piece'.
+    """
+    shapes = _create_shape_arrays()
+    for key, shape_details in shapes.items():
+        shape_details['piece'] = PIECE_TABLE[key]
+    return shapes
+
+def _create_shape_arrays():
+    """
+    Create Tetris shape arrays with rotations.
     Using numpy arrays for better memory layout.
     """
     # I-Shape (Cyan)
@@ -214,3 +399,9 @@ def create_tetris_shapes():
         'T': {'shape': T_SHAPE, 'color': (128, 0, 128)},    # Purple
         'Z': {'shape': Z_SHAPE, 'color': (0, 0, 255)}       # Red
     }
+
+# Built once at import: shape key -> PieceShape
+PIECE_TABLE = MappingProxyType({
+    key: compile_piece(key, shape_details)
+    for key, shape_details in _create_shape_arrays().items()
+})
@@ -14,13 +14,18 @@ from config import (
     BOARD_WIDTH, BOARD_HEIGHT, CELL_SIZE, SHAPE_COLORS,
     VIDEO_FOURCC, OUTPUT_VIDEO_FILENAME, OVERLAY_ALPHA
 )
+from tetris_logic import get_piece_rotation
 
-def read_frame(cap):
-    """Read and flip a frame from the webcam."""
+def read_frame(cap, out=None):
+    """
+    Read and flip a frame from the webcam or any frame source.
+    With out (a buffer of the frame's shape) the flipped frame is written
+    there instead of a new array.
+    """
     ret, frame = cap.read()
     if not ret:
         return None
-    return cv2.flip(frame, 1)  # Horizontal flip for mirror effect
+    return cv2.flip(frame, 1, dst=out)  # Horizontal flip for mirror effect
 
 def setup_webcam(device_id=0, width=640, height=480):
     """Set up webcam with specified dimensions."""
@@ -54,11 +59,11 @@ def setup_video_writer(output_filename, fourcc_str, fps, frame_size):
     print(f"Recording to {output_filename}")
     return writer
 
-def draw_tetris_board(game_board):
+def draw_tetris_board(game_board, cell_size=CELL_SIZE):
     """Draw the Tetris board with pieces and grid."""
     # Create dark gray canvas
-    board_height = BOARD_HEIGHT * CELL_SIZE
-    board_width = BOARD_WIDTH * CELL_SIZE
+    board_height = BOARD_HEIGHT * cell_size
+    board_width = BOARD_WIDTH * cell_size
     canvas = np.zeros((board_height, board_width, 3), dtype=np.uint8)
     canvas[:] = (30, 30, 30)  # Dark gray background
 
@@ -68,8 +73,8 @@ def draw_tetris_board(game_board):
             cell_value = game_board[r][c]
             if cell_value != 0:
                 color = SHAPE_COLORS.get(cell_value, (128, 128, 128))
-                x1, y1 = c * CELL_SIZE, r * CELL_SIZE
-                x2, y2 = x1 + CELL_SIZE, y1 + CELL_SIZE
+                x1, y1 = c * cell_size, r * cell_size
+                x2, y2 = x1 + cell_size, y1 + cell_size
                 
                 # Draw filled rectangle with border
                 cv2.rectangle(canvas, (x1, y1), (x2, y2), color, -1)
@@ -77,11 +82,11 @@ def draw_tetris_board(game_board):
 
     # Draw grid
     for i in range(BOARD_HEIGHT + 1):
-        y = i * CELL_SIZE
+        y = i * cell_size
         cv2.line(canvas, (0, y), (board_width, y), (50, 50, 50), 1)
     
     for j in range(BOARD_WIDTH + 1):
-        x = j * CELL_SIZE
+        x = j * cell_size
         cv2.line(canvas, (x, 0), (x, board_height), (50, 50, 50), 1)
 
     # Draw border
@@ -90,23 +95,250 @@ def draw_tetris_board(game_board):
                  (100, 100, 100), 2)
     return canvas
 
-def draw_tetris_shape(board_canvas, shape, rotation_idx, pos_x, pos_y):
+def draw_tetris_shape(board_canvas, shape, rotation_idx, pos_x, pos_y, cell_size=CELL_SIZE):
     """Draw a Tetris shape on the board canvas."""
-    shape_array = shape['shape'][rotation_idx]
+    rotation = get_piece_rotation(shape, rotation_idx)
     color = shape['color']
 
-    # Draw each cell
-    for i in range(4):
-        for j in range(4):
-            if shape_array[i][j] != 0:
-                x1 = (pos_x + j) * CELL_SIZE
-                y1 = (pos_y + i) * CELL_SIZE
-                x2 = x1 + CELL_SIZE
-                y2 = y1 + CELL_SIZE
-                
-                # Draw filled shape cell with border
-                cv2.rectangle(board_canvas, (x1, y1), (x2, y2), color, -1)
-                cv2.rectangle(board_canvas, (x1, y1), (x2, y2), (180, 180, 180), 1)
+    # Draw each occupied cell
+    for i, j in rotation.cells:
+        x1 = (pos_x + j) * cell_size
+        y1 = (pos_y + i) * cell_size
+        x2 = x1 + cell_size
+        y2 = y1 + cell_size
+        
+        # Draw filled shape cell with border
+        cv2.rectangle(board_canvas, (x1, y1), (x2, y2), color, -1)
+        cv2.rectangle(board_canvas, (x1, y1), (x2, y2), (180, 180, 180), 1)
+
+class BoardRasterizer:
+    """
+    Vectorized board rasterizer.
+    
+    Turns the integer board, with the active piece composited on, into the
+    pixel canvas with whole-array NumPy operations instead of one
+    cv2.rectangle call per cell. Colors come from a palette lookup table
+    built from SHAPE_COLORS and cell geometry from a prebuilt tile, so any
+    cell size works.
+    Output is pixel-identical to draw_tetris_board + draw_tetris_shape.
+    """
+
+    def __init__(self, cell_size=CELL_SIZE):
+        self.cell_size = cell_size
+        board_height = BOARD_HEIGHT * cell_size
+        board_width = BOARD_WIDTH * cell_size
+
+        # Palette LUT indexed by cell value
+        self.palette = np.array(
+            [SHAPE_COLORS.get(value, (128, 128, 128)) for value in range(256)],
+            dtype=np.uint8
+        )
+        self._outline_color = np.array((180, 180, 180), dtype=np.uint8)
+
+        # Empty board: background, grid and border
+        self.background = draw_tetris_board(
+            np.zeros((BOARD_HEIGHT, BOARD_WIDTH), dtype=int), cell_size
+        )
+
+        # Interior pixel rows of the empty board: background color inside
+        # cells, grid color on the vertical lines
+        mid_y = (BOARD_HEIGHT // 2) * cell_size + cell_size // 2
+        mid_x = (BOARD_WIDTH // 2) * cell_size + cell_size // 2
+        self.palette[0] = self.background[mid_y, mid_x]
+        self._line_colors = self.background[mid_y, ::cell_size].copy()
+        self._row_pixels = np.empty((BOARD_HEIGHT, board_width, 3), dtype=np.uint8)
+
+        # Border pixels are drawn after locked cells and stay on top of them
+        border = np.zeros((board_height, board_width), dtype=np.uint8)
+        cv2.rectangle(border, (0, 0), (board_width - 1, board_height - 1), 255, 2)
+        self._border_ys, self._border_xs = np.nonzero(border)
+        self._border_pixels = self.background[self._border_ys, self._border_xs]
+
+        # Cell tile outline: the closed rectangle perimeter drawn around
+        # every falling-piece cell (it overlaps the neighbouring grid lines)
+        span = np.arange(cell_size + 1)
+        top = np.zeros_like(span)
+        bottom = np.full_like(span, cell_size)
+        self._outline_dy = np.concatenate([top, bottom, span, span])
+        self._outline_dx = np.concatenate([span, span, top, bottom])
+
+    def _cell_view(self, out):
+        """View the canvas as (row, y-in-cell, column, x-in-cell, channel)."""
+        cell_size = self.cell_size
+        return out.reshape(BOARD_HEIGHT, cell_size, BOARD_WIDTH, cell_size, 3)
+
+    def draw_piece(self, out, shape, rotation_idx, pos_x, pos_y):
+        """
+        Rasterize the falling piece onto a canvas, like draw_tetris_shape.
+        Fractional positions (render interpolation) are drawn at pixel offsets.
+        """
+        rotation = get_piece_rotation(shape, rotation_idx)
+        color = self.palette[rotation.color_index]
+        if pos_x != int(pos_x) or pos_y != int(pos_y):
+            self._draw_piece_pixels(out, rotation, color,
+                                    int(round(pos_y * self.cell_size)),
+                                    int(round(pos_x * self.cell_size)))
+            return
+
+        rows = rotation.cell_rows + int(pos_y)
+        cols = rotation.cell_cols + int(pos_x)
+
+        # Cell interiors (only cells on the board have visible interiors)
+        inside = (rows >= 0) & (rows < BOARD_HEIGHT) & (cols >= 0) & (cols < BOARD_WIDTH)
+        self._cell_view(out)[rows[inside], 1:, cols[inside], 1:] = color
+
+        self._draw_outlines(out, rows * self.cell_size, cols * self.cell_size, self._outline_color)
+
+    def _draw_piece_pixels(self, out, rotation, color, origin_y, origin_x):
+        """Draw piece cells whose top-left corners are at arbitrary pixel positions."""
+        cell_size = self.cell_size
+        ys = rotation.cell_rows * cell_size + origin_y
+        xs = rotation.cell_cols * cell_size + origin_x
+        height, width = out.shape[:2]
+        for y, x in zip(ys, xs):
+            y0, y1 = max(y + 1, 0), min(y + cell_size, height)
+            x0, x1 = max(x + 1, 0), min(x + cell_size, width)
+            if y0 < y1 and x0 < x1:
+                out[y0:y1, x0:x1] = color
+        self._draw_outlines(out, ys, xs, self._outline_color)
+
+    def draw_ghost(self, out, shape, rotation_idx, pos_x, pos_y):
+        """Draw the landing preview of a piece as cell outlines in its color."""
+        rotation = get_piece_rotation(shape, rotation_idx)
+        cell_size = self.cell_size
+        self._draw_outlines(out, rotation.cell_rows * cell_size + int(round(pos_y * cell_size)),
+                            rotation.cell_cols * cell_size + int(round(pos_x * cell_size)),
+                            self.palette[rotation.color_index])
+
+    def _draw_outlines(self, out, cell_ys, cell_xs, color):
+        """Draw closed cell rectangles with the given top-left pixels, clipped to the canvas."""
+        ys = cell_ys[:, np.newaxis] + self._outline_dy
+        xs = cell_xs[:, np.newaxis] + self._outline_dx
+        visible = (ys >= 0) & (ys < out.shape[0]) & (xs >= 0) & (xs < out.shape[1])
+        out[ys[visible], xs[visible]] = color
+
+    def render_rows(self, game_board, first_row, last_row, out):
+        """
+        Re-rasterize the locked cells of board rows first_row..last_row
+        (inclusive) into a canvas, leaving the other rows untouched.
+        """
+        cell_size = self.cell_size
+        y_start, y_end = first_row * cell_size, (last_row + 1) * cell_size
+        np.copyto(out[y_start:y_end], self.background[y_start:y_end])
+
+        # Locked cells: grid lines are drawn over their outlines, so only
+        # the interiors show. Expand the palette lookup into one pixel row
+        # per board row and replicate it over the cell's interior rows.
+        band = game_board[first_row:last_row + 1]
+        if band.any():
+            num_rows = last_row - first_row + 1
+            row_pixels = self._row_pixels[:num_rows]
+            row_pixels.reshape(num_rows, BOARD_WIDTH, cell_size, 3)[:] = \
+                self.palette[band][:, :, np.newaxis, :]
+            row_pixels[:, ::cell_size] = self._line_colors
+            rows_view = out[y_start:y_end].reshape(num_rows, cell_size, -1, 3)
+            rows_view[:, 1:] = row_pixels[:, np.newaxis]
+            out[self._border_ys, self._border_xs] = self._border_pixels
+
+    def render(self, game_board, shape=None, rotation_idx=0, pos_x=0, pos_y=0, out=None):
+        """
+        Rasterize the board and optional falling piece.
+        
+        Args:
+            game_board: Integer board array
+            shape: Shape dictionary of the falling piece, or None
+            rotation_idx, pos_x, pos_y: Falling piece placement
+            out: Optional preallocated canvas to render into
+            
+        Returns:
+            numpy.ndarray: Rendered BGR canvas
+        """
+        if out is None:
+            out = np.empty_like(self.background)
+        self.render_rows(game_board, 0, BOARD_HEIGHT - 1, out)
+
+        if shape is not None:
+            self.draw_piece(out, shape, rotation_idx, pos_x, pos_y)
+        return out
+
+
+class BoardRenderer:
+    """
+    Cached board renderer with dirty tracking.
+    
+    The empty grid and border are rendered once. Locked cells are kept in a
+    cached canvas that is only repainted after the board changes (piece lock
+    or line clear), and the falling piece is drawn onto a copy of it. If
+    nothing changed since the previous call the previous canvas is returned
+    as is; version counts the canvases actually drawn, so downstream caches
+    can tell whether the canvas changed.
+    """
+
+    def __init__(self, cell_size=CELL_SIZE):
+        self.cell_size = cell_size
+        self._rasterizer = BoardRasterizer(cell_size)
+        self._locked = self._rasterizer.background.copy()
+        self._frame = np.empty_like(self._locked)
+        self._board = None
+        self._dirty_rows = (0, BOARD_HEIGHT - 1)
+        self._piece_key = None
+        self.version = 0
+
+    def mark_dirty(self, first_row=0, last_row=BOARD_HEIGHT - 1):
+        """
+        Flag board rows first_row..last_row (inclusive) for repaint after
+        the board changed. Without arguments the whole board is repainted.
+        """
+        if self._dirty_rows is not None:
+            first_row = min(first_row, self._dirty_rows[0])
+            last_row = max(last_row, self._dirty_rows[1])
+        self._dirty_rows = (first_row, last_row)
+
+    def piece_locked(self, touched_rows, cleared_rows):
+        """
+        Flag the rows changed by a piece lock (as returned by
+        GameState.lock_piece). A line clear shifts every row above the
+        lowest cleared one down; touched rows below it also gained cells.
+        """
+        if cleared_rows:
+            self.mark_dirty(0, max(cleared_rows[-1], touched_rows[-1]))
+        elif touched_rows:
+            self.mark_dirty(touched_rows[0], touched_rows[-1])
+
+    def _repaint_locked(self, game_board):
+        """Repaint dirty rows of locked cells on top of the prerendered empty board."""
+        if game_board is not self._board:
+            self._dirty_rows = (0, BOARD_HEIGHT - 1)
+        first_row, last_row = self._dirty_rows
+        self._rasterizer.render_rows(game_board, first_row, last_row, self._locked)
+        self._board = game_board
+        self._dirty_rows = None
+
+    def render(self, game_board, shape=None, rotation_idx=0, pos_x=0, pos_y=0, ghost_y=None):
+        """
+        Render the board, plus the falling piece if one is given.
+        
+        If ghost_y is below pos_y, a landing preview of the piece is drawn
+        there first. pos_x/pos_y may be fractional when rendering
+        interpolates between simulation ticks. Returns a canvas owned by the renderer; it is
+        overwritten by the next call, so copy it if it has to outlive the
+        frame, and do not draw on it.
+        """
+        piece_key = (id(shape), rotation_idx, pos_x, pos_y, ghost_y)
+        if self._dirty_rows is None and game_board is self._board and piece_key == self._piece_key:
+            return self._frame
+
+        if self._dirty_rows is not None or game_board is not self._board:
+            self._repaint_locked(game_board)
+
+        self._piece_key = piece_key
+        self.version += 1
+        np.copyto(self._frame, self._locked)
+        if shape is not None:
+            if ghost_y is not None and ghost_y > pos_y:
+                self._rasterizer.draw_ghost(self._frame, shape, rotation_idx, pos_x, ghost_y)
+            self._rasterizer.draw_piece(self._frame, shape, rotation_idx, pos_x, pos_y)
+        return self._frame
 
 def combine_board_and_webcam(board_canvas, webcam_frame):
     """Combine board and webcam feed side by side."""
@@ -158,3 +390,139 @@ def overlay_tetris_on_webcam(webcam_frame, board_canvas, alpha=OVERLAY_ALPHA):
                  (x_offset + target_width, y_offset + target_height),
                  (255, 255, 255), 2)
     return result
+
+class OverlayCompositor:
+    """
+    Cached version of overlay_tetris_on_webcam, with identical output.
+
+    The board's scaled size and offsets are computed once per webcam/board
+    resolution. The scaled board, its mask and its alpha-weighted pixels
+    are only recomputed when the board canvas changes (tracked through
+    BoardRenderer.version). Each frame then costs a copy of the webcam
+    frame and a masked copy of the board region into a reused buffer.
+    """
+
+    def __init__(self, alpha=OVERLAY_ALPHA):
+        self.alpha = alpha
+        self._shapes = None
+        self._board_version = None
+        self._output = None
+
+    def _layout(self, webcam_shape, board_shape):
+        """Scale and center the board at 80% of the webcam height."""
+        webcam_height, webcam_width = webcam_shape[:2]
+        board_height, board_width = board_shape[:2]
+        scale = (webcam_height * 0.8) / board_height
+        self._size = (int(board_width * scale), int(board_height * scale))
+        target_width, target_height = self._size
+        x_offset = (webcam_width - target_width) // 2
+        y_offset = (webcam_height - target_height) // 2
+        self._roi = (slice(y_offset, y_offset + target_height), slice(x_offset, x_offset + target_width))
+        self._border = ((x_offset, y_offset), (x_offset + target_width, y_offset + target_height))
+
+        self._resized = np.empty((target_height, target_width, 3), dtype=np.uint8)
+        self._gray = np.empty((target_height, target_width), dtype=np.uint8)
+        self._mask = np.empty((target_height, target_width), dtype=np.uint8)
+        self._foreground = np.empty((target_height, target_width, 3), dtype=np.uint8)
+        self._shapes = (webcam_shape, board_shape)
+        self._board_version = None
+
+    def _prepare_board(self, board_canvas):
+        """Scale the board and precompute its mask and alpha-weighted pixels."""
+        cv2.resize(board_canvas, self._size, dst=self._resized)
+        cv2.cvtColor(self._resized, cv2.COLOR_BGR2GRAY, dst=self._gray)
+        cv2.threshold(self._gray, 30, 255, cv2.THRESH_BINARY, dst=self._mask)
+        # Masked pixels become board * alpha (the webcam term is zero there)
+        cv2.addWeighted(self._resized, self.alpha, self._resized, 0.0, 0, dst=self._foreground)
+
+    def compose(self, webcam_frame, board_canvas, board_version=None, out=None):
+        """
+        Overlay the board on a webcam frame.
+
+        Args:
+            webcam_frame: Camera frame (not modified unless passed as out)
+            board_canvas: Rendered board
+            board_version: Changes whenever board_canvas changes
+                (BoardRenderer.version); None recomputes every call
+            out: Destination frame; defaults to a buffer owned by the
+                compositor that is overwritten by the next call
+
+        Returns:
+            numpy.ndarray: The composited frame
+        """
+        if self._shapes != (webcam_frame.shape, board_canvas.shape):
+            self._layout(webcam_frame.shape, board_canvas.shape)
+        if board_version is None or board_version != self._board_version:
+            self._prepare_board(board_canvas)
+            self._board_version = board_version
+
+        if out is None:
+            if self._output is None or self._output.shape != webcam_frame.shape:
+                self._output = np.empty_like(webcam_frame)
+            out = self._output
+        if out is not webcam_frame:
+            np.copyto(out, webcam_frame)
+        cv2.copyTo(self._foreground, self._mask, out[self._roi])  # Writes through the view
+        cv2.rectangle(out, self._border[0], self._border[1], (255, 255, 255), 2)
+        return out
+
+class DisplayCompositor:
+    """
+    Builds the display frame in one preallocated buffer per layout:
+    - "side_by_side": board next to the webcam frame scaled to the board
+      height (as combine_board_and_webcam)
+    - "overlay": board blended over the webcam frame (as
+      overlay_tetris_on_webcam, through OverlayCompositor)
+    - "board": the board alone, e.g. for offline rendering
+
+    The board and the resized webcam frame are written straight into views
+    of the buffer (cv2 dst= outputs), so once the buffers exist a frame
+    allocates nothing. The returned frame is overwritten by the next call
+    with the same layout; drawing HUD text on it is fine.
+    """
+
+    LAYOUTS = ("side_by_side", "overlay", "board")
+
+    def __init__(self, overlay_alpha=OVERLAY_ALPHA):
+        self._overlay = OverlayCompositor(overlay_alpha)
+        self._buffers = {}
+
+    def _buffer(self, layout, shape):
+        buffer = self._buffers.get(layout)
+        if buffer is None or buffer.shape != shape:
+            buffer = np.empty(shape, dtype=np.uint8)
+            self._buffers[layout] = buffer
+        return buffer
+
+    def compose(self, layout, board_canvas, webcam_frame=None, board_version=None):
+        """
+        Compose a display frame.
+
+        Args:
+            layout: One of LAYOUTS
+            board_canvas: Rendered board
+            webcam_frame: Camera frame (unused by the "board" layout)
+            board_version: BoardRenderer.version, lets the overlay layout
+                reuse its scaled board
+
+        Returns:
+            numpy.ndarray: The display frame
+        """
+        if layout == "overlay":
+            return self._overlay.compose(webcam_frame, board_canvas, board_version,
+                                         out=self._buffer(layout, webcam_frame.shape))
+
+        board_height, board_width = board_canvas.shape[:2]
+        if layout == "board":
+            out = self._buffer(layout, board_canvas.shape)
+            np.copyto(out, board_canvas)
+            return out
+        if layout != "side_by_side":
+            raise ValueError(f"Unknown display layout: {layout}")
+
+        # Scale webcam to match board height, straight into the right half
+        webcam_width = int(webcam_frame.shape[1] * (board_height / webcam_frame.shape[0]))
+        out = self._buffer(layout, (board_height, board_width + webcam_width, 3))
+        np.copyto(out[:, :board_width], board_canvas)
+        cv2.resize(webcam_frame, (webcam_width, board_height), dst=out[:, board_width:])
+        return out